@@ -1,171 +1,409 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, File, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-import os
-from typing import List, Optional, Any, Dict
-
-from src.document_ingestion.data_ingestion import (
-    FaissManager,
-    ChatIngestor,
-    DocHandler,
-    DocumentComparator
-)
-
-from src.document_analyzer.data_analysis import DocumentAnalyzer
-from src.document_compare.document_comparator import DocumentComparaorLLM
-from src.document_chat.retrieval import ConversationalRAG
-from pathlib import Path
-
-from utils.document_ops import FastAPIFileAdaptor, read_pdf_via_handler
-
-
-BASE_DIR = Path(__file__).resolve().parent.parent  # project root
-FAISS_BASE = os.getenv("FAISS_BASE", "faiss_index")
-FAISS_INDEX_NAME = os.getenv("FAISS_INDEX_NAME", "index")
-UPLOAD_BASE = os.getenv("UPLOAD_BASE", "data")
-
-app = FastAPI(title="Document Portal API", version="1.0.0")
-
-app.mount(
-    "/static",
-    StaticFiles(directory=BASE_DIR / "static"),
-    name="static"
-)
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-
-
-@app.get("/", response_class=HTMLResponse)
-async def serve_ui(request: Request):
-    resp = templates.TemplateResponse("index.html", {"request": request})
-    resp.headers["Cache-Control"] = "no-store"
-    return resp
-
-@app.get("/health")
-def health_check() -> Dict[str, str]:
-    return {"status": "ok", "service": "Document Portal API"}
-
-
-
-
-
-
-
-@app.post("/analyze-document")
-async def analyze_document(file:UploadFile=File(...)) -> Any:
-    try:
-        print("file received from analyse documnet:")
-        dh = DocHandler()
-        print("DocHandler initialized", type(file))
-        saved_path = dh.save_pdf(FastAPIFileAdaptor(file))
-        text = read_pdf_via_handler(dh, saved_path)
-        analyzer = DocumentAnalyzer()
-        response = analyzer.analyze_document(text)
-        return JSONResponse(content={"analysis": response})
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-
-
-
-@app.post("/document-compare")
-async def compare_documents(
-    reference: UploadFile = File(...),
-    actual: UploadFile = File(...)
-) -> Any:
-    try:
-        print("Files received for comparison.")
-        dc = DocumentComparator()
-        print("DocumentComparator initialized.")
-        ref_path, act_path = dc.save_uploaded_files(
-            FastAPIFileAdaptor(reference), 
-            FastAPIFileAdaptor(actual)
-            )
-
-        combined_text = dc.combined_documents()
-        comparator = DocumentComparaorLLM()
-        comparison_df = comparator.compare_documents(combined_docs=combined_text)
-        return {"rows": comparison_df.to_dict(orient="records"), "session_id": dc.session_id}
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Document comparison failed: {str(e)}")
-
-
-@app.post("/chat/index")
-async def chat_build_index(
-    files: List[UploadFile] = File(...),
-    session_id: Optional[str] = Form(None),
-    use_session_dir: bool = Form(True),
-    chunk_size: int = Form(1000),
-    chunk_overlap: int = Form(200),
-    k: int = Form(5)
-) -> Any:
-    try:
-        wrapped = [FastAPIFileAdaptor(f) for f in files]
-        chat_ingestor = ChatIngestor(
-            temp_base=UPLOAD_BASE,
-            faiss_base=FAISS_BASE,
-            session_id=session_id or None,
-            use_session_dir=use_session_dir
-        )
-
-        chat_ingestor.built_retriever(wrapped, chunk_size=chunk_size, chunk_overlap=chunk_overlap, k=k)
-
-        return {"session_id": chat_ingestor.session_id, "k": k, "use_session_dir": use_session_dir}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"index build failed: {str(e)}")
-
-
-@app.post("/chat/query")
-async def chat_query(
-    question: str = Form(...),
-    session_id: Optional[str] = Form(None),
-    use_session_dir: bool = Form(True),
-    k: int = Form(5)
-) -> Any:
-    try:
-        
-        if use_session_dir and not session_id:
-            raise HTTPException(status_code=400, detail="session_id is required when use_session_dir is True.")
-        
-        index_dir = os.path.join(FAISS_BASE, session_id) if use_session_dir else FAISS_BASE
-
-        if not os.path.exists(index_dir):
-            raise HTTPException(status_code=404, detail=f"FAISS index not found at {index_dir}")
-        
-        # Initialize LCEL-style RAG pipeline
-        rag = ConversationalRAG(session_id=session_id)
-
-        print(f"Loading FAISS retriever from {index_dir} with k={k}")
-        rag.load_retriever_from_faiss(index_path=index_dir, k=k, index_name=FAISS_INDEX_NAME)
-
-        # Optional: For now we pass empty chat history
-        response = rag.invoke(question, chat_history=[])
-
-        return {
-            "answer": response,
-            "session_id": session_id,
-            "k": k,
-            "engine": "LCEL-RAG"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"chat query failed: {str(e)}")
-
-
-
-
-
-# command for executing the fast api
-# uvicorn api.main:app --reload    
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, File, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+import os
+import json
+import uuid
+from typing import List, Optional, Any, Dict
+
+from src.document_ingestion.data_ingestion import (
+    FaissManager,
+    ChatIngestor,
+    DocHandler,
+    DocumentComparator
+)
+
+from src.document_analyzer.data_analysis import DocumentAnalyzer
+from src.document_compare.document_comparator import DocumentComparaorLLM
+from src.document_chat.retrieval import ConversationalRAG
+from pathlib import Path
+
+from utils.document_ops import FastAPIFileAdaptor, read_pdf_via_handler
+from utils.model_loader import ModelLoader
+from utils.cache import RAG_CACHE, index_key, faiss_index_version, cache_stats
+from utils.embedding_cache import embedding_cache_stats
+from utils.answer_cache import answer_cache_stats
+from utils.chat_history import get_chat_history_store
+from utils.retrievers import retrieval_settings
+from utils.reranker import rerank_settings
+from utils.concurrency import run_blocking, build_limiters, QueueFullError
+from utils.job_queue import JobManager, JobContext
+from utils.file_io import UploadBudget, UploadTooLargeError
+from logger.custom_logger import CustomLogger
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # project root
+FAISS_BASE = os.getenv("FAISS_BASE", "faiss_index")
+FAISS_INDEX_NAME = os.getenv("FAISS_INDEX_NAME", "index")
+UPLOAD_BASE = os.getenv("UPLOAD_BASE", "data")
+
+log = CustomLogger().get_logger(__name__)
+
+app = FastAPI(title="Document Portal API", version="1.0.0")
+
+# Per-endpoint concurrency limits / queue depth (config.yaml `api.concurrency`)
+LIMITERS = build_limiters(["analyze", "compare", "chat_index", "chat_query"])
+
+# Background jobs for long analyses / comparisons (config.yaml `jobs`)
+JOBS = JobManager()
+
+app.mount(
+    "/static",
+    StaticFiles(directory=BASE_DIR / "static"),
+    name="static"
+)
+templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Conversation-Id"],
+)
+
+# Upload size limits (config.yaml `uploads`); files are also checked while being streamed to disk
+MAX_REQUEST_BYTES = UploadBudget().max_request_bytes
+
+
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    """Reject oversized bodies from Content-Length before the multipart body is spooled."""
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_REQUEST_BYTES:
+        return JSONResponse(status_code=413, content={"detail": f"Request exceeds the {MAX_REQUEST_BYTES} byte upload limit."})
+    return await call_next(request)
+
+
+@app.on_event("startup")
+def warm_up_models():
+    """Pre-load the shared embedding model and LLM so the first request does not pay for it."""
+    if os.getenv("WARMUP_MODELS", "true").lower() not in ("1", "true", "yes"):
+        return
+    try:
+        ModelLoader().warm_up()
+    except Exception as e:
+        # keep serving; models will be loaded lazily on first use
+        log.warning("Model warm-up failed; models will load on first use.", error=str(e))
+
+
+@app.get("/", response_class=HTMLResponse)
+async def serve_ui(request: Request):
+    resp = templates.TemplateResponse("index.html", {"request": request})
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+@app.get("/health")
+def health_check() -> Dict[str, str]:
+    return {"status": "ok", "service": "Document Portal API"}
+
+
+@app.get("/concurrency/stats")
+def concurrency_stats() -> Dict[str, Any]:
+    return {name: limiter.stats() for name, limiter in LIMITERS.items()}
+
+
+
+
+
+
+
+@app.post("/analyze-document")
+async def analyze_document(file:UploadFile=File(...)) -> Any:
+    try:
+        async with LIMITERS["analyze"].slot():
+            log.info("Document received for analysis.", filename=file.filename)
+            dh = DocHandler()
+            saved_path = await run_blocking(dh.save_pdf, FastAPIFileAdaptor(file))
+            text = await run_blocking(read_pdf_via_handler, dh, saved_path)
+            analyzer = DocumentAnalyzer()
+            sha256 = dh.saved_upload.sha256 if dh.saved_upload else None
+            response = await analyzer.aanalyze_document(text, source_sha256=sha256)
+            return JSONResponse(content={"analysis": response})
+
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+
+@app.post("/document-compare")
+async def compare_documents(
+    reference: UploadFile = File(...),
+    actual: UploadFile = File(...)
+) -> Any:
+    try:
+        async with LIMITERS["compare"].slot():
+            log.info("Files received for comparison.", reference=reference.filename, actual=actual.filename)
+            dc = DocumentComparator()
+            ref_path, act_path = await run_blocking(
+                dc.save_uploaded_files,
+                FastAPIFileAdaptor(reference),
+                FastAPIFileAdaptor(actual)
+                )
+
+            # identical pages are resolved without the LLM; only changed pages are sent
+            reference_pages, actual_pages = await run_blocking(dc.read_page_pairs)
+            comparator = DocumentComparaorLLM()
+            comparison_df = await comparator.acompare_pages(reference_pages, actual_pages, source_sha256=dc.upload_sha256s)
+            return {"rows": comparison_df.to_dict(orient="records"), "session_id": dc.session_id}
+
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Document comparison failed: {str(e)}")
+
+
+@app.post("/jobs/analyze-document")
+async def submit_analyze_job(file: UploadFile = File(...)) -> Any:
+    """Queue a document analysis and return its job id immediately; poll /jobs/{job_id}."""
+    try:
+        dh = DocHandler()
+        saved_path = await run_blocking(dh.save_pdf, FastAPIFileAdaptor(file))
+
+        def _analyze(ctx: JobContext):
+            ctx.update(stage="parsing")
+            text = read_pdf_via_handler(dh, saved_path)
+            ctx.update(stage="analyzing", pages_parsed=dh.page_count)
+            analyzer = DocumentAnalyzer()
+            response = analyzer.analyze_document(text, source_sha256=dh.saved_upload.sha256 if dh.saved_upload else None)
+            ctx.update(llm_calls_done=analyzer.last_llm_calls)
+            return response
+
+        record = JOBS.submit("analyze-document", _analyze)
+        return {"job_id": record.job_id, "status": record.status.value}
+
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis job submission failed: {str(e)}")
+
+
+@app.post("/jobs/document-compare")
+async def submit_compare_job(
+    reference: UploadFile = File(...),
+    actual: UploadFile = File(...)
+) -> Any:
+    """Queue a document comparison and return its job id immediately; poll /jobs/{job_id}."""
+    try:
+        dc = DocumentComparator()
+        await run_blocking(dc.save_uploaded_files, FastAPIFileAdaptor(reference), FastAPIFileAdaptor(actual))
+
+        def _compare(ctx: JobContext):
+            ctx.update(stage="parsing")
+            reference_pages, actual_pages = dc.read_page_pairs()
+            ctx.update(stage="comparing", pages_parsed=dc.pages_read)
+            comparator = DocumentComparaorLLM()
+            comparison_df = comparator.compare_pages(reference_pages, actual_pages, source_sha256=dc.upload_sha256s)
+            ctx.update(llm_calls_done=comparator.last_llm_calls)
+            return {"rows": comparison_df.to_dict(orient="records"), "session_id": dc.session_id}
+
+        record = JOBS.submit("document-compare", _compare)
+        return {"job_id": record.job_id, "status": record.status.value}
+
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Comparison job submission failed: {str(e)}")
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str) -> Any:
+    record = JOBS.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job not found or expired: {job_id}")
+    return JSONResponse(content=record.model_dump(mode="json"))
+
+
+@app.post("/chat/index")
+async def chat_build_index(
+    files: List[UploadFile] = File(...),
+    session_id: Optional[str] = Form(None),
+    use_session_dir: bool = Form(True),
+    chunk_size: int = Form(1000),
+    chunk_overlap: int = Form(200),
+    k: int = Form(5)
+) -> Any:
+    try:
+        async with LIMITERS["chat_index"].slot():
+            wrapped = [FastAPIFileAdaptor(f) for f in files]
+            chat_ingestor = ChatIngestor(
+                temp_base=UPLOAD_BASE,
+                faiss_base=FAISS_BASE,
+                session_id=session_id or None,
+                use_session_dir=use_session_dir
+            )
+
+            # parsing, splitting and embedding are CPU-bound; keep them off the event loop
+            await run_blocking(chat_ingestor.built_retriever, wrapped, chunk_size=chunk_size, chunk_overlap=chunk_overlap, k=k)
+
+            return {
+                "session_id": chat_ingestor.session_id,
+                "k": k,
+                "use_session_dir": use_session_dir,
+                "ingest": chat_ingestor.last_ingest_stats,
+            }
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"index build failed: {str(e)}")
+
+
+def _resolve_index_dir(session_id: Optional[str], use_session_dir: bool) -> str:
+    if use_session_dir and not session_id:
+        raise HTTPException(status_code=400, detail="session_id is required when use_session_dir is True.")
+
+    index_dir = os.path.join(FAISS_BASE, session_id) if use_session_dir else FAISS_BASE
+
+    if not os.path.exists(index_dir):
+        raise HTTPException(status_code=404, detail=f"FAISS index not found at {index_dir}")
+
+    return index_dir
+
+
+async def _get_rag(index_dir: str, k: int, search_type: Optional[str] = None,
+                   fetch_k: Optional[int] = None, score_threshold: Optional[float] = None,
+                   rerank: Optional[bool] = None) -> ConversationalRAG:
+    try:
+        # resolve config defaults up front so the cache key reflects the effective mode
+        settings = retrieval_settings(search_type=search_type or None, fetch_k=fetch_k, score_threshold=score_threshold)
+        rerank = rerank_settings(enabled=rerank)["enabled"]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def _build_rag() -> ConversationalRAG:
+        # Initialize LCEL-style RAG pipeline; shared by every session querying this index,
+        # so the conversation is passed per request instead
+        rag = ConversationalRAG(session_id=None)
+
+        log.info("Loading FAISS retriever.", index_dir=index_dir, k=k)
+        rag.load_retriever_from_faiss(index_path=index_dir, k=k, index_name=FAISS_INDEX_NAME,
+                                      search_type=settings["search_type"], fetch_k=settings["fetch_k"],
+                                      score_threshold=settings["score_threshold"], rerank=rerank)
+        return rag
+
+    # Reuse the loaded index + compiled chain until the index changes on disk
+    return await run_blocking(
+        RAG_CACHE.get_or_load,
+        (index_key(index_dir), FAISS_INDEX_NAME, k, settings["search_type"], settings["fetch_k"], settings["score_threshold"], rerank),
+        _build_rag,
+        version=faiss_index_version(index_dir, FAISS_INDEX_NAME),
+    )
+
+
+def _new_conversation_id() -> str:
+    return uuid.uuid4().hex
+
+
+@app.post("/chat/query")
+async def chat_query(
+    question: str = Form(...),
+    session_id: Optional[str] = Form(None),
+    use_session_dir: bool = Form(True),
+    k: int = Form(5),
+    conversation_id: Optional[str] = Form(None),
+    search_type: Optional[str] = Form(None),
+    fetch_k: Optional[int] = Form(None),
+    score_threshold: Optional[float] = Form(None),
+    rerank: Optional[bool] = Form(None)
+) -> Any:
+    try:
+        index_dir = _resolve_index_dir(session_id, use_session_dir)
+
+        async with LIMITERS["chat_query"].slot():
+            rag = await _get_rag(index_dir, k, search_type, fetch_k, score_threshold, rerank)
+
+            # history is kept server-side per conversation; pass the returned id back to continue it
+            conversation_id = conversation_id or _new_conversation_id()
+            response = await rag.ainvoke(question, conversation_id=conversation_id)
+
+        return {
+            "answer": response,
+            "session_id": session_id,
+            "conversation_id": conversation_id,
+            "k": k,
+            "engine": "LCEL-RAG"
+        }
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"chat query failed: {str(e)}")
+
+
+@app.post("/chat/query/stream")
+async def chat_query_stream(
+    question: str = Form(...),
+    session_id: Optional[str] = Form(None),
+    use_session_dir: bool = Form(True),
+    k: int = Form(5),
+    conversation_id: Optional[str] = Form(None),
+    search_type: Optional[str] = Form(None),
+    fetch_k: Optional[int] = Form(None),
+    score_threshold: Optional[float] = Form(None),
+    rerank: Optional[bool] = Form(None)
+) -> Any:
+    """Server-Sent Events variant of /chat/query: question, sources, token..., done.
+
+    The conversation id (new unless one was passed) is returned in the X-Conversation-Id header.
+    """
+    index_dir = _resolve_index_dir(session_id, use_session_dir)
+    conversation_id = conversation_id or _new_conversation_id()
+
+    async def event_stream():
+        try:
+            async with LIMITERS["chat_query"].slot():
+                rag = await _get_rag(index_dir, k, search_type, fetch_k, score_threshold, rerank)
+
+                async for event in rag.astream(question, conversation_id=conversation_id):
+                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+        except QueueFullError as e:
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(f'chat query failed: {str(e)}')}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Conversation-Id": conversation_id},
+    )
+
+
+@app.get("/chat/history/{conversation_id}")
+def get_chat_history(conversation_id: str) -> Dict[str, Any]:
+    messages = get_chat_history_store().messages(conversation_id)
+    return {
+        "conversation_id": conversation_id,
+        "messages": [{"role": m.type, "content": m.content} for m in messages],
+    }
+
+
+@app.delete("/chat/history/{conversation_id}")
+def clear_chat_history(conversation_id: str) -> Dict[str, Any]:
+    get_chat_history_store().clear(conversation_id)
+    return {"conversation_id": conversation_id, "cleared": True}
+
+
+@app.get("/chat/cache/stats")
+def chat_cache_stats() -> Dict[str, Any]:
+    return {**cache_stats(), **answer_cache_stats(), "embeddings": embedding_cache_stats()}
+
+
+
+
+
+# command for executing the fast api
+# uvicorn api.main:app --reload    
 #uvicorn api.main:app --host 0.0.0.0 --port 8080 --reload
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Benchmark: FAISS index types from config.yaml `faiss_db` (flat, hnsw, ivf_flat, ivf_pq).
+
+Builds every type over the same synthetic clustered vectors (embedding-like: unit norm,
+384 dimensions) and reports, against exact flat search,
+  * recall@k - share of the true top-k neighbours returned
+  * QPS      - single-query searches per second on one thread
+  * MB       - serialized index size, i.e. what a worker keeps resident
+  * build_s  - training + adding all vectors
+
+Usage:
+    python -m benchmarks.bench_faiss_index                         # 50k vectors
+    python -m benchmarks.bench_faiss_index --vectors 200000 --nprobe 32 --hnsw-ef-search 128
+"""
+import argparse
+import time
+
+import numpy as np
+import faiss
+
+from utils.faiss_index import INDEX_FACTORIES, build_index, index_memory_bytes, index_settings
+
+
+def make_vectors(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """Unit vectors scattered around random topic centroids, like sentence embeddings."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centroids[rng.integers(0, clusters, n)] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--types", default=",".join(INDEX_FACTORIES), help="comma-separated index types")
+    parser.add_argument("--nlist", type=int)
+    parser.add_argument("--nprobe", type=int)
+    parser.add_argument("--hnsw-ef-search", type=int)
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(1)
+    base = make_vectors(args.vectors + args.queries, args.dim, args.clusters)
+    vectors, queries = base[:args.vectors], base[args.vectors:]
+
+    exact = faiss.IndexFlatL2(args.dim)
+    exact.add(vectors)
+    _, truth = exact.search(queries, args.k)
+
+    print(f"vectors: {args.vectors}  dim: {args.dim}  queries: {args.queries}  k: {args.k}")
+    print(f"{'type':<10} {'recall@k':>9} {'QPS':>9} {'MB':>9} {'build_s':>9}")
+    for index_type in args.types.split(","):
+        settings = index_settings(index_type=index_type, nlist=args.nlist, nprobe=args.nprobe,
+                                  hnsw_ef_search=args.hnsw_ef_search, train_min_vectors=0)
+
+        start = time.perf_counter()
+        index = build_index(vectors, index_type, settings)
+        build_s = time.perf_counter() - start
+
+        found = np.empty_like(truth)
+        start = time.perf_counter()
+        for i, query in enumerate(queries):
+            found[i] = index.search(query[None, :], args.k)[1][0]
+        qps = len(queries) / (time.perf_counter() - start)
+
+        mb = index_memory_bytes(index) / 1e6
+        print(f"{index_type:<10} {recall_at_k(found, truth):>9.3f} {qps:>9,.0f} {mb:>9.1f} {build_s:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: loading a chat index eagerly vs. memory-mapped with a lazy docstore.
+
+Writes a synthetic index (flat vectors + chunk store) with FaissManager, then loads it in a
+fresh process per mode and reports load time, private (anonymous) memory after load and
+after a few searches, and search latency. Private memory is what every uvicorn worker pays
+separately; mapped pages are shared through the OS page cache.
+
+Usage:
+    python -m benchmarks.bench_index_load                       # 50k chunks
+    python -m benchmarks.bench_index_load --chunks 200000 --dim 384
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+class RandomEmbeddings(Embeddings):
+    """Deterministic pseudo-random unit vectors; only their size matters here."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _embed(self, text: str):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        v = rng.normal(size=self.dim).astype(np.float32)
+        return (v / np.linalg.norm(v)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class _Loader:
+    embedding_model_id = "bench-random"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def load_embeddings(self):
+        return RandomEmbeddings(self.dim)
+
+
+def private_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def measure(index_dir: str, dim: int, mmap: bool, lazy: bool, queries: int) -> dict:
+    from utils.index_store import load_vector_store
+
+    before = private_mb()
+    start = time.perf_counter()
+    store = load_vector_store(index_dir, RandomEmbeddings(dim), mmap=mmap, lazy=lazy)
+    load_ms = (time.perf_counter() - start) * 1000
+    loaded = private_mb()
+
+    start = time.perf_counter()
+    for i in range(queries):
+        store.similarity_search(f"query {i}", k=5)
+    search_ms = (time.perf_counter() - start) * 1000 / queries
+
+    return {"load_ms": load_ms, "private_mb_loaded": loaded - before,
+            "private_mb_searched": private_mb() - before, "search_ms": search_ms}
+
+
+def build(index_dir: str, chunks: int, dim: int):
+    from src.document_ingestion.data_ingestion import FaissManager
+
+    manager = FaissManager(index_dir, model_loader=_Loader(dim), index_type="flat")
+    manager.embedding_cache = None  # keep throwaway vectors out of the shared cache
+    words = "contract clause payment term party notice liability warranty".split()
+    rng = np.random.default_rng(0)
+    for start in range(0, chunks, 10000):
+        manager.add_documents([
+            Document(page_content=f"chunk {i}: " + " ".join(rng.choice(words, 150)), metadata={"source": "bench.pdf", "page": i // 5})
+            for i in range(start, min(start + 10000, chunks))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--measure", nargs=3, metavar=("DIR", "MMAP", "LAZY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        index_dir, mmap, lazy = args.measure
+        print(json.dumps(measure(index_dir, args.dim, mmap == "1", lazy == "1", args.queries)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build(tmp, args.chunks, args.dim)
+        print(f"chunks: {args.chunks}  dim: {args.dim}")
+        print(f"{'mode':<14} {'load_ms':>9} {'private_MB':>11} {'after_search':>13} {'search_ms':>10}")
+        for name, mmap, lazy in (("eager", "0", "0"), ("mmap+lazy", "1", "1")):
+            # a fresh process per mode, like a worker cold start
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_index_load", "--dim", str(args.dim),
+                 "--queries", str(args.queries), "--measure", tmp, mmap, lazy],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            r = json.loads(out)
+            print(f"{name:<14} {r['load_ms']:>9.1f} {r['private_mb_loaded']:>11.1f} {r['private_mb_searched']:>13.1f} {r['search_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: serial PyMuPDF page loop vs. utils.pdf_extractor.extract_pages (process pool).
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction                  # synthetic 600-page PDF
+    python -m benchmarks.bench_pdf_extraction path/to/file.pdf --workers 4 --repeat 3
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from utils.pdf_extractor import extract_pages
+
+
+def make_synthetic_pdf(path: Path, pages: int = 600) -> Path:
+    """Write a text-heavy PDF so extraction cost dominates."""
+    paragraph = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 12).strip()
+    with fitz.open() as doc:
+        for i in range(pages):
+            page = doc.new_page()
+            page.insert_textbox(fitz.Rect(36, 36, 560, 800), f"Page {i + 1}\n" + "\n".join([paragraph] * 8), fontsize=8)
+        doc.save(str(path))
+    return path
+
+
+def serial_loop(pdf_path: str):
+    """The original DocHandler.read_pdf loop."""
+    with fitz.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text() for i in range(len(doc))]
+
+
+def timed(fn, *args, repeat: int = 3, **kwargs):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", nargs="?", help="PDF to benchmark (default: generated)")
+    parser.add_argument("--pages", type=int, default=600, help="pages in the generated PDF")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf or str(make_synthetic_pdf(Path(tmp) / "synthetic.pdf", args.pages))
+
+        # warm the process pool so its start-up cost is not counted
+        extract_pages(pdf_path, max_workers=args.workers)
+
+        serial_s, serial_pages = timed(serial_loop, pdf_path, repeat=args.repeat)
+        parallel_s, parallel_pages = timed(extract_pages, pdf_path, max_workers=args.workers, repeat=args.repeat)
+
+        assert serial_pages == parallel_pages, "parallel extraction changed page text or order"
+
+        n = len(serial_pages)
+        print(f"pages:     {n}")
+        print(f"serial:    {serial_s:.3f}s  {n / serial_s:,.0f} pages/sec")
+        print(f"parallel:  {parallel_s:.3f}s  {n / parallel_s:,.0f} pages/sec  (workers={args.workers})")
+        print(f"speedup:   {serial_s / parallel_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: PDF loader backends used by utils.document_ops (pypdf vs PyMuPDF).
+
+Usage:
+    python -m benchmarks.bench_pdf_loaders                  # synthetic 300-page PDF
+    python -m benchmarks.bench_pdf_loaders path/to/file.pdf --repeat 3
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_pdf_extraction import make_synthetic_pdf
+from utils.document_ops import PDF_LOADERS
+
+
+def run_loader(name: str, pdf_path: str):
+    """Stream every page through the loader; return (pages, characters)."""
+    pages = chars = 0
+    for doc in PDF_LOADERS[name](pdf_path).lazy_load():
+        pages += 1
+        chars += len(doc.page_content)
+    return pages, chars
+
+
+def measure(name: str, pdf_path: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages, chars = run_loader(name, pdf_path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run_loader(name, pdf_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, pages, chars, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", nargs="?", help="PDF to benchmark (default: generated)")
+    parser.add_argument("--pages", type=int, default=300, help="pages in the generated PDF")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf or str(make_synthetic_pdf(Path(tmp) / "synthetic.pdf", args.pages))
+
+        results = {name: measure(name, pdf_path, args.repeat) for name in PDF_LOADERS}
+        for name, (seconds, pages, chars, peak) in results.items():
+            print(f"{name:8s} {seconds:.3f}s  {pages / seconds:,.0f} pages/sec  "
+                  f"{chars:,} chars  peak python heap {peak / 1e6:.1f} MB")
+
+        if {"pypdf", "pymupdf"} <= results.keys():
+            print(f"speedup:  {results['pypdf'][0] / results['pymupdf'][0]:.2f}x (pymupdf over pypdf)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: chat retrieval with and without the rerank stage.
+
+Builds a synthetic FAISS index and, for each query, compares
+  * baseline  - top-N chunks straight from the index (high k for recall)
+  * reranked  - the same N candidates rescored by the reranker, best M kept
+on context tokens sent to the LLM, recall of the chunk the query was written from,
+and retrieval(+rerank) latency.
+
+Usage:
+    python -m benchmarks.bench_rerank                                   # lexical reranker, no downloads
+    python -m benchmarks.bench_rerank --reranker cross_encoder --candidates 20 --top-n 5
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import time
+from typing import List
+
+import numpy as np
+from langchain_community.vectorstores import FAISS  # type: ignore
+from langchain_core.embeddings import Embeddings
+
+from utils.bm25 import tokenize
+from utils.reranker import RerankingRetriever, get_reranker
+from utils.tokens import estimate_tokens
+
+VOCAB = [f"term{i}" for i in range(2000)]
+
+
+class HashingEmbeddings(Embeddings):
+    """Bag-of-words hashed into a fixed number of dimensions: a deterministic, offline stand-in."""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        v = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            v[int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dim] += 1.0
+        norm = np.linalg.norm(v)
+        return (v / norm if norm else v).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def make_corpus(n_chunks: int, words: int, rng: random.Random) -> List[str]:
+    return [" ".join(rng.choice(VOCAB) for _ in range(words)) for _ in range(n_chunks)]
+
+
+def make_query(chunk: str, rng: random.Random, noise: int = 4) -> str:
+    """A paraphrase-like query: a few of the chunk's words plus unrelated ones."""
+    words = chunk.split()
+    return " ".join(rng.sample(words, 6) + [rng.choice(VOCAB) for _ in range(noise)])
+
+
+def evaluate(retriever, queries, targets):
+    tokens, hits, latencies = [], 0, []
+    for query, target in zip(queries, targets):
+        start = time.perf_counter()
+        docs = retriever.invoke(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        tokens.append(estimate_tokens("\n\n".join(d.page_content for d in docs)))
+        hits += any(d.page_content == target for d in docs)
+    return statistics.mean(tokens), hits / len(queries), statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reranker", default="lexical", help="lexical | cross_encoder")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=180, help="words per chunk (~1000 characters)")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--candidates", type=int, default=20, help="N: chunks fetched from the index")
+    parser.add_argument("--top-n", type=int, default=5, help="M: chunks kept after reranking")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = make_corpus(args.chunks, args.words, rng)
+    store = FAISS.from_texts(corpus, HashingEmbeddings())
+    targets = rng.sample(corpus, args.queries)
+    queries = [make_query(t, rng) for t in targets]
+
+    wide = store.as_retriever(search_kwargs={"k": args.candidates})
+    narrow = store.as_retriever(search_kwargs={"k": args.top_n})
+    reranker = get_reranker(provider=args.reranker)
+    reranked = RerankingRetriever(base_retriever=wide, reranker=reranker, top_n=args.top_n)
+
+    rows = [
+        (f"top-{args.candidates} (no rerank)", *evaluate(wide, queries, targets)),
+        (f"top-{args.top_n} (no rerank)", *evaluate(narrow, queries, targets)),
+        (f"{args.candidates} -> {args.top_n} ({args.reranker})", *evaluate(reranked, queries, targets)),
+    ]
+
+    print(f"{'retrieval':32s} {'ctx tokens':>10s} {'recall':>7s} {'p50 ms':>8s}")
+    for name, tokens, recall, latency in rows:
+        print(f"{name:32s} {tokens:10,.0f} {recall:7.1%} {latency:8.2f}")
+
+    base_tokens, rr_tokens = rows[0][1], rows[2][1]
+    print(f"prompt tokens saved vs top-{args.candidates}: {1 - rr_tokens / base_tokens:.0%}")
+
+
+if __name__ == "__main__":
+    main()
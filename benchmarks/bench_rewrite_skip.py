@@ -0,0 +1,84 @@
+"""
+Benchmark: end-to-end ConversationalRAG latency with and without the question-rewrite call
+on first turns (empty chat history).
+
+The LLM is simulated with a fixed per-call latency so the result reflects the saved round
+trip rather than provider variance; pass --llm-latency-ms to match your provider.
+
+Usage:
+    python -m benchmarks.bench_rewrite_skip --llm-latency-ms 400 --queries 10
+"""
+import argparse
+import statistics
+import time
+from operator import itemgetter
+
+from langchain_community.vectorstores import FAISS  # type: ignore
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+
+from src.document_chat.retrieval import ConversationalRAG
+
+
+class SlowFakeChatModel(FakeListChatModel):
+    """FakeListChatModel that sleeps like a remote LLM round trip."""
+
+    latency_s: float = 0.4
+
+    def _call(self, *args, **kwargs):
+        time.sleep(self.latency_s)
+        return super()._call(*args, **kwargs)
+
+
+def build_rag(latency_s: float) -> ConversationalRAG:
+    llm = SlowFakeChatModel(responses=["standalone question", "answer"], latency_s=latency_s)
+    # bypass ModelLoader so no provider keys are needed
+    ConversationalRAG._load_llm = lambda self: llm
+    texts = [f"chunk {i} about topic {i % 7}" for i in range(200)]
+    store = FAISS.from_texts(texts, DeterministicFakeEmbedding(size=64))
+    return ConversationalRAG(session_id="bench", retriever=store.as_retriever(search_kwargs={"k": 5}))
+
+
+def always_rewrite(rag: ConversationalRAG):
+    """The previous behaviour: every question goes through contextualize_prompt | llm."""
+    return (
+        {"input": itemgetter("input"), "chat_history": itemgetter("chat_history")}
+        | rag.contextualize_prompt
+        | rag.llm
+        | StrOutputParser()
+    )
+
+
+def run(rag: ConversationalRAG, queries: int):
+    timings = []
+    for i in range(queries):
+        start = time.perf_counter()
+        rag.invoke(f"question number {i}?", chat_history=[])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency-ms", type=float, default=400)
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    rag = build_rag(args.llm_latency_ms / 1000)
+    branched = rag.question_rewriter
+
+    rag.question_rewriter = always_rewrite(rag)
+    before = run(rag, args.queries)
+
+    rag.question_rewriter = branched
+    after = run(rag, args.queries)
+
+    b, a = statistics.median(before), statistics.median(after)
+    print(f"always rewrite:       median {b:,.1f} ms  ({args.queries} queries)")
+    print(f"skip when no history: median {a:,.1f} ms")
+    print(f"reduction:            {b - a:,.1f} ms  ({(b - a) / b:.0%})")
+
+
+if __name__ == "__main__":
+    main()
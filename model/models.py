@@ -1,31 +1,92 @@
-from pydantic import BaseModel, Field, RootModel
-from typing import Optional, Dict, Any, List, Union
-from enum import Enum
-
-
-class Metadata(BaseModel):
-    Summary:list[str] = Field(default_factory=list, description="List of summary points about the document.")
-    Title: Optional[str] = None
-    Author: Optional[str] = None
-    DateCreated: Optional[str] = None
-    LastModified: Optional[str] = None
-    Publisher: Optional[str] = None
-    Language: Optional[str] = None
-    PageCount: Union[int, str, None] = None
-    SentimentTone: Optional[str] = None
-    
-
-class ChangeFormat(BaseModel):
-    Page: str
-    Changes: str
-
-
-class SummaryResponse(RootModel[list[ChangeFormat]]):
-    pass
-
-
-class PromptType(str, Enum):
-    DOCUMENT_ANALYSIS = "document_analyzer_prompt"
-    DOCUMENT_COMPARISON = "document_comparison_prompt"
-    CONTEXTUALIZE_QUESTION = "contextualize_question"
-    CONTEXT_QA = "context_qa"
\ No newline at end of file
+from pydantic import BaseModel, Field, RootModel
+from typing import Optional, Dict, Any, List, Tuple, Union
+from enum import Enum
+
+
+class Metadata(BaseModel):
+    Summary:list[str] = Field(default_factory=list, description="List of summary points about the document.")
+    Title: Optional[str] = None
+    Author: Optional[str] = None
+    DateCreated: Optional[str] = None
+    LastModified: Optional[str] = None
+    Publisher: Optional[str] = None
+    Language: Optional[str] = None
+    PageCount: Union[int, str, None] = None
+    SentimentTone: Optional[str] = None
+    
+
+class ChangeFormat(BaseModel):
+    Page: str
+    Changes: str
+
+
+class SummaryResponse(RootModel[list[ChangeFormat]]):
+    pass
+
+
+class ChangedSegment(BaseModel):
+    """A run of reference pages replaced by / removed from / inserted into the actual document."""
+    reference_pages: List[Tuple[int, str]] = Field(default_factory=list, description="(1-based page number, text) pairs.")
+    actual_pages: List[Tuple[int, str]] = Field(default_factory=list, description="(1-based page number, text) pairs.")
+    actual_start: int = Field(0, description="Number of actual pages before the segment (where removed pages were).")
+
+
+class PageDiff(BaseModel):
+    unchanged_pages: List[int] = Field(default_factory=list, description="1-based actual page numbers identical to the reference.")
+    changed: List[ChangedSegment] = Field(default_factory=list)
+
+    @property
+    def changed_page_count(self) -> int:
+        return sum(max(len(s.reference_pages), len(s.actual_pages)) for s in self.changed)
+
+
+class PromptType(str, Enum):
+    DOCUMENT_ANALYSIS = "document_analyzer_prompt"
+    DOCUMENT_ANALYSIS_REDUCE = "document_analyzer_reduce_prompt"
+    DOCUMENT_COMPARISON = "document_comparison_prompt"
+    CONTEXTUALIZE_QUESTION = "contextualize_question"
+    CONTEXT_QA = "context_qa"
+    SUMMARIZE_HISTORY = "summarize_history"
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobProgress(BaseModel):
+    stage: Optional[str] = None
+    pages_parsed: int = 0
+    llm_calls_done: int = 0
+
+
+class JobRecord(BaseModel):
+    job_id: str
+    kind: str
+    status: JobStatus = JobStatus.PENDING
+    progress: JobProgress = Field(default_factory=JobProgress)
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    owner: Optional[str] = Field(default=None, description="hostname:pid of the worker process that runs the job.")
+
+
+class SavedUpload(BaseModel):
+    path: str
+    original_name: str
+    size_bytes: int
+    sha256: str
+
+
+class PackedContext(BaseModel):
+    text: str
+    tokens: int
+    source_ids: List[str] = Field(default_factory=list)
+    retrieved: int = 0
+    deduplicated: int = 0
+    dropped: int = 0
+    truncated: bool = False
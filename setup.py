@@ -1,9 +1,9 @@
-from setuptools import setup, find_packages
-
-
-setup(
-    name="document_portal",
-    author="ved jangid",
-    version="0.1.0",
-    packages=find_packages()
-)
+from setuptools import setup, find_packages
+
+
+setup(
+    name="document_portal",
+    author="ved jangid",
+    version="0.1.0",
+    packages=find_packages()
+)
@@ -1,53 +1,255 @@
-import os
-import sys
-from model.models import *
-from logger.custom_logger import CustomLogger
-from exception.custom_exception import DocumentPortalException
-from utils.model_loader import ModelLoader
-from langchain_core.output_parsers import JsonOutputParser
-# from langchain.output_parsers import OutputFixingParser
-from langchain_classic.output_parsers import OutputFixingParser #type: ignore
-from prompt.prompt_library import PROMPT_REGISTRY
-
-
-class DocumentAnalyzer:
-    """A class to analyze documents using various language models and prompts.
-    Automatically logs all actions and supports dynamic model and prompt selection.
-    """
-
-    def __init__(self):
-        try:
-            self.log = CustomLogger().get_logger(__name__)
-            self.model_loader = ModelLoader()
-            self.llm = self.model_loader.load_llm()
-            
-            self.parser = JsonOutputParser(pydantic_object=Metadata)
-            self.fixing_parser = OutputFixingParser.from_llm(llm=self.llm, parser=self.parser)
-
-            self.prompt = PROMPT_REGISTRY["document_analyzer_prompt"]
-
-            self.log.info("DocumentAnalyzer initialized successfully.", llm=str(self.llm))
-
-        except Exception as e:
-            log = CustomLogger().get_logger(__name__)
-            log.error(f"Error initializing DocumentAnalyzer:", error=str(e))
-            raise DocumentPortalException("failed to initialize DocumentAnalyzer", sys)
-        
-    def analyze_document(self, document_text: str) -> dict:
-        """Analyze the given document text and return metadata."""
-        try:
-            chain = self.prompt | self.llm | self.fixing_parser
-
-            self.log.info("Meta-data analysis chain initialized...")
-
-            response = chain.invoke({
-                "format_instructions": self.parser.get_format_instructions(),
-                "document_content": document_text
-                })
-            self.log.info("Document analyzed successfully.", response=response)
-
-            return response
-
-        except Exception as e:
-            self.log.error(f"Error analyzing document:", error=str(e))
-            raise DocumentPortalException("failed to analyze document", sys)
\ No newline at end of file
+import os
+import re
+import sys
+import json
+import time
+from typing import Any, Dict, List, Optional
+from model.models import *
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+from utils.model_loader import ModelLoader
+from utils.config_loader import load_config
+from utils.cache import RESULT_CACHE, prompt_version, text_hash
+from utils.tokens import estimate_tokens
+from langchain_core.output_parsers import JsonOutputParser
+# from langchain.output_parsers import OutputFixingParser
+from langchain_classic.output_parsers import OutputFixingParser #type: ignore
+from prompt.prompt_library import PROMPT_REGISTRY
+
+
+# Page separator written by DocHandler.read_pdf
+PAGE_MARKER = re.compile(r"\n--- Page (\d+) ---\n")
+
+
+class DocumentAnalyzer:
+    """A class to analyze documents using various language models and prompts.
+    Automatically logs all actions and supports dynamic model and prompt selection.
+
+    Long documents are analyzed map-reduce style: pages are packed into token-budgeted
+    chunks, each chunk is analyzed concurrently, and the partial results are merged by a
+    final reduce call.
+    """
+
+    def __init__(self):
+        try:
+            self.log = CustomLogger().get_logger(__name__)
+            self.model_loader = ModelLoader()
+            self.llm = self.model_loader.load_llm()
+
+            self.parser = JsonOutputParser(pydantic_object=Metadata)
+            self.fixing_parser = OutputFixingParser.from_llm(llm=self.llm, parser=self.parser)
+
+            self.prompt = PROMPT_REGISTRY[PromptType.DOCUMENT_ANALYSIS.value]
+            self.reduce_prompt = PROMPT_REGISTRY[PromptType.DOCUMENT_ANALYSIS_REDUCE.value]
+
+            config = self.model_loader.config.get("analysis") or {}
+            self.mode = config.get("mode", "auto")
+            self.threshold_tokens = int(config.get("threshold_tokens", 12000))
+            self.max_chunk_tokens = int(config.get("max_chunk_tokens", 6000))
+            self.max_concurrency = int(config.get("max_concurrency", 4))
+
+            # cached results are only reused for the same prompts and model
+            self.prompt_version = prompt_version(self.prompt, self.reduce_prompt)
+            self.model_id = getattr(self.model_loader, "llm_model_id", None) or type(self.llm).__name__
+
+            self.last_llm_calls = 0
+            self.last_cache_hit = False
+            self.last_timings: Dict[str, Any] = {}
+
+            self.log.info("DocumentAnalyzer initialized successfully.", llm=str(self.llm))
+
+        except Exception as e:
+            log = CustomLogger().get_logger(__name__)
+            log.error(f"Error initializing DocumentAnalyzer:", error=str(e))
+            raise DocumentPortalException("failed to initialize DocumentAnalyzer", sys)
+
+    def _use_map_reduce(self, document_text: str, mode: Optional[str]) -> bool:
+        mode = mode or self.mode
+        if mode == "map_reduce":
+            return True
+        if mode == "auto":
+            return estimate_tokens(document_text) > self.threshold_tokens
+        return False
+
+    @staticmethod
+    def _split_pages(document_text: str) -> List[str]:
+        """Split DocHandler output back into per-page strings, keeping the page headers."""
+        parts = PAGE_MARKER.split(document_text)
+        if len(parts) == 1:
+            return [document_text]
+
+        pages = [parts[0]] if parts[0].strip() else []
+        for number, text in zip(parts[1::2], parts[2::2]):
+            pages.append(f"\n--- Page {number} ---\n{text}")
+        return pages
+
+    def _pack_chunks(self, pages: List[str]) -> List[str]:
+        """Greedily pack consecutive pages into chunks of at most max_chunk_tokens."""
+        max_chars = self.max_chunk_tokens * 4
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for page in pages:
+            # a single oversized page is cut into budget-sized windows
+            pieces = [page[i:i + max_chars] for i in range(0, len(page), max_chars)] or [page]
+            for piece in pieces:
+                tokens = estimate_tokens(piece)
+                if current and current_tokens + tokens > self.max_chunk_tokens:
+                    chunks.append("\n".join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += tokens
+
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def _map_inputs(self, document_text: str):
+        start = time.perf_counter()
+        pages = self._split_pages(document_text)
+        chunks = self._pack_chunks(pages)
+        format_instructions = self.parser.get_format_instructions()
+        inputs = [{"format_instructions": format_instructions, "document_content": c} for c in chunks]
+        split_ms = round((time.perf_counter() - start) * 1000, 1)
+        return pages, inputs, split_ms
+
+    def _reduce_input(self, partials: List[dict]) -> dict:
+        return {
+            "format_instructions": self.parser.get_format_instructions(),
+            "partial_analyses": json.dumps(partials, ensure_ascii=False),
+        }
+
+    @staticmethod
+    def _finalize(result: dict, pages: List[str]) -> dict:
+        # Page count is known exactly from the split; do not trust the LLM with it
+        if isinstance(result, dict) and len(pages) > 1:
+            result["PageCount"] = len(pages)
+        return result
+
+    def _record_timings(self, split_ms: float, map_start: float, reduce_start: float, chunks: int):
+        self.last_timings = {
+            "chunks": chunks,
+            "split_ms": split_ms,
+            "map_ms": round((reduce_start - map_start) * 1000, 1),
+            "reduce_ms": round((time.perf_counter() - reduce_start) * 1000, 1),
+        }
+        self.log.info("Map-reduce analysis finished.", **self.last_timings)
+
+    def analyze_document_map_reduce(self, document_text: str) -> dict:
+        """Analyze per chunk with bounded parallelism, then merge into one Metadata result."""
+        try:
+            pages, inputs, split_ms = self._map_inputs(document_text)
+            chain = self.prompt | self.llm | self.fixing_parser
+
+            map_start = time.perf_counter()
+            partials = chain.batch(inputs, config={"max_concurrency": self.max_concurrency})
+
+            reduce_start = time.perf_counter()
+            reduce_chain = self.reduce_prompt | self.llm | self.fixing_parser
+            response = reduce_chain.invoke(self._reduce_input(partials))
+
+            self.last_llm_calls = len(inputs) + 1
+            self._record_timings(split_ms, map_start, reduce_start, len(inputs))
+            return self._finalize(response, pages)
+
+        except Exception as e:
+            self.log.error(f"Error in map-reduce analysis:", error=str(e))
+            raise DocumentPortalException("failed to analyze document (map-reduce)", sys)
+
+    async def aanalyze_document_map_reduce(self, document_text: str) -> dict:
+        """Async variant of analyze_document_map_reduce."""
+        try:
+            pages, inputs, split_ms = self._map_inputs(document_text)
+            chain = self.prompt | self.llm | self.fixing_parser
+
+            map_start = time.perf_counter()
+            partials = await chain.abatch(inputs, config={"max_concurrency": self.max_concurrency})
+
+            reduce_start = time.perf_counter()
+            reduce_chain = self.reduce_prompt | self.llm | self.fixing_parser
+            response = await reduce_chain.ainvoke(self._reduce_input(partials))
+
+            self.last_llm_calls = len(inputs) + 1
+            self._record_timings(split_ms, map_start, reduce_start, len(inputs))
+            return self._finalize(response, pages)
+
+        except Exception as e:
+            self.log.error(f"Error in map-reduce analysis:", error=str(e))
+            raise DocumentPortalException("failed to analyze document (map-reduce)", sys)
+
+    def _result_key(self, document_text: str, mode: Optional[str], source_sha256: Optional[str]):
+        strategy = "map_reduce" if self._use_map_reduce(document_text, mode) else "single"
+        return ("analysis", source_sha256 or text_hash(document_text), self.prompt_version, self.model_id, strategy)
+
+    def _cached_result(self, key) -> Optional[dict]:
+        response = RESULT_CACHE.get(key)
+        self.last_cache_hit = response is not None
+        if self.last_cache_hit:
+            self.last_llm_calls = 0
+            self.log.info("Document analysis served from cache.", content_sha256=key[1])
+        return response
+
+    def analyze_document(self, document_text: str, mode: Optional[str] = None, source_sha256: Optional[str] = None) -> dict:
+        """Analyze the given document text and return metadata.
+
+        Results are cached by source_sha256 (the uploaded file's hash; the text hash when not
+        given), prompt version and model, so repeat analyses skip parsing and the LLM.
+        """
+        key = self._result_key(document_text, mode, source_sha256)
+        response = self._cached_result(key)
+        if response is None:
+            response = self._analyze_document(document_text, mode)
+            RESULT_CACHE.put(key, response)
+        return response
+
+    async def aanalyze_document(self, document_text: str, mode: Optional[str] = None, source_sha256: Optional[str] = None) -> dict:
+        """Async variant of analyze_document using the LLM client's native ainvoke."""
+        key = self._result_key(document_text, mode, source_sha256)
+        response = self._cached_result(key)
+        if response is None:
+            response = await self._aanalyze_document(document_text, mode)
+            RESULT_CACHE.put(key, response)
+        return response
+
+    def _analyze_document(self, document_text: str, mode: Optional[str] = None) -> dict:
+        if self._use_map_reduce(document_text, mode):
+            return self.analyze_document_map_reduce(document_text)
+
+        try:
+            chain = self.prompt | self.llm | self.fixing_parser
+
+            self.log.info("Meta-data analysis chain initialized...")
+
+            response = chain.invoke({
+                "format_instructions": self.parser.get_format_instructions(),
+                "document_content": document_text
+                })
+            self.last_llm_calls = 1
+            self.log.info("Document analyzed successfully.", response=response)
+
+            return response
+
+        except Exception as e:
+            self.log.error(f"Error analyzing document:", error=str(e))
+            raise DocumentPortalException("failed to analyze document", sys)
+
+    async def _aanalyze_document(self, document_text: str, mode: Optional[str] = None) -> dict:
+        if self._use_map_reduce(document_text, mode):
+            return await self.aanalyze_document_map_reduce(document_text)
+
+        try:
+            chain = self.prompt | self.llm | self.fixing_parser
+
+            response = await chain.ainvoke({
+                "format_instructions": self.parser.get_format_instructions(),
+                "document_content": document_text
+                })
+            self.last_llm_calls = 1
+            self.log.info("Document analyzed successfully.", response=response)
+
+            return response
+
+        except Exception as e:
+            self.log.error(f"Error analyzing document:", error=str(e))
+            raise DocumentPortalException("failed to analyze document", sys)
@@ -1,155 +1,377 @@
-import sys
-import os
-from operator import itemgetter
-from typing import Any, List, Optional
-from langchain_core.messages import BaseMessage
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_community.vectorstores import FAISS #type: ignore
-from utils.model_loader import ModelLoader
-from exception.custom_exception import DocumentPortalException
-from logger.custom_logger import CustomLogger
-from prompt.prompt_library import PROMPT_REGISTRY
-from model.models import PromptType
-
-
-class ConversationalRAG:
-    """
-    LCEL-based Conversational RAG with lazy retriever initialization.
-
-    Usage:
-        rag = ConversationalRAG(session_id="abc")
-        rag.load_retriever_from_faiss(index_path="faiss_index/abc", k=5, index_name="index")
-        answer = rag.invoke("What is ...?", chat_history=[])
-    """
-
-    def __init__(self,session_id:Optional[str], retriever=None):
-        try:
-            self.log =  CustomLogger().get_logger(__name__)
-            self.session_id = session_id
-
-            self.llm =  self._load_llm()
-            self.contextualize_prompt: ChatPromptTemplate = PROMPT_REGISTRY[PromptType.CONTEXTUALIZE_QUESTION.value]
-            self.qa_prompt: ChatPromptTemplate = PROMPT_REGISTRY[PromptType.CONTEXT_QA.value]
-
-            self.retriever = retriever
-
-            if self.retriever is not None:
-                self._build_lcel_chain()
-                
-            
-            self.log.info("ConversationalRAG initialized", session_id=self.session_id)
-            
-        except Exception as e:
-            self.log.error("Failed to initialize ConversationalRAG", error=str(e))
-            raise DocumentPortalException("Initialization error in ConversationalRAG", sys)
-            
-    
-    def load_retriever_from_faiss(self,index_path: str, k: int = 5, index_name: str ="index", search_type: str ="similarity", search_kwargs: Optional[dict[str, Any]] = None):
-        """
-        Load a FAISS vectorstore from disk and convert to retriever.
-        """
-        
-        try:
-            embeddings = ModelLoader().load_embeddings()
-            if not os.path.isdir(index_path):
-                raise FileNotFoundError(f"FAISS index directory not found: {index_path}")
-            
-            vectorstore = FAISS.load_local(
-                index_path,
-                embeddings,
-                index_name=index_name,
-                allow_dangerous_deserialization=True,  # only if you trust the index
-            )
-
-            if search_kwargs is None:
-                search_kwargs = {"k": k}
-
-            
-            self.retriever = vectorstore.as_retriever(search_type=search_type, search_kwargs=search_kwargs)
-
-            self._build_lcel_chain()
-
-            self.log.info("FAISS retriever loaded successfully", index_path=index_path, session_id=self.session_id, k=k, index_name=index_name)
-            return self.retriever
-        
-        except Exception as e:
-            self.log.error("Failed to load retriever from FAISS", error=str(e))
-            raise DocumentPortalException("Loading error in ConversationalRAG", sys)
-
-    def invoke(self,user_input:str,chat_history: Optional[List[BaseMessage]] = None) ->str:
-        """
-        Args:
-            user_input (str): _description_
-            chat_history (Optional[List[BaseMessage]], optional): _description_. Defaults to None.
-        """
-        try:
-            if self.chain is None:
-                raise DocumentPortalException("RAG chain not initialized. Call load_retriever_from_faiss() before invoke().", sys)
-
-            
-            chat_history = chat_history or []
-            payload={"input": user_input, "chat_history": chat_history}
-            answer = self.chain.invoke(payload)
-            if not answer:
-                self.log.warning("No answer generated", user_input=user_input, session_id=self.session_id)
-                return "no answer generated."
-            
-            self.log.info("Chain invoked successfully",
-                session_id=self.session_id,
-                user_input=user_input,
-                answer_preview=answer[:150],
-            )
-            return answer
-        except Exception as e:
-            self.log.error("Failed to invoke ConversationalRAG", error=str(e))
-            raise DocumentPortalException("Invocation error in ConversationalRAG", sys)
-
-    def _load_llm(self):
-        try:
-            llm = ModelLoader().load_llm()
-            if not llm:
-                raise ValueError("LLM could not be loaded")
-            self.log.info("LLM loaded successfully", session_id=self.session_id)
-            return llm
-        except Exception as e:
-            self.log.error("Failed to load LLM", error=str(e))
-            raise DocumentPortalException("LLM loading error in ConversationalRAG", sys)
-    
-    @staticmethod
-    def _format_docs(docs):
-        return "\n\n".join(d.page_content for d in docs)
-    
-    def _build_lcel_chain(self):
-        try:
-            # 1) Rewrite question using chat history
-            question_rewriter = (
-                {"input": itemgetter("input"), "chat_history": itemgetter("chat_history")}
-                | self.contextualize_prompt
-                | self.llm
-                | StrOutputParser()
-            )
-
-            # 2) Retrieve docs for rewritten question
-            retrieve_docs = question_rewriter | self.retriever | self._format_docs
-
-            # 3) Feed context + original input + chat history into answer prompt
-            self.chain = (
-                {
-                    "context": retrieve_docs,
-                    "input": itemgetter("input"),
-                    "chat_history": itemgetter("chat_history"),
-                }
-                | self.qa_prompt
-                | self.llm
-                | StrOutputParser()
-            )
-
-            self.log.info("LCEL graph built successfully", session_id=self.session_id)
-
-        except Exception as e:
-            self.log.error("Failed to build LCEL chain", error=str(e), session_id=self.session_id)
-            raise DocumentPortalException("Failed to build LCEL chain", sys)
-
+import sys
+import os
+import time
+from operator import itemgetter
+from typing import Any, AsyncIterator, Dict, List, Optional
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableBranch, RunnablePassthrough
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_community.vectorstores import FAISS #type: ignore
+from utils.model_loader import ModelLoader
+from utils.cache import VECTORSTORE_CACHE, index_key, faiss_index_version, text_hash
+from utils.answer_cache import ANSWER_CACHE, normalize_question
+from utils.index_store import load_vector_store
+from utils.retrievers import build_retriever, load_bm25, retrieval_settings
+from utils.chat_history import ChatHistoryStore, get_chat_history_store
+from utils.concurrency import run_blocking
+from utils.context_packer import context_token_budget, pack_context, source_id
+from exception.custom_exception import DocumentPortalException
+from logger.custom_logger import CustomLogger
+from prompt.prompt_library import PROMPT_REGISTRY
+from model.models import PackedContext, PromptType
+
+
+class ConversationalRAG:
+    """
+    LCEL-based Conversational RAG with lazy retriever initialization.
+
+    Usage:
+        rag = ConversationalRAG(session_id="abc")
+        rag.load_retriever_from_faiss(index_path="faiss_index/abc", k=5, index_name="index")
+        answer = rag.invoke("What is ...?", chat_history=[])
+
+    When chat_history is not given, the conversation named by conversation_id is read from
+    and appended to the server-side ChatHistoryStore; with neither, the turn has no history.
+    One instance is shared by every caller of an index (RAG_CACHE), so nothing about a
+    single request is kept on it.
+    """
+
+    def __init__(self,session_id:Optional[str], retriever=None, history_store: Optional[ChatHistoryStore] = None):
+        try:
+            self.log =  CustomLogger().get_logger(__name__)
+            self.session_id = session_id
+
+            self.rewrite_llm = None
+            self.llm =  self._load_llm()
+            self.contextualize_prompt: ChatPromptTemplate = PROMPT_REGISTRY[PromptType.CONTEXTUALIZE_QUESTION.value]
+            self.qa_prompt: ChatPromptTemplate = PROMPT_REGISTRY[PromptType.CONTEXT_QA.value]
+            self.summary_prompt: ChatPromptTemplate = PROMPT_REGISTRY[PromptType.SUMMARIZE_HISTORY.value]
+            self.history_store = history_store or get_chat_history_store()
+
+            self.retriever = retriever
+            self.chain = None
+
+            # set by load_retriever_from_faiss; answers are only cached for a known index version
+            self.index_version = None
+            self.embeddings = None
+
+            # retrieved chunks are packed into this many tokens
+            self.context_budget = context_token_budget()
+
+            if self.retriever is not None:
+                self._build_lcel_chain()
+                
+            
+            self.log.info("ConversationalRAG initialized", session_id=self.session_id)
+            
+        except Exception as e:
+            self.log.error("Failed to initialize ConversationalRAG", error=str(e))
+            raise DocumentPortalException("Initialization error in ConversationalRAG", sys)
+            
+    
+    def load_retriever_from_faiss(self,index_path: str, k: int = 5, index_name: str ="index", search_type: Optional[str] = None, search_kwargs: Optional[dict[str, Any]] = None,
+                                  fetch_k: Optional[int] = None, score_threshold: Optional[float] = None, rerank: Optional[bool] = None):
+        """
+        Load a FAISS vectorstore from disk and convert to retriever.
+
+        search_type is one of similarity / mmr / similarity_score_threshold / hybrid and, like
+        fetch_k and score_threshold, defaults to config.yaml `retrieval`; rerank defaults to
+        `rerank.enabled`. Passing search_kwargs hands them to FAISS.as_retriever unchanged.
+        """
+        
+        try:
+            if not os.path.isdir(index_path):
+                raise FileNotFoundError(f"FAISS index directory not found: {index_path}")
+
+            def _load_vectorstore():
+                embeddings = ModelLoader().load_embeddings()
+                return load_vector_store(index_path, embeddings, index_name=index_name)
+
+            # Reuse an already deserialized index unless it changed on disk
+            version = faiss_index_version(index_path, index_name)
+            vectorstore = VECTORSTORE_CACHE.get_or_load(
+                (index_key(index_path), index_name),
+                _load_vectorstore,
+                version=version,
+            )
+
+            if search_kwargs is not None:
+                search_type = search_type or "similarity"
+                self.retriever = vectorstore.as_retriever(search_type=search_type, search_kwargs=search_kwargs)
+            else:
+                settings = retrieval_settings(search_type=search_type, fetch_k=fetch_k, score_threshold=score_threshold)
+                search_type = settings["search_type"]
+                bm25 = None
+                if settings["search_type"] == "hybrid":
+                    bm25 = VECTORSTORE_CACHE.get_or_load(
+                        (index_key(index_path), index_name, "bm25"),
+                        lambda: load_bm25(index_path, vectorstore, index_name=index_name),
+                        version=version,
+                    )
+                self.retriever = build_retriever(vectorstore, k=k, bm25=bm25, rerank=rerank, **settings)
+            self.index_version = (index_key(index_path), index_name, version)
+            self.embeddings = getattr(vectorstore, "embeddings", None)
+
+            self._build_lcel_chain()
+
+            self.log.info("FAISS retriever loaded successfully", index_path=index_path, session_id=self.session_id, k=k, index_name=index_name,
+                          search_type=search_type)
+            return self.retriever
+        
+        except Exception as e:
+            self.log.error("Failed to load retriever from FAISS", error=str(e))
+            raise DocumentPortalException("Loading error in ConversationalRAG", sys)
+
+    def invoke(self,user_input:str,chat_history: Optional[List[BaseMessage]] = None, conversation_id: Optional[str] = None) ->str:
+        """
+        Args:
+            user_input (str): the user's question.
+            chat_history (Optional[List[BaseMessage]], optional): explicit history, trimmed to the
+                token budget. Defaults to None, which uses the stored conversation.
+            conversation_id (Optional[str], optional): stored conversation to use. Defaults to None,
+                which answers without history.
+        """
+        try:
+            if self.chain is None:
+                raise DocumentPortalException("RAG chain not initialized. Call load_retriever_from_faiss() before invoke().", sys)
+
+            
+            chat_history, conversation_id = self._resolve_history(chat_history, conversation_id)
+            payload={"input": user_input, "chat_history": chat_history}
+
+            question = self.question_rewriter.invoke(payload)
+            docs = self.retriever.invoke(question)
+
+            scope = self._answer_scope(docs)
+            vector = self._question_vector(question) if scope else None
+            answer = self._cached_answer(scope, question, vector)
+            if answer is None:
+                answer = self.answer_chain.invoke({**payload, "context": self._pack(docs).text})
+                if answer and scope:
+                    ANSWER_CACHE.put(scope, question, answer, vector)
+
+            if not answer:
+                self.log.warning("No answer generated", user_input=user_input, session_id=self.session_id)
+                return "no answer generated."
+
+            self._record_turn(conversation_id, user_input, answer)
+            self.log.info("Chain invoked successfully",
+                session_id=self.session_id,
+                user_input=user_input,
+                answer_preview=answer[:150],
+            )
+            return answer
+        except Exception as e:
+            self.log.error("Failed to invoke ConversationalRAG", error=str(e))
+            raise DocumentPortalException("Invocation error in ConversationalRAG", sys)
+
+    async def ainvoke(self, user_input: str, chat_history: Optional[List[BaseMessage]] = None, conversation_id: Optional[str] = None) -> str:
+        """Async variant of invoke; awaits the chain so the event loop stays free during LLM calls."""
+        try:
+            if self.chain is None:
+                raise DocumentPortalException("RAG chain not initialized. Call load_retriever_from_faiss() before ainvoke().", sys)
+
+            chat_history, conversation_id = await run_blocking(self._resolve_history, chat_history, conversation_id)
+            payload = {"input": user_input, "chat_history": chat_history}
+
+            question = await self.question_rewriter.ainvoke(payload)
+            docs = await self.retriever.ainvoke(question)
+
+            scope = self._answer_scope(docs)
+            vector = await self._aquestion_vector(question) if scope else None
+            answer = self._cached_answer(scope, question, vector)
+            if answer is None:
+                answer = await self.answer_chain.ainvoke({**payload, "context": self._pack(docs).text})
+                if answer and scope:
+                    ANSWER_CACHE.put(scope, question, answer, vector)
+
+            if not answer:
+                self.log.warning("No answer generated", user_input=user_input, session_id=self.session_id)
+                return "no answer generated."
+
+            await run_blocking(self._record_turn, conversation_id, user_input, answer)
+            self.log.info("Chain invoked successfully",
+                session_id=self.session_id,
+                user_input=user_input,
+                answer_preview=answer[:150],
+            )
+            return answer
+        except Exception as e:
+            self.log.error("Failed to invoke ConversationalRAG", error=str(e))
+            raise DocumentPortalException("Invocation error in ConversationalRAG", sys)
+
+    async def astream(self, user_input: str, chat_history: Optional[List[BaseMessage]] = None, conversation_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run the chain step by step, yielding events as they become available.
+
+        Yields ``question`` (the rewritten query), ``sources`` (chunks packed into the context), one
+        ``token`` event per streamed answer chunk and a final ``done`` event with timings.
+        """
+        try:
+            if self.chain is None:
+                raise DocumentPortalException("RAG chain not initialized. Call load_retriever_from_faiss() before astream().", sys)
+
+            start = time.perf_counter()
+            chat_history, conversation_id = await run_blocking(self._resolve_history, chat_history, conversation_id)
+            payload = {"input": user_input, "chat_history": chat_history}
+
+            question = await self.question_rewriter.ainvoke(payload)
+            yield {"type": "question", "data": question}
+
+            docs = await self.retriever.ainvoke(question)
+            packed = self._pack(docs)
+            included = set(packed.source_ids)
+            yield {"type": "sources", "data": [self._source_ref(d) for d in docs if source_id(d) in included]}
+
+            scope = self._answer_scope(docs)
+            vector = await self._aquestion_vector(question) if scope else None
+            cached = self._cached_answer(scope, question, vector)
+
+            ttft_ms = None
+            answer_parts: List[str] = []
+            if cached is not None:
+                ttft_ms = round((time.perf_counter() - start) * 1000, 1)
+                answer_parts.append(cached)
+                yield {"type": "token", "data": cached}
+            else:
+                async for token in self.answer_chain.astream({**payload, "context": packed.text}):
+                    if ttft_ms is None:
+                        ttft_ms = round((time.perf_counter() - start) * 1000, 1)
+                    answer_parts.append(token)
+                    yield {"type": "token", "data": token}
+                if scope and answer_parts:
+                    ANSWER_CACHE.put(scope, question, "".join(answer_parts), vector)
+
+            if answer_parts:
+                await run_blocking(self._record_turn, conversation_id, user_input, "".join(answer_parts))
+
+            timings = {"ttft_ms": ttft_ms, "total_ms": round((time.perf_counter() - start) * 1000, 1), "cached": cached is not None,
+                       "context_tokens": packed.tokens}
+            self.log.info("Chain streamed successfully",
+                session_id=self.session_id,
+                user_input=user_input,
+                answer_preview="".join(answer_parts)[:150],
+                **timings,
+            )
+            yield {"type": "done", "data": timings}
+
+        except Exception as e:
+            self.log.error("Failed to stream ConversationalRAG", error=str(e))
+            raise DocumentPortalException("Streaming error in ConversationalRAG", sys)
+
+    def _resolve_history(self, chat_history: Optional[List[BaseMessage]], conversation_id: Optional[str]):
+        """Return (history for the prompt, conversation id to record the turn under or None)."""
+        if chat_history is not None:
+            # caller owns the history; only keep it within the token budget
+            return self.history_store.fit(chat_history)[1], None
+        # only the caller's own conversation; this instance is shared across sessions
+        if not conversation_id:
+            return [], None
+        return self.history_store.window(conversation_id, self._summarize_history), conversation_id
+
+    def _record_turn(self, conversation_id: Optional[str], user_input: str, answer: str):
+        if conversation_id:
+            self.history_store.append_turn(conversation_id, user_input, answer)
+
+    def _summarize_history(self, summary: str, messages: List[BaseMessage]) -> str:
+        chain = self.summary_prompt | (self.rewrite_llm or self.llm) | StrOutputParser()
+        return chain.invoke({"summary": summary or "(none yet)", "messages": messages})
+
+    def _answer_scope(self, docs) -> Optional[tuple]:
+        """Cache scope for an answer: same index state, model and retrieved chunks.
+
+        Answers are looked up by the rewritten standalone question, which already carries
+        what the history contributes, so follow-ups in a long conversation can still hit.
+        """
+        if self.index_version is None:
+            return None
+        chunk_ids = tuple(getattr(d, "id", None) or text_hash(d.page_content)[:16] for d in docs)
+        return (self.index_version, self.model_id, chunk_ids)
+
+    def _question_vector(self, question: str):
+        if not ANSWER_CACHE.semantic_enabled or self.embeddings is None:
+            return None
+        return self.embeddings.embed_query(normalize_question(question))
+
+    async def _aquestion_vector(self, question: str):
+        if not ANSWER_CACHE.semantic_enabled or self.embeddings is None:
+            return None
+        return await self.embeddings.aembed_query(normalize_question(question))
+
+    def _cached_answer(self, scope, question: str, vector) -> Optional[str]:
+        answer = ANSWER_CACHE.get(scope, question, vector) if scope else None
+        if answer is not None:
+            self.log.info("Answer served from cache.", question=question)
+        return answer
+
+    @staticmethod
+    def _source_ref(doc) -> Dict[str, Any]:
+        md = doc.metadata or {}
+        return {"id": getattr(doc, "id", None), "source": md.get("source"), "page": md.get("page")}
+
+    def _load_llm(self):
+        try:
+            loader = ModelLoader()
+            llm = loader.load_llm()
+            self.model_id = getattr(loader, "llm_model_id", None) or type(llm).__name__
+            if not llm:
+                raise ValueError("LLM could not be loaded")
+            self.rewrite_llm = loader.load_rewrite_llm()
+            self.log.info("LLM loaded successfully", session_id=self.session_id)
+            return llm
+        except Exception as e:
+            self.log.error("Failed to load LLM", error=str(e))
+            raise DocumentPortalException("LLM loading error in ConversationalRAG", sys)
+    
+    def _pack(self, docs) -> PackedContext:
+        """Pack retrieved chunks into the context token budget (deduplicated, sentence-trimmed)."""
+        packed = pack_context(docs, self.context_budget)
+        self.log.info("Context packed.",
+            source_ids=packed.source_ids,
+            packed_tokens=packed.tokens,
+            budget_tokens=self.context_budget,
+            retrieved=packed.retrieved,
+            included=len(packed.source_ids),
+            deduplicated=packed.deduplicated,
+            dropped=packed.dropped,
+            truncated=packed.truncated,
+        )
+        return packed
+
+    def _format_docs(self, docs) -> str:
+        return self._pack(docs).text
+    
+    def _build_lcel_chain(self):
+        try:
+            # 1) Rewrite question using chat history; a first turn has nothing to resolve,
+            #    so it goes to retrieval as-is without an LLM round trip
+            rewrite_llm = self.rewrite_llm or self.llm
+            self.question_rewriter = RunnableBranch(
+                (lambda x: not x.get("chat_history"), itemgetter("input")),
+                {"input": itemgetter("input"), "chat_history": itemgetter("chat_history")}
+                | self.contextualize_prompt
+                | rewrite_llm
+                | StrOutputParser(),
+            )
+
+            # 2) Retrieve docs for rewritten question
+            retrieve_docs = self.question_rewriter | self.retriever | self._format_docs
+
+            # 3) Feed context + original input + chat history into answer prompt
+            self.answer_chain = self.qa_prompt | self.llm | StrOutputParser()
+            self.chain = (
+                {
+                    "context": retrieve_docs,
+                    "input": itemgetter("input"),
+                    "chat_history": itemgetter("chat_history"),
+                }
+                | self.answer_chain
+            )
+
+            self.log.info("LCEL graph built successfully", session_id=self.session_id)
+
+        except Exception as e:
+            self.log.error("Failed to build LCEL chain", error=str(e), session_id=self.session_id)
+            raise DocumentPortalException("Failed to build LCEL chain", sys)
+
     
\ No newline at end of file
@@ -1,62 +1,237 @@
-import sys
-import pandas as pd
-from dotenv import load_dotenv
-from utils.model_loader import ModelLoader
-from model.models import *
-from prompt.prompt_library import PROMPT_REGISTRY
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_classic.output_parsers import OutputFixingParser  #type: ignore
-from exception.custom_exception import DocumentPortalException
-from logger.custom_logger import CustomLogger
-
-
-
-class DocumentComparaorLLM:
-    def __init__(self):
-        load_dotenv()
-        self.log = CustomLogger().get_logger(__name__)
-        self.loader = ModelLoader()
-        self.llm = self.loader.load_llm()
-        self.parser = JsonOutputParser(pydantic_object=SummaryResponse)
-        self.fixing_parser = OutputFixingParser.from_llm(parser=self.parser, llm=self.llm)
-
-        self.prompt = PROMPT_REGISTRY["document_comparison_prompt"]
-        self.chain = self.prompt | self.llm | self.parser
-
-        self.log.info("DocumentComparatorLLM initialized with model and parser.")
-
-    def compare_documents(self, combined_docs:str):
-        """
-        Compares two documents and returns a structured comparison.
-        """
-        print("==============================")
-        print(combined_docs)
-        print("==============================")
-        try:
-            inputs = {
-                "combined_docs": combined_docs,
-                "format_instructions": self.parser.get_format_instructions()
-            }
-
-            self.log.info("Starting document comparison.", inputs=inputs)
-            response = self.chain.invoke(inputs)
-            print("response:::",response)
-            self.log.info("Document comparison completed.", response=response)
-
-            return self._format_response(response)
-            
-        except Exception as e:
-            raise DocumentPortalException("An Error occurred while comparing documents.", sys)
-        
-
-    def _format_response(self, response_parsed: list[dict])->pd.DataFrame:
-        """
-        Formats the response from the LLM into a structured format.
-        """
-        try:
-            df = pd.DataFrame(response_parsed)
-            self.log.info("response formated into Dataframe.", dataframe=df)
-            return df
-        except Exception as e:
-            self.log.error("Error formatting response into DataFrame", error=str(e))
+import sys
+import json
+import pandas as pd
+from dotenv import load_dotenv
+from utils.model_loader import ModelLoader
+from model.models import *
+from prompt.prompt_library import PROMPT_REGISTRY
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_classic.output_parsers import OutputFixingParser  #type: ignore
+from exception.custom_exception import DocumentPortalException
+from logger.custom_logger import CustomLogger
+from utils.cache import RESULT_CACHE, prompt_version, text_hash
+from src.document_compare.page_diff import NO_CHANGE, align_pages, format_changed_segments, is_removed_page_label, removed_page_label
+
+
+
+class DocumentComparaorLLM:
+    def __init__(self):
+        load_dotenv()
+        self.log = CustomLogger().get_logger(__name__)
+        self.loader = ModelLoader()
+        self.llm = self.loader.load_llm()
+        self.parser = JsonOutputParser(pydantic_object=SummaryResponse)
+        self.fixing_parser = OutputFixingParser.from_llm(parser=self.parser, llm=self.llm)
+
+        self.prompt = PROMPT_REGISTRY["document_comparison_prompt"]
+        self.chain = self.prompt | self.llm | self.parser
+        self.prompt_version = prompt_version(self.prompt)
+        self.model_id = getattr(self.loader, "llm_model_id", None) or type(self.llm).__name__
+        self.last_llm_calls = 0
+        self.last_cache_hit = False
+
+        self.log.info("DocumentComparatorLLM initialized with model and parser.")
+
+    def compare_documents(self, combined_docs:str):
+        """
+        Compares two documents and returns a structured comparison.
+        """
+        print("==============================")
+        print(combined_docs)
+        print("==============================")
+        try:
+            inputs = {
+                "combined_docs": combined_docs,
+                "format_instructions": self.parser.get_format_instructions()
+            }
+
+            self.log.info("Starting document comparison.", inputs=inputs)
+            response = self.chain.invoke(inputs)
+            print("response:::",response)
+            self.log.info("Document comparison completed.", response=response)
+
+            return self._format_response(response)
+            
+        except Exception as e:
+            raise DocumentPortalException("An Error occurred while comparing documents.", sys)
+
+    async def acompare_documents(self, combined_docs: str):
+        """Async variant of compare_documents using the LLM client's native ainvoke."""
+        try:
+            inputs = {
+                "combined_docs": combined_docs,
+                "format_instructions": self.parser.get_format_instructions()
+            }
+
+            self.log.info("Starting document comparison.")
+            response = await self.chain.ainvoke(inputs)
+            self.log.info("Document comparison completed.", response=response)
+
+            return self._format_response(response)
+
+        except Exception as e:
+            raise DocumentPortalException("An Error occurred while comparing documents.", sys)
+        
+
+    def _prefilter(self, reference_pages: list[str], actual_pages: list[str]):
+        diff = align_pages(reference_pages, actual_pages)
+        self.log.info(
+            "Page pre-diff completed.",
+            total_pages=len(actual_pages),
+            unchanged_pages=len(diff.unchanged_pages),
+            changed_segments=len(diff.changed),
+            changed_pages=diff.changed_page_count,
+        )
+        return diff
+
+    def _normalize_rows(self, llm_rows: Any) -> list[dict]:
+        """Coerce parser output to a list of {"Page": str, "Changes": str} rows.
+
+        JsonOutputParser returns whatever JSON the model produced: besides the requested
+        list this may be a JSON string, one row object, or the list wrapped in an object
+        such as {"rows": [...]}. Anything that is not a row is dropped with a warning.
+        """
+        if isinstance(llm_rows, str):
+            try:
+                llm_rows = json.loads(llm_rows)
+            except ValueError:
+                self.log.warning("Comparison output is not JSON; ignored.", output=llm_rows[:200])
+                return []
+        if isinstance(llm_rows, dict):
+            if "Page" in llm_rows or "page" in llm_rows:
+                llm_rows = [llm_rows]
+            else:
+                lists = [value for value in llm_rows.values() if isinstance(value, list)]
+                llm_rows = lists[0] if len(lists) == 1 else llm_rows
+        if llm_rows is None:
+            return []
+        if not isinstance(llm_rows, list):
+            self.log.warning("Comparison output has no rows; ignored.", output_type=type(llm_rows).__name__)
+            return []
+
+        rows: list[dict] = []
+        for item in llm_rows:
+            if not isinstance(item, dict):
+                continue
+            page = item.get("Page", item.get("page"))
+            changes = item.get("Changes", item.get("changes"))
+            if page is None or changes is None:
+                continue
+            rows.append(ChangeFormat(Page=self._page_label(str(page)), Changes=str(changes)).model_dump())
+
+        if len(rows) != len(llm_rows):
+            self.log.warning("Malformed comparison rows dropped.", kept=len(rows), received=len(llm_rows))
+        return rows
+
+    @staticmethod
+    def _page_number(label: str) -> Optional[int]:
+        digits = "".join(ch for ch in label if ch.isdigit())
+        return int(digits) if digits else None
+
+    def _page_label(self, label: str) -> str:
+        """Canonical label; removed reference pages become "ref N (removed)" so they never collide with actual page N."""
+        number = self._page_number(label)
+        if number is not None and is_removed_page_label(label):
+            return removed_page_label(number)
+        return label
+
+    def _merge_rows(self, diff, llm_rows: Any) -> pd.DataFrame:
+        """Combine deterministic "No Change" rows with LLM rows, ordered by actual page.
+
+        Removed reference pages are placed where they were cut, after the actual pages of
+        their segment.
+        """
+        rows = [{"Page": str(page), "Changes": NO_CHANGE} for page in diff.unchanged_pages]
+        rows.extend(self._normalize_rows(llm_rows))
+        removed_at = {page: segment.actual_start + len(segment.actual_pages)
+                      for segment in diff.changed for page, _ in segment.reference_pages}
+
+        def _page_key(row):
+            label = str(row.get("Page", ""))
+            number = self._page_number(label)
+            if number is None:
+                return (float("inf"), label)
+            if is_removed_page_label(label):
+                return (removed_at.get(number, float("inf")) + 0.5, label)
+            return (number, label)
+
+        return self._format_response(sorted(rows, key=_page_key))
+
+    def _result_key(self, reference_pages: list[str], actual_pages: list[str], source_sha256: Optional[Tuple[str, str]]):
+        ref_sha, act_sha = source_sha256 or (text_hash("\f".join(reference_pages)), text_hash("\f".join(actual_pages)))
+        return ("compare", ref_sha, act_sha, self.prompt_version, self.model_id)
+
+    def _cached_rows(self, key) -> Optional[pd.DataFrame]:
+        rows = RESULT_CACHE.get(key)
+        self.last_cache_hit = rows is not None
+        if rows is None:
+            return None
+        self.last_llm_calls = 0
+        self.log.info("Document comparison served from cache.", reference_sha256=key[1], actual_sha256=key[2])
+        return self._format_response(rows)
+
+    def _llm_inputs(self, diff) -> Optional[dict]:
+        """Prompt inputs for the changed segments, or None when every page is unchanged."""
+        if not diff.changed:
+            return None
+        return {
+            "combined_docs": format_changed_segments(diff.changed),
+            "format_instructions": self.parser.get_format_instructions()
+        }
+
+    def _store_rows(self, key, diff, llm_rows: Any, llm_calls: int) -> pd.DataFrame:
+        self.last_llm_calls = llm_calls
+        df = self._merge_rows(diff, llm_rows)
+        RESULT_CACHE.put(key, df.to_dict(orient="records"))
+        return df
+
+    def compare_pages(self, reference_pages: list[str], actual_pages: list[str], source_sha256: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+        """
+        Compares two documents page by page. Identical pages are reported as "No Change"
+        without an LLM call; only changed page runs are sent to the LLM.
+
+        Rows are cached by the (reference, actual) file hashes, prompt version and model.
+        """
+        key = self._result_key(reference_pages, actual_pages, source_sha256)
+        cached = self._cached_rows(key)
+        if cached is not None:
+            return cached
+
+        try:
+            diff = self._prefilter(reference_pages, actual_pages)
+            inputs = self._llm_inputs(diff)
+            llm_rows = self.chain.invoke(inputs) if inputs else []
+            return self._store_rows(key, diff, llm_rows, llm_calls=int(inputs is not None))
+
+        except Exception as e:
+            self.log.error("Error comparing document pages.", error=str(e))
+            raise DocumentPortalException("An Error occurred while comparing documents.", sys)
+
+    async def acompare_pages(self, reference_pages: list[str], actual_pages: list[str], source_sha256: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+        """Async variant of compare_pages."""
+        key = self._result_key(reference_pages, actual_pages, source_sha256)
+        cached = self._cached_rows(key)
+        if cached is not None:
+            return cached
+
+        try:
+            diff = self._prefilter(reference_pages, actual_pages)
+            inputs = self._llm_inputs(diff)
+            llm_rows = await self.chain.ainvoke(inputs) if inputs else []
+            return self._store_rows(key, diff, llm_rows, llm_calls=int(inputs is not None))
+
+        except Exception as e:
+            self.log.error("Error comparing document pages.", error=str(e))
+            raise DocumentPortalException("An Error occurred while comparing documents.", sys)
+
+    def _format_response(self, response_parsed: list[dict])->pd.DataFrame:
+        """
+        Formats the response from the LLM into a structured format.
+        """
+        try:
+            df = pd.DataFrame(response_parsed)
+            self.log.info("response formated into Dataframe.", dataframe=df)
+            return df
+        except Exception as e:
+            self.log.error("Error formatting response into DataFrame", error=str(e))
             raise DocumentPortalException("Error formatting response",sys)
\ No newline at end of file
@@ -0,0 +1,65 @@
+from __future__ import annotations
+import re
+import hashlib
+from difflib import SequenceMatcher
+from typing import List
+from model.models import ChangedSegment, PageDiff
+
+
+NO_CHANGE = "No Change"
+
+_REMOVED_LABEL = re.compile(r"ref|removed", re.IGNORECASE)
+
+
+def removed_page_label(page: int) -> str:
+    """Page label for a reference page that has no counterpart in the actual document."""
+    return f"ref {page} (removed)"
+
+
+def is_removed_page_label(label: str) -> bool:
+    return bool(_REMOVED_LABEL.search(label))
+
+
+def _page_hash(text: str) -> str:
+    """Hash of whitespace-normalized page text, so reflowed but identical pages still match."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def align_pages(reference_pages: List[str], actual_pages: List[str]) -> PageDiff:
+    """Align two page lists by content hash.
+
+    difflib's sequence alignment over page hashes keeps identical pages matched even when
+    pages were inserted or removed earlier in the document.
+    """
+    ref_hashes = [_page_hash(p) for p in reference_pages]
+    act_hashes = [_page_hash(p) for p in actual_pages]
+
+    diff = PageDiff()
+    matcher = SequenceMatcher(None, ref_hashes, act_hashes, autojunk=False)
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            diff.unchanged_pages.extend(range(j1 + 1, j2 + 1))
+        else:
+            diff.changed.append(ChangedSegment(
+                reference_pages=[(i + 1, reference_pages[i]) for i in range(i1, i2)],
+                actual_pages=[(j + 1, actual_pages[j]) for j in range(j1, j2)],
+                actual_start=j1,
+            ))
+
+    return diff
+
+
+def format_changed_segments(segments: List[ChangedSegment]) -> str:
+    """Render changed segments in the same shape combined_documents() produces for the LLM."""
+    parts = []
+    for segment in segments:
+        ref = "\n".join(f"\n--- Page ref {n} ---\n{text}" for n, text in segment.reference_pages) or "\n(no pages)"
+        act = "\n".join(f"\n--- Page {n} ---\n{text}" for n, text in segment.actual_pages) or "\n(no pages)"
+        parts.append(f"\n--- Document: reference ---\n{ref}\n\n--- Document: actual ---\n{act}")
+    header = (
+        "Only the pages that differ are included below. "
+        "Report page numbers of the actual document. A reference page with no counterpart in the "
+        f"actual document was removed: report its Page as \"{removed_page_label(3)}\" (for reference page 3)."
+    )
+    return header + "\n" + "\n".join(parts)
@@ -0,0 +1,28 @@
+"""
+Convert FAISS index directories to the columnar chunk store.
+
+Migrates LangChain's pickled ``index.pkl`` docstore in place; FaissManager does the same
+on its next load, this converts ahead of time
+(e.g. before switching readers to the lazy docstore).
+
+Usage:
+    python -m src.document_ingestion.convert_chunk_store faiss_index/*/
+"""
+import argparse
+
+from utils.index_store import convert_legacy_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("index_dirs", nargs="+", help="directories holding index.faiss")
+    parser.add_argument("--index-name", default="index")
+    args = parser.parse_args()
+
+    for index_dir in args.index_dirs:
+        rows = convert_legacy_store(index_dir, index_name=args.index_name)
+        print(f"{index_dir}: {'converted ' + str(rows) + ' rows' if rows else 'nothing to convert'}")
+
+
+if __name__ == "__main__":
+    main()
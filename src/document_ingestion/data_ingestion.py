@@ -1,366 +1,649 @@
-from __future__ import annotations
-from typing import List, Optional, Dict, Any, Iterable
-from pathlib import Path
-import os
-import uuid
-import sys
-import json
-import hashlib
-import fitz  # PyMuPDF
-import shutil
-from datetime import datetime, timezone
-from langchain_core.documents import Document
-from utils.model_loader import ModelLoader
-from logger.custom_logger import CustomLogger
-from exception.custom_exception import DocumentPortalException
-from utils.model_loader import ModelLoader
-from utils.file_io import _session_id, save_uploaded_file
-from utils.document_ops import load_documents, concat_for_analysis, concat_for_comparison
-from langchain_community.vectorstores import FAISS  # type: ignore
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-
-class FaissManager:
-    """A class to manage FAISS vector store operations including creation, loading, and saving.
-    Automatically logs all actions and handles exceptions."""
-    def __init__(self, index_dir: Path, model_loader: Optional[ModelLoader] = None):
-        self.log = CustomLogger().get_logger(__name__)
-
-        self.index_dir = Path(index_dir)
-        self.index_dir.mkdir(parents=True, exist_ok=True)
-
-        self.meta_path = self.index_dir / "ingested_metadata.json"
-        self._meta_data: Dict[str, Any] = {"rows": {}}
-
-        if self.meta_path.exists():
-            try:
-                self._meta_data = json.loads(self.meta_path.read_text(encoding="utf-8")) or {"rows": {}}
-                self.log.info("Existing metadata loaded.", index_dir=str(self.index_dir), meta_path=str(self.meta_path))
-
-            except Exception as e:
-                self.log.error("Failed to load existing metadata.", error=str(e))
-                raise DocumentPortalException("Failed to load existing metadata", sys)
-
-        self.model_loader = model_loader or ModelLoader()
-        self.embedding_model = self.model_loader.load_embeddings()
-        self.vector_store: Optional[FAISS] = None
-
-        self.log.info("FaissManager initialized.", index_dir=str(self.index_dir))
-
-    def _exist(self):
-        """Check if FAISS index files exist in the index directory."""
-        return (self.index_dir / "index.faiss").exists() and (self.index_dir / "index.pkl").exists()
-
-    @staticmethod
-    def _fingerprint(text: str, md: Dict[str, Any]) -> str:
-        """Generate a unique fingerprint for the document based on its content and metadata."""
-        source = md.get("source") or md.get("file_path") or "unknown_source"
-        row_id = md.get("row_id")
-
-        if source is not None:
-            return f"{source}:: {'' if row_id is None else row_id}"
-        
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
-
-    def _save_meta(self):
-        """Save the current metadata to the meta_path as a JSON file."""
-        self.meta_path.write_text(json.dumps(self._meta_data, ensure_ascii=False, indent=2), encoding="utf-8")
-
-    def add_documents(self, docs: List[Document]):
-        """ Add documents to the FAISS index, avoiding duplicates based on fingerprints."""
-        if self.vector_store is None:
-            raise RuntimeError("Vector store not initialized. Call load_or_create_index() first, before add_documents_idempotent().",)
-
-        new_docs: List[Document] = []
-
-        for doc in docs:
-
-            key = self._fingerprint(doc.page_content, doc.metadata or {})
-
-            if key in self._meta_data["rows"]:
-                self.log.info("Document already exists in index. Skipping.", fingerprint=key)
-                continue
-
-            self._meta_data["rows"][key] = True
-            new_docs.append(doc)
-
-        if new_docs:
-            self.vector_store.add_documents(new_docs)
-            self.vector_store.save_local(str(self.index_dir))
-            self._save_meta()
-            self.log.info("New documents added to FAISS index.", count=len(new_docs))
-        
-        return len(new_docs)
-
-
-    def load_or_create_index(self, texts: Optional[List[str]] =None, metadatas: Optional[List[Dict]] = None):
-        """"""
-        if self._exist():
-            self.vector_store = FAISS.load_local(
-                str(self.index_dir), 
-                embeddings=self.embedding_model,
-                allow_dangerous_deserialization=True)
-            self.log.info("FAISS index loaded from disk.", index_dir=str(self.index_dir))
-
-            return self.vector_store
-        
-        if not texts:
-            raise DocumentPortalException("No texts or metadatas provided for creating new FAISS index", sys)
-
-        self.vector_store = FAISS.from_texts(
-            texts=texts,
-            embedding=self.embedding_model,
-            metadatas=metadatas or [])
-        self.vector_store.save_local(str(self.index_dir))
-
-        self.log.info("New FAISS index created and saved to disk.", index_dir=str(self.index_dir))
-
-        return self.vector_store
-    
-
-class DocHandler:
-    """A class to handle document operations such as saving and reading PDF files."""
-    def __init__(self, data_dir: Optional[str] = None, session_id: Optional[str] = None):
-        
-        self.log = CustomLogger().get_logger(__name__)
-        self.log.info("DocHandler initialization started...")
-        
-
-        self.session_id = session_id or _session_id()
-        
-        self.data_dir = data_dir or  os.getenv("DATA_STORAGE_PATH", os.path.join(os.getcwd(), "data", "document_analysis"))
-
-        self.session_path = Path(self.data_dir) / self.session_id
-
-        self.session_path.mkdir(parents=True, exist_ok=True)
-
-        self.log.info("DocHandler initialized.", data_dir=str(self.data_dir), session_id=self.session_id, session_path=str(self.session_path))
-
-    def save_pdf(self, uploaded_file) -> str:
-        try:
-
-            filename = os.path.basename(uploaded_file.name)
-
-            if not filename.lower().endswith(".pdf"):
-                raise ValueError("Invalid file type. Only PDF files are supported.")
-            
-            save_path = self.session_path / filename
-
-            with open(save_path, "wb") as f:
-                if hasattr(uploaded_file, "read"):
-                    f.write(uploaded_file.read())
-                else:
-                    f.write(uploaded_file.getbuffer())
-
-            self.log.info("PDF file saved.", original_filename=filename, saved_as=str(save_path))
-            return str(save_path)
-            
-        except Exception as e:
-            self.log.error("Failed to save PDF file.", error=str(e))
-            raise DocumentPortalException("Failed to save PDF file", e) from e
-
-    def read_pdf(self, pdf_path: str) -> str:
-        
-        try:
-            text_chunks: List[str] = []
-            with fitz.open(pdf_path) as doc:
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text = page.get_text()
-                    text_chunks.append(f"\n--- Page {page_num + 1} ---\n{text}")
-                
-            full_text = "\n".join(text_chunks)
-            self.log.info("PDF file read successfully.", pdf_path=pdf_path, total_pages=len(text_chunks))
-
-            return full_text
-        
-        except Exception as e:
-            self.log.error("Failed to read PDF file.", error=str(e))
-            raise DocumentPortalException("Failed to read PDF file", e) from e
-
-
-class DocumentComparator:
-    """A class to handle document comparison operations."""
-    def __init__(self, base_dir: str = "data/document_compare", session_id: Optional[str] = None):
-        self.log = CustomLogger().get_logger(__name__)
-
-        self.base_dir = Path(base_dir)
-        self.session_id = session_id or _session_id()
-        self.session_path = self.base_dir / self.session_id
-        self.session_path.mkdir(parents=True, exist_ok=True)
-
-        self.log.info("DocumentComparator initialized.", base_dir=str(self.base_dir), session_id=self.session_id, session_path=str(self.session_path))
-
-    def save_uploaded_files(self, reference_file, actual_file):
-        try:
-            actual_file_path = self.session_path / actual_file.name
-            reference_file_path = self.session_path / reference_file.name
-
-            for file_obj, save_path in [(reference_file, reference_file_path), (actual_file, actual_file_path)]:
-
-                if not file_obj.name.lower().endswith(".pdf"):
-                    raise ValueError("Invalid file type. Only PDF files are supported.")
-                
-                with open(save_path,"wb") as f:
-                    if hasattr(file_obj, "read"):
-                        f.write(file_obj.read())
-                    else:
-                        f.write(file_obj.getbuffer())
-                
-                self.log.info("Uploaded file saved for comparison.", original_filename=file_obj.name, saved_as=str(save_path))
-
-            return actual_file, reference_file
-        except Exception as e:
-            self.log.error("Failed to save uploaded files for comparison.", error=str(e))
-            raise DocumentPortalException("Failed to save uploaded files for comparison", e) from e
-
-    def read_pdf(self, pdf_path: str) -> str:
-        """Read a PDF file and return its text content."""
-        try:
-            total_pages = 0
-            with fitz.open(pdf_path) as doc:
-                if doc.is_encrypted:
-                    raise ValueError("Cannot read encrypted PDF files.")
-                
-                text_chunks: List[str] = []
-
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    text = page.get_text()
-
-                    if text.strip():
-                        text_chunks.append(f"\n--- Page {page_num + 1} ---\n{text}")
-                
-                page_count = len(text_chunks)
-                full_text = "\n".join(text_chunks)
-            self.log.info("PDF file read successfully for comparison.", pdf_path=pdf_path, total_pages=page_count)
-
-            return full_text
-        
-        except Exception as e:
-            self.log.error("Failed to read PDF file.", error=str(e))
-            raise DocumentPortalException("Failed to read PDF file", e) from e
-    def combined_documents(self) -> str:
-        """Combine texts from the reference and actual PDF files."""
-        try:
-            doc_parts = []
-            for file in self.session_path.iterdir():
-                if file.suffix.lower() == ".pdf":
-                    text = self.read_pdf(str(file))
-                    doc_parts.append(f"\n--- Document: {file.name} ---\n{text}")
-            
-            combined_text = "\n".join(doc_parts)
-            self.log.info("Documents combined for comparison.", session_id=self.session_id, total_documents=len(doc_parts))
-
-            return combined_text
-        except Exception as e:
-            self.log.error("Failed to combine documents.", error=str(e))
-            raise DocumentPortalException("Failed to combine documents", e) from e
-
-    def clean_old_sessions(self, keep_latest: int = 5):
-        try:
-            sessions = sorted([f for f in self.base_dir.iterdir() if f.is_dir()], reverse=True)
-
-            for old_session in sessions[keep_latest:]:
-                shutil.rmtree(old_session, ignore_errors=True)
-                self.log.info("Old session directory removed.", session_path=str(old_session))
-            
-            self.log.info("Old sessions cleanup completed.", total_removed=len(sessions) - keep_latest)
-            
-        except Exception as e:
-            self.log.error("Failed to clean old sessions.", error=str(e))
-            raise DocumentPortalException("Failed to clean old sessions", e) from e
-        
-
-
-class ChatIngestor:
-    def __init__(self, temp_base: str = "data", faiss_base: str = "faiss_index", session_id: Optional[str] = None, use_session_dir: bool = True):
-        try:
-            self.log = CustomLogger().get_logger(__name__)
-            self.model_loader = ModelLoader()
-
-            self.temp_base = Path(temp_base)
-            self.faiss_base = Path(faiss_base)
-            self.session_id = session_id or _session_id()
-            self.use_session_dir = use_session_dir
-
-            self.temp_base.mkdir(parents=True, exist_ok=True)
-            self.faiss_base.mkdir(parents=True, exist_ok=True)
-
-            self.temp_dir = self._resolve_dir(self.temp_base)
-            self.faiss_dir = self._resolve_dir(self.faiss_base)
-
-            self.log.info(
-                "ChatIngestor initialized.",
-                session_id=self.session_id, 
-                use_session_dir=self.use_session_dir, 
-                temp_dir=str(self.temp_dir), 
-                faiss_dir=str(self.faiss_dir)
-                )
-
-        except Exception as e:
-            self.log.error("Failed to initialize ChatIngestor.", error=str(e))
-            raise DocumentPortalException("Initialization error in ChatIngestor", e) from e
-
-    def _resolve_dir(self, base_dir: Path) -> Path:
-        if self.use_session_dir:
-            session_dir = base_dir / self.session_id
-            session_dir.mkdir(parents=True, exist_ok=True)
-            return session_dir
-        
-        return base_dir
-
-    def _split(self, docs: List[Document], chunk_size: int = 1000, chunk_overlap: int = 200) -> List[Document]:
-        try:
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-            )
-
-            chunks = splitter.split_documents(docs)
-
-            self.log.info("Documents split into chunks.", original_count=len(docs), chunk_count=len(chunks))
-
-            return chunks
-        except Exception as e:
-            self.log.error("Failed to split documents into chunks.", error=str(e))
-            raise DocumentPortalException("Failed to split documents", e) from e
-
-    def built_retriever(self, uploaded_files: Iterable,
-        *,
-        chunk_size: int = 1000,
-        chunk_overlap: int = 200,
-        k: int = 5,):
-        
-        try:
-            paths = save_uploaded_file(uploaded_files=uploaded_files, target_dir=self.temp_dir)
-
-            docs = load_documents(paths=paths)
-
-            if not docs:
-                raise ValueError("No valid documents loaded for ingestion.")
-            
-            chunks = self._split(docs=docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-
-            faiss_manager = FaissManager(index_dir=self.faiss_dir, model_loader=self.model_loader)
-
-            texts = [doc.page_content for doc in chunks]
-            metadatas = [doc.metadata or {} for doc in chunks]
-
-            try:
-                vector_store = faiss_manager.load_or_create_index(texts=texts, metadatas=metadatas)
-            except Exception as e:
-                self.log.error("Failed to load or create FAISS index.", error=str(e))
-                vector_store = faiss_manager.load_or_create_index(texts=texts, metadatas=metadatas)
-
-            added = faiss_manager.add_documents(chunks)
-            self.log.info("Retriever built successfully.", total_chunks=len(chunks), new_chunks_added=added, session_id=self.session_id)
-
-            return vector_store.as_retriever(
-                search_type="similarity",
-                search_kwargs={"k": k}
-            )
-
-        except Exception as e:
-            self.log.error("Failed to ingest files.", error=str(e))
-            raise DocumentPortalException("Failed to ingest files", e) from e
+from __future__ import annotations
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from pathlib import Path
+import os
+import uuid
+import sys
+import json
+import hashlib
+import fitz  # PyMuPDF
+import numpy as np
+import shutil
+from datetime import datetime, timezone
+from langchain_core.documents import Document
+from utils.model_loader import ModelLoader
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+from model.models import SavedUpload
+from utils.file_io import _session_id, save_uploads, stream_upload, UploadBudget, UploadTooLargeError
+from utils.cache import invalidate_index
+from utils.embedding_pipeline import EmbeddingPipeline
+from utils.embedding_cache import get_embedding_cache
+from utils.index_store import ChunkStore, convert_legacy_store, index_write_lock, store_path, load_vector_store, write_index_atomic
+from utils.faiss_index import build_index, index_settings, index_type_of, index_vectors, ready_to_build
+from utils.pdf_extractor import extract_pages_cached, is_encrypted
+from utils.upload_store import get_upload_store
+from utils.bm25 import BM25Index, bm25_path
+from utils.retrievers import build_retriever, load_bm25, retrieval_settings
+from utils.document_ops import iter_documents, pdf_loader_name, concat_for_analysis, concat_for_comparison
+from langchain_community.vectorstores import FAISS  # type: ignore
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+
+class FaissManager:
+    """A class to manage FAISS vector store operations including creation, loading, and saving.
+    Automatically logs all actions and handles exceptions.
+
+    The index type comes from config.yaml `faiss_db.index_type` (flat, hnsw, ivf_flat,
+    ivf_pq). Types that need training start out flat and are converted once
+    ``train_min_vectors`` vectors exist; rebuild_index retrains offline.
+
+    Writes hold a per-directory lock (index_write_lock) from load to persist and reload the
+    index first if another writer changed it, so concurrent ingests append in turn.
+    """
+    def __init__(self, index_dir: Path, model_loader: Optional[ModelLoader] = None, embed_batch_size: Optional[int] = None,
+                 index_type: Optional[str] = None):
+        self.log = CustomLogger().get_logger(__name__)
+
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        self.index_path = self.index_dir / "index.faiss"
+        self.store_path = store_path(self.index_dir)
+        # Stores written before the columnar chunk store existed; migrated on first load
+        self.legacy_pkl_path = self.index_dir / "index.pkl"
+        self._chunk_store: Optional[ChunkStore] = None
+
+        self.model_loader = model_loader or ModelLoader()
+        self.embedding_model = self.model_loader.load_embeddings()
+        self.embedding_pipeline = EmbeddingPipeline(self.embedding_model, batch_size=embed_batch_size)
+        self.embedding_cache = get_embedding_cache(getattr(self.model_loader, "embedding_model_id", type(self.embedding_model).__name__))
+        self.index_settings = index_settings(index_type=index_type)
+        self.vector_store: Optional[FAISS] = None
+        # index.faiss as of our last load or write; anything else means another writer ran
+        self._loaded_state: Optional[Tuple[int, int, int]] = None
+        self.last_ingest_stats: Dict[str, int] = {"added": 0, "skipped": 0}
+
+        self.log.info("FaissManager initialized.", index_dir=str(self.index_dir))
+
+    def _exist(self):
+        """Check if FAISS index files exist in the index directory."""
+        return self.index_path.exists() and (
+            ChunkStore.exists(self.store_path) or self.legacy_pkl_path.exists()
+        )
+
+    def _disk_state(self) -> Optional[Tuple[int, int, int]]:
+        if not self.index_path.exists():
+            return None
+        st = self.index_path.stat()
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    @property
+    def chunk_store(self) -> ChunkStore:
+        if self._chunk_store is None:
+            self._chunk_store = ChunkStore(self.store_path)
+        return self._chunk_store
+
+    FINGERPRINT_VERSION = "sha256-content-v1"
+
+    @staticmethod
+    def _fingerprint(text: str, md: Dict[str, Any]) -> str:
+        """Generate a per-chunk fingerprint.
+
+        Tabular rows keep their explicit ``source::row_id`` identity; every other chunk is
+        keyed by a sha256 of its whitespace-normalized content, so re-uploads of the same
+        text dedup regardless of file name.
+        """
+        row_id = md.get("row_id")
+
+        if row_id is not None:
+            source = md.get("source") or md.get("file_path") or "unknown_source"
+            return f"{source}::{row_id}"
+
+        normalized = " ".join(text.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _embed(self, texts: List[str]):
+        """Embed texts, serving known content from the shared embedding cache and only sending misses to the model."""
+        if self.embedding_cache is None:
+            return self.embedding_pipeline.embed(texts)
+
+        cached = self.embedding_cache.get_many(texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+
+        if missing:
+            fresh = self.embedding_pipeline.embed([texts[i] for i in missing])
+            self.embedding_cache.put_many([texts[i] for i in missing], fresh)
+            for i, vector in zip(missing, fresh):
+                cached[i] = vector
+
+        self.log.info("Embeddings resolved.", total=len(texts), cache_hits=len(texts) - len(missing), embedded=len(missing))
+        return np.vstack(cached) if cached else np.zeros((0, 0), dtype=np.float32)
+
+    def _persist(self, start_row: int, keys: List[str], docs: List[Document]):
+        """Append the new chunk rows, then atomically replace index.faiss.
+
+        The chunk store commits first; rows past the index's ntotal after a crash are
+        ignored by readers and dropped on the next load.
+        """
+        mapping = self.vector_store.index_to_docstore_id
+        self.chunk_store.append([
+            (start_row + i, mapping[start_row + i], key, doc.page_content, doc.metadata or {})
+            for i, (key, doc) in enumerate(zip(keys, docs))
+        ])
+        write_index_atomic(self.vector_store.index, self.index_path)
+        self._loaded_state = self._disk_state()
+        self._update_bm25(start_row, docs)
+
+    def _update_bm25(self, start_row: int, docs: List[Document]):
+        """Write the new rows' postings as one BM25 segment next to index.faiss.
+
+        Existing segments are left alone; rows an interrupted ingest left without postings
+        are caught up from the chunk store first.
+        """
+        path = bm25_path(self.index_dir)
+        BM25Index.truncate(path, start_row)
+        covered = BM25Index.covered_rows(path)
+        if covered < start_row:
+            BM25Index.write_segment(path, covered, [self.chunk_store.get_row(row).page_content for row in range(covered, start_row)])
+        BM25Index.write_segment(path, start_row, [doc.page_content for doc in docs])
+        if len(BM25Index.segments(path)) > BM25Index.MAX_SEGMENTS:
+            BM25Index.compact(path)
+
+    def _refresh_fingerprints(self):
+        """Re-key stored chunks written under an older fingerprint scheme."""
+        if self.chunk_store.get_meta("fingerprint") == self.FINGERPRINT_VERSION:
+            return
+
+        updates = [
+            (self._fingerprint(text, md), row)
+            for row, _, text, md in self.chunk_store.iter_rows()
+        ]
+        self.chunk_store.update_fingerprints(updates)
+        self.chunk_store.set_meta("fingerprint", self.FINGERPRINT_VERSION)
+        self.log.info("Fingerprints rebuilt from chunk store.", index_dir=str(self.index_dir), rows=len(updates))
+
+    def add_documents(self, docs: List[Document]):
+        """Embed and add only chunks whose fingerprint is not yet in the index.
+
+        Creates the index on first use, so every chunk is embedded at most once. Returns the
+        number of chunks added; added/skipped counts are kept in ``last_ingest_stats``.
+        """
+        new_keys: Dict[str, Document] = {}
+        skipped = 0
+
+        for doc in docs:
+
+            key = self._fingerprint(doc.page_content, doc.metadata or {})
+
+            if key in new_keys:
+                skipped += 1
+                continue
+
+            new_keys[key] = doc
+
+        with index_write_lock(self.index_dir):
+            # another process may have added rows since this manager loaded the index
+            if self._exist() and (self.vector_store is None or self._loaded_state != self._disk_state()):
+                self.load_or_create_index()
+
+            existing = self.chunk_store.existing_fingerprints(list(new_keys)) if self.vector_store is not None else set()
+            skipped += len(existing)
+            new_keys = {key: doc for key, doc in new_keys.items() if key not in existing}
+            new_docs = list(new_keys.values())
+
+            if new_docs:
+                texts = [doc.page_content for doc in new_docs]
+                metadatas = [doc.metadata or {} for doc in new_docs]
+                vectors = self._embed(texts)
+                start_row = self.vector_store.index.ntotal if self.vector_store is not None else 0
+
+                if self.vector_store is None:
+                    self.vector_store = FAISS.from_embeddings(
+                        text_embeddings=list(zip(texts, vectors)),
+                        embedding=self.embedding_model,
+                        metadatas=metadatas)
+                    self.log.info("New FAISS index created.", index_dir=str(self.index_dir))
+                else:
+                    self.vector_store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+
+                self._apply_index_type()
+
+                if start_row == 0:
+                    self.chunk_store.truncate(0)
+                    self.chunk_store.set_meta("fingerprint", self.FINGERPRINT_VERSION)
+
+                self._persist(start_row, list(new_keys), new_docs)
+                invalidate_index(self.index_dir)
+                self.log.info("New documents added to FAISS index.", count=len(new_docs))
+
+        self.last_ingest_stats = {"added": len(new_docs), "skipped": skipped}
+        self.log.info("Incremental ingest finished.", index_dir=str(self.index_dir), **self.last_ingest_stats)
+
+        return len(new_docs)
+
+
+    def _apply_index_type(self):
+        """Convert the in-memory index to the configured type once it can be built.
+
+        Row order is preserved, so chunk store rows stay aligned. Only lossless indexes are
+        converted here; an IVF-PQ index keeps no exact vectors and needs rebuild_index.
+        """
+        target = self.index_settings["index_type"]
+        index = self.vector_store.index
+        current = index_type_of(index)
+        if current == target or not ready_to_build(target, index.ntotal, self.index_settings):
+            return
+
+        vectors = index_vectors(index)
+        if vectors is None:
+            self.log.warning("FAISS index type differs from config; run the rebuild command.", current=current, configured=target)
+            return
+
+        self.vector_store.index = build_index(vectors, target, self.index_settings)
+        self.log.info("FAISS index converted.", index_dir=str(self.index_dir), from_type=current, to_type=target, ntotal=index.ntotal)
+
+    def rebuild_index(self) -> Dict[str, Any]:
+        """Rebuild index.faiss as the configured type, retraining IVF quantizers on all vectors.
+
+        Vectors are read back from the index when it stores them exactly; otherwise (IVF-PQ)
+        chunk texts are re-embedded through the embedding cache.
+        """
+        with index_write_lock(self.index_dir):
+            return self._rebuild_index()
+
+    def _rebuild_index(self) -> Dict[str, Any]:
+        if not self._exist():
+            raise DocumentPortalException(f"No FAISS index to rebuild in {self.index_dir}", sys)
+        self.load_or_create_index()
+
+        index = self.vector_store.index
+        previous = index_type_of(index)
+        vectors = index_vectors(index)
+        if vectors is None:
+            texts = [text for _, _, text, _ in self.chunk_store.iter_rows(limit=index.ntotal)]
+            vectors = self._embed(texts)
+
+        target = self.index_settings["index_type"]
+        if not ready_to_build(target, len(vectors), self.index_settings):
+            self.log.warning("Too few vectors to train; rebuilding as flat.", configured=target, ntotal=len(vectors))
+            target = "flat"
+
+        self.vector_store.index = build_index(vectors, target, self.index_settings)
+        write_index_atomic(self.vector_store.index, self.index_path)
+        self._loaded_state = self._disk_state()
+        invalidate_index(self.index_dir)
+
+        stats = {"index_dir": str(self.index_dir), "from_type": previous, "to_type": target, "ntotal": int(len(vectors))}
+        self.log.info("FAISS index rebuilt.", **stats)
+        return stats
+
+    def load_or_create_index(self, texts: Optional[List[str]] =None, metadatas: Optional[List[Dict]] = None):
+        """Load the index from disk, or build it once from texts (deduplicated by fingerprint)."""
+        if self._exist():
+            if convert_legacy_store(self.index_dir):
+                invalidate_index(self.index_dir)
+
+            # reopen the chunk store too; its committed row count may have moved on disk
+            if self._chunk_store is not None:
+                self._chunk_store.close()
+                self._chunk_store = None
+
+            self._loaded_state = self._disk_state()
+            # new vectors are added to this index, so it is read into memory rather than mapped
+            self.vector_store = load_vector_store(self.index_dir, self.embedding_model, mmap=False)
+            self.log.info("FAISS index loaded from disk.", index_dir=str(self.index_dir))
+
+            dropped = self.chunk_store.truncate(self.vector_store.index.ntotal)
+            if dropped:
+                self.log.warning("Dropped chunk rows from an interrupted ingest.", index_dir=str(self.index_dir), rows=dropped)
+            self._refresh_fingerprints()
+
+            return self.vector_store
+        
+        if not texts:
+            raise DocumentPortalException("No texts or metadatas provided for creating new FAISS index", sys)
+
+        metadatas = metadatas or [{} for _ in texts]
+        self.add_documents([Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas)])
+
+        self.log.info("New FAISS index created and saved to disk.", index_dir=str(self.index_dir))
+
+        return self.vector_store
+    
+
+class DocHandler:
+    """A class to handle document operations such as saving and reading PDF files."""
+    def __init__(self, data_dir: Optional[str] = None, session_id: Optional[str] = None):
+        
+        self.log = CustomLogger().get_logger(__name__)
+        self.log.info("DocHandler initialization started...")
+        
+
+        self.session_id = session_id or _session_id()
+        
+        self.data_dir = data_dir or  os.getenv("DATA_STORAGE_PATH", os.path.join(os.getcwd(), "data", "document_analysis"))
+
+        self.session_path = Path(self.data_dir) / self.session_id
+
+        self.session_path.mkdir(parents=True, exist_ok=True)
+        self.page_count = 0
+        self.saved_upload: Optional[SavedUpload] = None
+
+        self.log.info("DocHandler initialized.", data_dir=str(self.data_dir), session_id=self.session_id, session_path=str(self.session_path))
+
+    def save_pdf(self, uploaded_file) -> str:
+        try:
+
+            filename = os.path.basename(uploaded_file.name)
+
+            if not filename.lower().endswith(".pdf"):
+                raise ValueError("Invalid file type. Only PDF files are supported.")
+            
+            save_path = self.session_path / filename
+
+            self.saved_upload = stream_upload(uploaded_file, save_path)
+
+            self.log.info("PDF file saved.", original_filename=filename, saved_as=str(save_path), size_bytes=self.saved_upload.size_bytes)
+            return str(save_path)
+            
+        except UploadTooLargeError:
+            raise
+        except Exception as e:
+            self.log.error("Failed to save PDF file.", error=str(e))
+            raise DocumentPortalException("Failed to save PDF file", e) from e
+
+    def _upload_sha256(self, pdf_path: str) -> Optional[str]:
+        """Content hash recorded by save_pdf, if pdf_path is the file it saved."""
+        if self.saved_upload is not None and Path(self.saved_upload.path) == Path(pdf_path):
+            return self.saved_upload.sha256
+        return None
+
+    def read_pdf(self, pdf_path: str) -> str:
+        
+        try:
+            text_chunks: List[str] = [
+                f"\n--- Page {page_num + 1} ---\n{text}"
+                for page_num, text in enumerate(extract_pages_cached(pdf_path, self._upload_sha256(pdf_path)))
+            ]
+
+            full_text = "\n".join(text_chunks)
+            self.page_count = len(text_chunks)
+            self.log.info("PDF file read successfully.", pdf_path=pdf_path, total_pages=len(text_chunks))
+
+            return full_text
+        
+        except Exception as e:
+            self.log.error("Failed to read PDF file.", error=str(e))
+            raise DocumentPortalException("Failed to read PDF file", e) from e
+
+
+class DocumentComparator:
+    """A class to handle document comparison operations."""
+    def __init__(self, base_dir: str = "data/document_compare", session_id: Optional[str] = None):
+        self.log = CustomLogger().get_logger(__name__)
+
+        self.base_dir = Path(base_dir)
+        self.session_id = session_id or _session_id()
+        self.session_path = self.base_dir / self.session_id
+        self.session_path.mkdir(parents=True, exist_ok=True)
+        self.pages_read = 0
+        self.reference_path: Optional[Path] = None
+        self.actual_path: Optional[Path] = None
+        self.reference_upload: Optional[SavedUpload] = None
+        self.actual_upload: Optional[SavedUpload] = None
+
+        self.log.info("DocumentComparator initialized.", base_dir=str(self.base_dir), session_id=self.session_id, session_path=str(self.session_path))
+
+    def save_uploaded_files(self, reference_file, actual_file):
+        try:
+            actual_file_path = self.session_path / actual_file.name
+            reference_file_path = self.session_path / reference_file.name
+
+            # both files count against one per-request size budget
+            budget = UploadBudget()
+            saved = []
+            for file_obj, save_path in [(reference_file, reference_file_path), (actual_file, actual_file_path)]:
+
+                if not file_obj.name.lower().endswith(".pdf"):
+                    raise ValueError("Invalid file type. Only PDF files are supported.")
+                
+                saved.append(stream_upload(file_obj, save_path, budget))
+                
+                self.log.info("Uploaded file saved for comparison.", original_filename=file_obj.name, saved_as=str(save_path))
+
+            self.reference_path, self.actual_path = reference_file_path, actual_file_path
+            self.reference_upload, self.actual_upload = saved
+            return actual_file, reference_file
+        except UploadTooLargeError:
+            raise
+        except Exception as e:
+            self.log.error("Failed to save uploaded files for comparison.", error=str(e))
+            raise DocumentPortalException("Failed to save uploaded files for comparison", e) from e
+
+    def _upload_sha256(self, pdf_path: str) -> Optional[str]:
+        """Content hash recorded by save_uploaded_files, if pdf_path is one of the saved files."""
+        for upload in (self.reference_upload, self.actual_upload):
+            if upload is not None and Path(upload.path) == Path(pdf_path):
+                return upload.sha256
+        return None
+
+    @property
+    def upload_sha256s(self) -> Optional[Tuple[str, str]]:
+        """(reference, actual) content hashes of the saved files, used as a result cache key."""
+        if self.reference_upload is None or self.actual_upload is None:
+            return None
+        return self.reference_upload.sha256, self.actual_upload.sha256
+
+    def read_pdf(self, pdf_path: str) -> str:
+        """Read a PDF file and return its text content."""
+        try:
+            if is_encrypted(pdf_path):
+                raise ValueError("Cannot read encrypted PDF files.")
+            text_chunks: List[str] = [
+                f"\n--- Page {page_num + 1} ---\n{text}"
+                for page_num, text in enumerate(extract_pages_cached(pdf_path, self._upload_sha256(pdf_path)))
+                if text.strip()
+            ]
+
+            page_count = len(text_chunks)
+            full_text = "\n".join(text_chunks)
+            self.pages_read += page_count
+            self.log.info("PDF file read successfully for comparison.", pdf_path=pdf_path, total_pages=page_count)
+
+            return full_text
+        
+        except Exception as e:
+            self.log.error("Failed to read PDF file.", error=str(e))
+            raise DocumentPortalException("Failed to read PDF file", e) from e
+
+    def read_pages(self, pdf_path: str) -> List[str]:
+        """Read a PDF file and return one text entry per page (empty pages included, order kept)."""
+        try:
+            if is_encrypted(pdf_path):
+                raise ValueError("Cannot read encrypted PDF files.")
+            pages = extract_pages_cached(pdf_path, self._upload_sha256(pdf_path))
+
+            self.pages_read += len(pages)
+            self.log.info("PDF pages read for comparison.", pdf_path=pdf_path, total_pages=len(pages))
+            return pages
+
+        except Exception as e:
+            self.log.error("Failed to read PDF file.", error=str(e))
+            raise DocumentPortalException("Failed to read PDF file", e) from e
+
+    def read_page_pairs(self):
+        """Return (reference_pages, actual_pages) for the files saved by save_uploaded_files."""
+        if self.reference_path is None or self.actual_path is None:
+            raise DocumentPortalException("save_uploaded_files() must be called before read_page_pairs()", None)
+        return self.read_pages(str(self.reference_path)), self.read_pages(str(self.actual_path))
+
+    def combined_documents(self) -> str:
+        """Combine texts from the reference and actual PDF files."""
+        try:
+            doc_parts = []
+            for file in self.session_path.iterdir():
+                if file.suffix.lower() == ".pdf":
+                    text = self.read_pdf(str(file))
+                    doc_parts.append(f"\n--- Document: {file.name} ---\n{text}")
+            
+            combined_text = "\n".join(doc_parts)
+            self.log.info("Documents combined for comparison.", session_id=self.session_id, total_documents=len(doc_parts))
+
+            return combined_text
+        except Exception as e:
+            self.log.error("Failed to combine documents.", error=str(e))
+            raise DocumentPortalException("Failed to combine documents", e) from e
+
+    def clean_old_sessions(self, keep_latest: int = 5):
+        try:
+            sessions = sorted([f for f in self.base_dir.iterdir() if f.is_dir()], reverse=True)
+
+            for old_session in sessions[keep_latest:]:
+                shutil.rmtree(old_session, ignore_errors=True)
+                self.log.info("Old session directory removed.", session_path=str(old_session))
+            
+            self.log.info("Old sessions cleanup completed.", total_removed=len(sessions) - keep_latest)
+            
+        except Exception as e:
+            self.log.error("Failed to clean old sessions.", error=str(e))
+            raise DocumentPortalException("Failed to clean old sessions", e) from e
+        
+
+
+class ChatIngestor:
+    def __init__(self, temp_base: str = "data", faiss_base: str = "faiss_index", session_id: Optional[str] = None, use_session_dir: bool = True):
+        try:
+            self.log = CustomLogger().get_logger(__name__)
+            self.model_loader = ModelLoader()
+
+            self.temp_base = Path(temp_base)
+            self.faiss_base = Path(faiss_base)
+            self.session_id = session_id or _session_id()
+            self.use_session_dir = use_session_dir
+
+            self.temp_base.mkdir(parents=True, exist_ok=True)
+            self.faiss_base.mkdir(parents=True, exist_ok=True)
+
+            self.temp_dir = self._resolve_dir(self.temp_base)
+            self.faiss_dir = self._resolve_dir(self.faiss_base)
+            self.last_ingest_stats: Dict[str, Any] = {}
+
+            self.log.info(
+                "ChatIngestor initialized.",
+                session_id=self.session_id, 
+                use_session_dir=self.use_session_dir, 
+                temp_dir=str(self.temp_dir), 
+                faiss_dir=str(self.faiss_dir)
+                )
+
+        except Exception as e:
+            self.log.error("Failed to initialize ChatIngestor.", error=str(e))
+            raise DocumentPortalException("Initialization error in ChatIngestor", e) from e
+
+    def _resolve_dir(self, base_dir: Path) -> Path:
+        if self.use_session_dir:
+            session_dir = base_dir / self.session_id
+            session_dir.mkdir(parents=True, exist_ok=True)
+            return session_dir
+        
+        return base_dir
+
+    def _split(self, docs: Iterable[Document], chunk_size: int = 1000, chunk_overlap: int = 200) -> List[Document]:
+        try:
+            splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            )
+
+            # Split page by page so a lazy loader never has to materialize the whole file
+            chunks: List[Document] = []
+            original_count = 0
+            for doc in docs:
+                original_count += 1
+                chunks.extend(splitter.split_documents([doc]))
+
+            self.log.info("Documents split into chunks.", original_count=original_count, chunk_count=len(chunks))
+
+            return chunks
+        except Exception as e:
+            self.log.error("Failed to split documents into chunks.", error=str(e))
+            raise DocumentPortalException("Failed to split documents", e) from e
+
+    def _load_chunks(self, uploaded_files: Iterable, chunk_size: int, chunk_overlap: int):
+        """Save uploads into the content-addressed store and return their chunks.
+
+        Files whose sha256 was already parsed with the same loader and split settings are
+        served from the chunk cache instead of being parsed and split again.
+        """
+        store = get_upload_store()
+        split_key = f"{pdf_loader_name()}-{chunk_size}-{chunk_overlap}"
+
+        chunks: List[Document] = []
+        reused: List[str] = []
+        parsed: List[str] = []
+        for upload in save_uploads(uploaded_files, target_dir=self.temp_dir):
+            upload = store.adopt(upload)
+
+            cached = store.load_chunks(upload.sha256, split_key)
+            if cached is not None:
+                chunks.extend(cached)
+                reused.append(upload.original_name)
+                continue
+
+            file_chunks = self._split(docs=iter_documents([Path(upload.path)]), chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            store.save_chunks(upload.sha256, split_key, file_chunks)
+            chunks.extend(file_chunks)
+            parsed.append(upload.original_name)
+
+        self.log.info("Uploads resolved.", reused_files=reused, parsed_files=parsed, session_id=self.session_id)
+        return chunks, reused, parsed
+
+    def built_retriever(self, uploaded_files: Iterable,
+        *,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        k: int = 5,
+        embed_batch_size: Optional[int] = None,
+        search_type: Optional[str] = None,):
+        
+        try:
+            chunks, reused, parsed = self._load_chunks(uploaded_files, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+            if not chunks:
+                raise ValueError("No valid documents loaded for ingestion.")
+
+            faiss_manager = FaissManager(index_dir=self.faiss_dir, model_loader=self.model_loader, embed_batch_size=embed_batch_size)
+
+            # Loads an existing index (if any), then embeds only chunks it has not seen before
+            added = faiss_manager.add_documents(chunks)
+            vector_store = faiss_manager.vector_store
+            if vector_store is None:
+                raise ValueError("No content to index.")
+
+            self.last_ingest_stats = {
+                **faiss_manager.last_ingest_stats,
+                "total_chunks": len(chunks),
+                "reused_files": reused,
+                "parsed_files": parsed,
+            }
+            self.log.info(
+                "Retriever built successfully.",
+                total_chunks=len(chunks),
+                reused_files=len(reused),
+                new_chunks_added=added,
+                skipped_chunks=faiss_manager.last_ingest_stats["skipped"],
+                session_id=self.session_id,
+                embedding_stats=faiss_manager.embedding_pipeline.last_stats,
+            )
+
+            # retrieval mode from config.yaml `retrieval` unless overridden
+            search_type = retrieval_settings(search_type=search_type)["search_type"]
+            bm25 = load_bm25(self.faiss_dir, vector_store) if search_type == "hybrid" else None
+            return build_retriever(vector_store, k=k, search_type=search_type, bm25=bm25)
+
+        except UploadTooLargeError:
+            raise
+        except Exception as e:
+            self.log.error("Failed to ingest files.", error=str(e))
+            raise DocumentPortalException("Failed to ingest files", e) from e
@@ -0,0 +1,38 @@
+"""
+Offline FAISS index rebuild: convert an index directory to the configured (or given) index
+type and retrain IVF quantizers on every stored vector.
+
+Usage:
+    python -m src.document_ingestion.rebuild_index faiss_index/<session_id>
+    python -m src.document_ingestion.rebuild_index faiss_index --index-type ivf_pq --nlist 1024
+
+Run it while no ingest is writing to the directory; readers pick up the new index.faiss on
+their next load.
+"""
+import argparse
+import json
+from pathlib import Path
+
+from src.document_ingestion.data_ingestion import FaissManager
+from utils.faiss_index import INDEX_FACTORIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("index_dirs", nargs="+", help="directories holding index.faiss")
+    parser.add_argument("--index-type", choices=sorted(INDEX_FACTORIES), help="default: config.yaml faiss_db.index_type")
+    parser.add_argument("--nlist", type=int, help="ivf_*: number of cells (default: config / 4*sqrt(n))")
+    parser.add_argument("--train-min-vectors", type=int, help="ivf_*: fall back to flat below this many vectors")
+    args = parser.parse_args()
+
+    for index_dir in args.index_dirs:
+        manager = FaissManager(Path(index_dir), index_type=args.index_type)
+        if args.nlist:
+            manager.index_settings["nlist"] = args.nlist
+        if args.train_min_vectors is not None:
+            manager.index_settings["train_min_vectors"] = args.train_min_vectors
+        print(json.dumps(manager.rebuild_index()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import hashlib
+from typing import List
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic, offline embeddings: words hashed into a small bag-of-words vector."""
+
+    dim = 64
+
+    def _embed(self, text: str) -> List[float]:
+        v = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            v[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        norm = np.linalg.norm(v)
+        return (v / norm if norm else v).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class FakeModelLoader:
+    embedding_model_id = "test-hashing"
+
+    def load_embeddings(self):
+        return HashingEmbeddings()
+
+
+@pytest.fixture
+def make_faiss_manager(tmp_path, monkeypatch):
+    """Build FaissManagers over tmp_path/index with fake embeddings and no shared caches."""
+    from src.document_ingestion.data_ingestion import FaissManager
+
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", str(tmp_path / "embedding_cache"))
+
+    def make(**kwargs):
+        manager = FaissManager(tmp_path / "index", model_loader=FakeModelLoader(), **kwargs)
+        manager.embedding_cache = None
+        return manager
+
+    return make
@@ -0,0 +1,120 @@
+import pytest
+
+from utils.bm25 import BM25Index, tokenize
+
+
+CORPUS = [
+    "the tenant pays rent monthly",
+    "termination requires ninety days written notice",
+    "rent increases are capped at three percent",
+    "the landlord maintains the roof",
+]
+
+
+def test_tokenize_lowercases_and_drops_single_characters():
+    assert tokenize("A Notice, of 90-day TERM!") == ["notice", "of", "90", "day", "term"]
+
+
+def test_search_ranks_matching_rows_first():
+    index = BM25Index.build(CORPUS)
+
+    hits = index.search("rent increases capped", k=2)
+
+    assert [row for row, _ in hits] == [2, 0]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_rows_without_matching_terms_are_not_returned():
+    index = BM25Index.build(CORPUS)
+
+    assert [row for row, _ in index.search("written notice", k=4)] == [1]
+    assert index.search("unrelated words", k=4) == []
+
+
+def test_limit_hides_rows_past_the_vector_index():
+    index = BM25Index.build(CORPUS)
+
+    assert index.search("roof", k=3, limit=3) == []
+    assert [row for row, _ in index.search("roof", k=3)] == [3]
+
+
+def test_rows_must_be_appended_contiguously():
+    index = BM25Index.build(CORPUS[:2])
+    index.add(2, CORPUS[2:])
+    assert index.n_docs == 4
+
+    with pytest.raises(ValueError):
+        index.add(10, ["out of order"])
+
+
+def test_segments_are_merged_on_load(tmp_path):
+    path = tmp_path / "index.bm25"
+    BM25Index.write_segment(path, 0, CORPUS[:2])
+    BM25Index.write_segment(path, 2, CORPUS[2:])
+
+    loaded = BM25Index.load(path)
+
+    assert BM25Index.covered_rows(path) == 4
+    assert loaded.search("tenant rent", k=2) == BM25Index.build(CORPUS).search("tenant rent", k=2)
+
+
+def test_appending_a_segment_leaves_earlier_segments_untouched(tmp_path):
+    path = tmp_path / "index.bm25"
+    BM25Index.write_segment(path, 0, CORPUS[:2])
+    first = BM25Index.segments(path)[0][2]
+    mtime = first.stat().st_mtime_ns
+
+    BM25Index.write_segment(path, 2, CORPUS[2:])
+
+    assert first.stat().st_mtime_ns == mtime
+    assert len(BM25Index.segments(path)) == 2
+
+
+def test_segments_past_a_gap_or_truncation_are_ignored(tmp_path):
+    path = tmp_path / "index.bm25"
+    BM25Index.write_segment(path, 0, CORPUS[:2])
+    BM25Index.write_segment(path, 3, CORPUS[3:])
+    assert BM25Index.covered_rows(path) == 2
+
+    BM25Index.truncate(path, 0)
+    assert BM25Index.load(path).n_docs == 0
+
+
+def test_compact_merges_segments_into_one(tmp_path):
+    path = tmp_path / "index.bm25"
+    for row, text in enumerate(CORPUS):
+        BM25Index.write_segment(path, row, [text])
+
+    BM25Index.compact(path)
+
+    assert [(start, end) for start, end, _ in BM25Index.segments(path)] == [(0, 4)]
+    assert BM25Index.load(path).search("roof", k=1) == BM25Index.build(CORPUS).search("roof", k=1)
+
+
+def test_each_ingest_writes_only_its_own_segment(make_faiss_manager):
+    from langchain_core.documents import Document
+    from utils.bm25 import bm25_path
+
+    manager = make_faiss_manager()
+    manager.add_documents([Document(page_content=text, metadata={"source": "a.pdf"}) for text in CORPUS[:2]])
+    manager.add_documents([Document(page_content=text, metadata={"source": "a.pdf"}) for text in CORPUS[2:]])
+
+    path = bm25_path(manager.index_dir)
+    assert [(start, end) for start, end, _ in BM25Index.segments(path)] == [(0, 2), (2, 4)]
+    assert [row for row, _ in BM25Index.load(path).search("roof", k=1)] == [3]
+
+
+def test_hybrid_fuses_both_rankings_on_the_docstore_id():
+    from langchain_community.vectorstores import FAISS
+    from tests.conftest import HashingEmbeddings
+    from utils.retrievers import HybridRetriever
+
+    vectorstore = FAISS.from_texts(CORPUS, HashingEmbeddings())
+    for doc_id in vectorstore.index_to_docstore_id.values():
+        vectorstore.docstore.search(doc_id).id = None  # e.g. docs pickled before Document.id existed
+    retriever = HybridRetriever(vectorstore=vectorstore, bm25=BM25Index.build(CORPUS), k=4, fetch_k=4)
+
+    docs = retriever.invoke("landlord maintains the roof")
+
+    assert len(docs) == len({doc.page_content for doc in docs}) == 4
+    assert docs[0].page_content == CORPUS[3]
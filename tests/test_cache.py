@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from utils.cache import LRUTTLCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUTTLCache("test", max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_idle_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUTTLCache("test", ttl_seconds=10)
+    cache.put("a", 1)
+
+    now[0] += 5
+    assert cache.get("a") == 1  # an access renews the idle timer
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_version_mismatch_drops_the_entry():
+    cache = LRUTTLCache("test")
+    cache.put("index", "store", version=("index.faiss", 1, 10))
+
+    assert cache.get("index", version=("index.faiss", 1, 10)) == "store"
+    assert cache.get("index", version=("index.faiss", 2, 12)) is None
+    assert cache.get("index") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_concurrent_get_or_load_builds_once():
+    cache = LRUTTLCache("test")
+    calls = []
+    started = threading.Barrier(4)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+
+    def worker():
+        started.wait()
+        results.append(cache.get_or_load("key", loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+
+
+def test_failed_load_releases_its_load_lock():
+    cache = LRUTTLCache("test")
+
+    def failing():
+        raise RuntimeError("index missing")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("key", failing)
+
+    assert cache._load_locks == {}
+    assert cache.get_or_load("key", lambda: "value") == "value"
+
+
+def test_invalidate_by_predicate():
+    cache = LRUTTLCache("test")
+    cache.put(("/idx/a", "index", 5), 1)
+    cache.put(("/idx/b", "index", 5), 2)
+
+    assert cache.invalidate(lambda key: key[0] == "/idx/a") == 1
+    assert cache.get(("/idx/a", "index", 5)) is None
+    assert cache.get(("/idx/b", "index", 5)) == 2
@@ -0,0 +1,79 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from utils.chat_history import ChatHistoryStore, InMemoryChatHistoryBackend, SQLiteChatHistoryBackend
+from utils.tokens import estimate_tokens
+
+
+def _store(backend=None, max_tokens=10, summarize=False):
+    store = ChatHistoryStore(backend or InMemoryChatHistoryBackend())
+    store.max_tokens = max_tokens
+    store.summarize = summarize
+    return store
+
+
+def _fill(store, conversation_id, turns):
+    for i in range(turns):
+        # "q0" / "a0" cost one estimated token each
+        store.append_turn(conversation_id, f"q{i}", f"a{i}")
+
+
+def test_window_keeps_the_newest_messages_within_budget():
+    store = _store(max_tokens=4)
+    _fill(store, "c1", 5)
+
+    window = store.window("c1")
+
+    assert [m.content for m in window] == ["q3", "a3", "q4", "a4"]
+    assert len(store.messages("c1")) == 10
+
+
+def test_conversations_are_isolated():
+    store = _store()
+    store.append_turn("alice", "hello", "hi alice")
+
+    assert store.window("bob") == []
+    store.clear("alice")
+    assert store.messages("alice") == []
+
+
+def test_dropped_turns_are_summarized_once_within_the_budget():
+    store = _store(max_tokens=16, summarize=True)
+    _fill(store, "c1", 9)
+    calls = []
+
+    def summarizer(summary, dropped):
+        calls.append([m.content for m in dropped])
+        return "earlier"  # the summary message costs 12 estimated tokens
+
+    window = store.window("c1", summarizer)
+    assert isinstance(window[0], SystemMessage)
+    assert [m.content for m in window[1:]] == ["q7", "a7", "q8", "a8"]
+    assert sum(estimate_tokens(m.content) for m in window) <= 16
+
+    # only the newly dropped turn is summarized on the next call
+    store.append_turn("c1", "q9", "a9")
+    window = store.window("c1", summarizer)
+    assert [m.content for m in window[1:]] == ["q8", "a8", "q9", "a9"]
+    assert calls[-1] == ["q7", "a7"]
+    assert [c for call in calls for c in call] == [f"{role}{i}" for i in range(8) for role in ("q", "a")]
+
+
+def test_memory_backend_drops_least_recently_used_conversations():
+    store = _store(backend=InMemoryChatHistoryBackend(max_conversations=2))
+    for conversation_id in ("c1", "c2", "c3"):
+        store.append_turn(conversation_id, "q", "a")
+
+    assert store.messages("c1") == []
+    assert len(store.messages("c3")) == 2
+
+
+def test_sqlite_backend_round_trip(tmp_path):
+    backend = SQLiteChatHistoryBackend(path=str(tmp_path / "history.sqlite"))
+    backend.append("c1", [HumanMessage(content="question"), AIMessage(content="answer")])
+    backend.set_summary("c1", "earlier", 2)
+
+    reopened = SQLiteChatHistoryBackend(path=str(tmp_path / "history.sqlite"))
+
+    messages = reopened.load("c1")
+    assert [(type(m), m.content) for m in messages] == [(HumanMessage, "question"), (AIMessage, "answer")]
+    assert reopened.get_summary("c1") == ("earlier", 2)
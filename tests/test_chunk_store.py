@@ -0,0 +1,144 @@
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+from utils.index_store import ChunkRowIds, ChunkStore, ChunkStoreDocstore, RowId, load_vector_store, store_path
+
+
+def _rows(start, count, source="a.pdf"):
+    return [(row, f"id-{row}", f"fp-{row}", f"chunk text {row}", {"source": source, "page": row // 2})
+            for row in range(start, start + count)]
+
+
+def test_append_and_read_rows_back(tmp_path):
+    store = ChunkStore(tmp_path / "index.chunks")
+    store.append(_rows(0, 4))
+
+    doc = store.get_row(3)
+    assert (doc.id, doc.page_content, doc.metadata) == ("id-3", "chunk text 3", {"source": "a.pdf", "page": 1})
+    assert store.doc_id(2) == "id-2"
+    assert store.doc_id(4) is None
+    assert store.existing_fingerprints(["fp-1", "fp-9"]) == {"fp-1"}
+    assert [row for row, *_ in store.iter_rows(limit=2)] == [0, 1]
+
+
+def test_manifest_commits_rows_and_dictionary_encodes_metadata(tmp_path):
+    store = ChunkStore(tmp_path / "index.chunks")
+    store.append(_rows(0, 4))
+    store.set_meta("fingerprint", "v1")
+
+    manifest = json.loads((tmp_path / "index.chunks" / "manifest.json").read_text())
+    assert manifest["rows"] == 4
+    assert manifest["metadata_values"] == 2  # pages 0 and 1, two chunks each
+    assert manifest["meta"] == {"fingerprint": "v1"}
+
+    reader = ChunkStore(tmp_path / "index.chunks", read_only=True)
+    assert reader.count() == 4
+    assert reader.get_meta("fingerprint") == "v1"
+
+
+def test_rows_must_continue_the_store(tmp_path):
+    store = ChunkStore(tmp_path / "index.chunks")
+    store.append(_rows(0, 2))
+
+    with pytest.raises(ValueError):
+        store.append(_rows(5, 1))
+
+
+def test_uncommitted_append_is_invisible_and_cut_on_reopen(tmp_path, monkeypatch):
+    path = tmp_path / "index.chunks"
+    store = ChunkStore(path)
+    store.append(_rows(0, 2))
+
+    # crash after the columns were written but before the manifest was replaced
+    def crash(self):
+        raise RuntimeError("killed")
+    monkeypatch.setattr(ChunkStore, "_commit", crash)
+    with pytest.raises(RuntimeError):
+        store.append(_rows(2, 3, source="b.pdf"))
+    monkeypatch.undo()
+
+    assert ChunkStore(path, read_only=True).count() == 2
+
+    writer = ChunkStore(path)
+    assert writer.count() == 2
+    writer.append(_rows(2, 1, source="c.pdf"))
+    assert writer.get_row(2).metadata["source"] == "c.pdf"
+    assert [row for row, *_ in writer.iter_rows()] == [0, 1, 2]
+
+
+def test_truncate_drops_rows_without_vectors(tmp_path):
+    store = ChunkStore(tmp_path / "index.chunks")
+    store.append(_rows(0, 5))
+
+    assert store.truncate(3) == 2
+    assert ChunkStore(tmp_path / "index.chunks", read_only=True).count() == 3
+    assert store.existing_fingerprints(["fp-4"]) == set()
+
+
+def test_fingerprint_runs_are_merged_and_probed_per_key(tmp_path):
+    path = tmp_path / "index.chunks"
+    store = ChunkStore(path)
+    for start in range(0, 8):
+        store.append(_rows(start, 1))
+
+    # equal-sized batches merge like a binary counter: 8 single-row runs become one
+    assert [p.name for p in sorted(path.glob("fingerprint-*.idx"))] == ["fingerprint-000000000000-000000000008.idx"]
+    store.append(_rows(8, 1))
+    assert len(list(path.glob("fingerprint-*.idx"))) == 2
+
+    reopened = ChunkStore(path)
+    assert reopened.existing_fingerprints(["fp-0", "fp-8", "fp-42", "fp-5"]) == {"fp-0", "fp-8", "fp-5"}
+
+
+def test_stores_without_fingerprint_runs_are_indexed_on_first_probe(tmp_path):
+    path = tmp_path / "index.chunks"
+    ChunkStore(path).append(_rows(0, 3))
+    for run in path.glob("fingerprint-*.idx"):
+        run.unlink()
+
+    store = ChunkStore(path)
+    assert store.existing_fingerprints(["fp-2", "fp-3"]) == {"fp-2"}
+    assert len(list(path.glob("fingerprint-*.idx"))) == 1
+
+
+def test_updated_fingerprints_are_found_after_the_update(tmp_path):
+    store = ChunkStore(tmp_path / "index.chunks")
+    store.append([(row, f"id-{row}", "", f"chunk text {row}", {}) for row in range(3)])
+    assert store.existing_fingerprints(["new-1"]) == set()
+
+    store.update_fingerprints([("new-1", 1)])
+
+    assert store.existing_fingerprints(["new-1", "new-2"]) == {"new-1"}
+
+
+def test_lazy_docstore_resolves_hits_by_row(tmp_path):
+    store = ChunkStore(tmp_path / "index.chunks")
+    store.append(_rows(0, 3))
+    ids = ChunkRowIds(store, ntotal=2)  # row 2 belongs to an ingest still in flight
+    docstore = ChunkStoreDocstore(store)
+
+    doc_id = ids[1]
+    assert isinstance(doc_id, RowId) and doc_id == "id-1" and doc_id.row == 1
+    assert docstore.search(doc_id).page_content == "chunk text 1"
+    with pytest.raises(KeyError):
+        ids[2]
+    assert len(ids) == 2
+
+    ids[3] = "added-3"
+    docstore.add({"added-3": Document(page_content="added in this process")})
+    assert docstore.search(ids[3]).page_content == "added in this process"
+
+
+def test_lazy_vector_store_search(make_faiss_manager):
+    manager = make_faiss_manager()
+    manager.add_documents([Document(page_content=f"clause {i} about topic{i}", metadata={"source": "a.pdf", "page": i})
+                           for i in range(20)])
+
+    store = load_vector_store(manager.index_dir, manager.embedding_model, mmap=True, lazy=True)
+
+    assert isinstance(store.docstore, ChunkStoreDocstore)
+    assert store_path(manager.index_dir).is_dir()
+    hit = store.similarity_search("clause 7 about topic7", k=1)[0]
+    assert hit.metadata == {"source": "a.pdf", "page": 7}
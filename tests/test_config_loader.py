@@ -0,0 +1,14 @@
+from utils.config_loader import load_config, reload_config
+
+
+def test_config_is_parsed_once_until_reloaded(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text("retrieval:\n  top_k: 5\n")
+    monkeypatch.setenv("CONFIG_PATH", str(path))
+
+    first = load_config()
+    path.write_text("retrieval:\n  top_k: 9\n")
+    assert load_config() is first
+
+    reload_config()
+    assert load_config()["retrieval"]["top_k"] == 9
@@ -0,0 +1,74 @@
+from langchain_core.documents import Document
+
+from utils.context_packer import SEPARATOR, pack_context, trim_to_sentences
+from utils.tokens import estimate_tokens
+
+
+def _doc(text, source="a.pdf", page=1, doc_id=None):
+    return Document(id=doc_id, page_content=text, metadata={"source": source, "page": page})
+
+
+SENTENCES = " ".join(f"Clause {i} sets out an obligation of the supplier." for i in range(40))
+
+
+def test_everything_fits_within_budget():
+    docs = [_doc("First chunk.", doc_id="1"), _doc("Second chunk.", page=2, doc_id="2")]
+
+    packed = pack_context(docs, max_tokens=100)
+
+    assert packed.text == "First chunk." + SEPARATOR + "Second chunk."
+    assert packed.source_ids == ["1", "2"]
+    assert packed.tokens == estimate_tokens("First chunk.") + estimate_tokens(SEPARATOR) + estimate_tokens("Second chunk.")
+    assert (packed.deduplicated, packed.dropped, packed.truncated) == (0, 0, False)
+
+
+def test_exact_duplicates_from_the_same_source_are_removed():
+    text = "The agreement renews automatically every year."
+    docs = [_doc(text, doc_id="1"), _doc(text, doc_id="2"), _doc(text, source="b.pdf", doc_id="3")]
+
+    packed = pack_context(docs, max_tokens=200)
+
+    assert packed.source_ids == ["1", "3"]
+    assert packed.deduplicated == 1
+
+
+def test_splitter_overlap_is_stripped():
+    shared = "Either party may terminate this agreement with notice. "
+    first = "The term is five years. " + shared
+    second = shared + "Fees are payable quarterly in advance."
+
+    packed = pack_context([_doc(first, doc_id="1"), _doc(second, page=2, doc_id="2")], max_tokens=500)
+
+    assert packed.text.count("Either party may terminate") == 1
+    assert packed.text.endswith("Fees are payable quarterly in advance.")
+
+
+def test_over_budget_chunk_is_trimmed_at_a_sentence_and_the_rest_dropped():
+    docs = [_doc("Short first chunk.", doc_id="1"), _doc(SENTENCES, page=2, doc_id="2"), _doc("Never packed.", page=3, doc_id="3")]
+
+    packed = pack_context(docs, max_tokens=120, min_fragment_tokens=16)
+
+    assert packed.tokens <= 120
+    assert packed.truncated
+    assert packed.source_ids == ["1", "2"]
+    assert packed.dropped == 1
+    assert packed.text.endswith("supplier.")
+    assert "Never packed." not in packed.text
+
+
+def test_fragment_below_minimum_is_dropped_instead_of_trimmed():
+    docs = [_doc("x " * 180, doc_id="1"), _doc(SENTENCES, page=2, doc_id="2")]
+
+    packed = pack_context(docs, max_tokens=120, min_fragment_tokens=64)
+
+    assert packed.source_ids == ["1"]
+    assert not packed.truncated
+    assert packed.dropped == 1
+
+
+def test_trim_to_sentences_respects_the_token_limit():
+    trimmed = trim_to_sentences(SENTENCES, 50)
+
+    assert estimate_tokens(trimmed) <= 50
+    assert trimmed.endswith(".")
+    assert SENTENCES.startswith(trimmed)
@@ -0,0 +1,62 @@
+import hashlib
+import io
+
+import pytest
+
+from utils.file_io import UploadBudget, UploadTooLargeError, stream_upload
+
+
+class Upload(io.BytesIO):
+    """File-like upload; size mimics the declared Content-Length some clients send."""
+
+    def __init__(self, data: bytes, name: str = "doc.pdf", size=None):
+        super().__init__(data)
+        self.name = name
+        self.size = size
+
+
+def _budget(max_file_bytes=1000, max_request_bytes=1500, chunk_size=64):
+    budget = UploadBudget(max_file_bytes=max_file_bytes, max_request_bytes=max_request_bytes)
+    budget.chunk_size = chunk_size
+    return budget
+
+
+def test_stream_upload_writes_file_and_hash(tmp_path):
+    data = bytes(range(256)) * 3
+    saved = stream_upload(Upload(data), tmp_path / "out.pdf", _budget())
+
+    assert (tmp_path / "out.pdf").read_bytes() == data
+    assert saved.size_bytes == len(data)
+    assert saved.sha256 == hashlib.sha256(data).hexdigest()
+    assert saved.original_name == "doc.pdf"
+
+
+def test_declared_size_over_limit_is_rejected_before_reading(tmp_path):
+    upload = Upload(b"x" * 10, size=5000)
+
+    with pytest.raises(UploadTooLargeError):
+        stream_upload(upload, tmp_path / "out.pdf", _budget())
+
+    assert upload.tell() == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_undeclared_oversized_upload_stops_mid_stream_without_leftovers(tmp_path):
+    upload = Upload(b"x" * 5000)
+
+    with pytest.raises(UploadTooLargeError):
+        stream_upload(upload, tmp_path / "out.pdf", _budget())
+
+    assert upload.tell() < 5000
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_request_budget_is_shared_across_files(tmp_path):
+    budget = _budget()
+    stream_upload(Upload(b"a" * 900), tmp_path / "one.pdf", budget)
+
+    with pytest.raises(UploadTooLargeError, match="per-request"):
+        stream_upload(Upload(b"b" * 900), tmp_path / "two.pdf", budget)
+
+    assert budget.total_bytes == 900
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["one.pdf"]
@@ -0,0 +1,50 @@
+from langchain_core.documents import Document
+
+
+def _doc(text, **metadata):
+    return Document(page_content=text, metadata={"source": "a.pdf", **metadata})
+
+
+def test_duplicate_chunks_in_one_batch_are_embedded_once(make_faiss_manager):
+    manager = make_faiss_manager()
+
+    added = manager.add_documents([_doc("payment is due in 30 days", page=1), _doc("payment is due in 30 days", page=7)])
+
+    assert added == 1
+    assert manager.last_ingest_stats == {"added": 1, "skipped": 1}
+    assert manager.vector_store.index.ntotal == 1
+
+
+def test_reingesting_the_same_chunks_adds_nothing(make_faiss_manager):
+    docs = [_doc(f"clause {i} covers liability", page=i) for i in range(5)]
+    make_faiss_manager().add_documents(docs)
+
+    # a fresh manager dedups against what is stored on disk
+    manager = make_faiss_manager()
+    added = manager.add_documents(docs + [_doc("a new warranty clause", page=9)])
+
+    assert added == 1
+    assert manager.last_ingest_stats == {"added": 1, "skipped": 5}
+    assert manager.vector_store.index.ntotal == 6
+    assert manager.chunk_store.count() == 6
+
+
+def test_fingerprint_ignores_whitespace_and_source():
+    from src.document_ingestion.data_ingestion import FaissManager
+
+    a = FaissManager._fingerprint("notice   period\nis 30 days", {"source": "a.pdf", "page": 1})
+    b = FaissManager._fingerprint("notice period is 30 days", {"source": "b.pdf", "page": 4})
+    c = FaissManager._fingerprint("notice period is 60 days", {"source": "a.pdf", "page": 1})
+
+    assert a == b
+    assert a != c
+
+
+def test_tabular_rows_keep_their_row_identity():
+    from src.document_ingestion.data_ingestion import FaissManager
+
+    first = FaissManager._fingerprint("same text", {"source": "t.csv", "row_id": 1})
+    second = FaissManager._fingerprint("same text", {"source": "t.csv", "row_id": 2})
+
+    assert first == "t.csv::1"
+    assert first != second
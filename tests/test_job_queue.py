@@ -0,0 +1,29 @@
+from model.models import JobRecord, JobStatus
+from utils.job_queue import InlineJobBackend, JobManager, JobStore
+
+
+def _manager(tmp_path, ttl_seconds=3600):
+    return JobManager(backend=InlineJobBackend(), store=JobStore(str(tmp_path / "jobs"), ttl_seconds=ttl_seconds))
+
+
+def test_submit_purges_expired_jobs_without_reading_job_files(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, ttl_seconds=0)
+    first = manager.submit("analyze", lambda ctx: {"ok": True})
+    assert (tmp_path / "jobs" / f"{first.job_id}.json").exists()
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("job file parsed")
+    monkeypatch.setattr(JobRecord, "model_validate_json", no_reads)
+    manager.submit("analyze", lambda ctx: {"ok": True})
+
+    assert not (tmp_path / "jobs" / f"{first.job_id}.json").exists()
+
+
+def test_startup_purges_expired_jobs_left_by_other_workers(tmp_path):
+    store = JobStore(str(tmp_path / "jobs"), ttl_seconds=0)
+    store.save(JobRecord(job_id="old", kind="analyze", created_at=0.0, finished_at=1.0,
+                         status=JobStatus.SUCCEEDED, owner="elsewhere:1"))
+
+    _manager(tmp_path, ttl_seconds=0)
+
+    assert not (tmp_path / "jobs" / "old.json").exists()
@@ -0,0 +1,66 @@
+from src.document_compare.document_comparator import DocumentComparaorLLM
+from src.document_compare.page_diff import align_pages, format_changed_segments
+from logger.custom_logger import CustomLogger
+
+
+def test_identical_documents_have_no_changed_segments():
+    pages = ["intro", "terms", "signatures"]
+
+    diff = align_pages(pages, list(pages))
+
+    assert diff.unchanged_pages == [1, 2, 3]
+    assert diff.changed == []
+    assert diff.changed_page_count == 0
+
+
+def test_whitespace_reflow_counts_as_unchanged():
+    diff = align_pages(["payment due\nin 30 days"], ["payment  due in 30   days "])
+
+    assert diff.unchanged_pages == [1]
+
+
+def test_inserted_page_keeps_later_pages_aligned():
+    reference = ["intro", "terms", "signatures"]
+    actual = ["intro", "new annex", "terms", "signatures"]
+
+    diff = align_pages(reference, actual)
+
+    assert diff.unchanged_pages == [1, 3, 4]
+    assert len(diff.changed) == 1
+    assert diff.changed[0].reference_pages == []
+    assert diff.changed[0].actual_pages == [(2, "new annex")]
+
+
+def test_modified_and_removed_pages_are_reported():
+    reference = ["intro", "terms v1", "appendix", "signatures"]
+    actual = ["intro", "terms v2", "signatures"]
+
+    diff = align_pages(reference, actual)
+
+    assert diff.unchanged_pages == [1, 3]
+    assert [(s.reference_pages, s.actual_pages) for s in diff.changed] == [
+        ([(2, "terms v1"), (3, "appendix")], [(2, "terms v2")]),
+    ]
+    assert diff.changed_page_count == 2
+
+
+def test_format_changed_segments_only_includes_changed_pages():
+    diff = align_pages(["intro", "old clause"], ["intro", "new clause"])
+
+    text = format_changed_segments(diff.changed)
+
+    assert "old clause" in text and "new clause" in text
+    assert "intro" not in text
+    assert "--- Page 2 ---" in text
+
+
+def test_removed_pages_are_labelled_apart_from_actual_pages():
+    diff = align_pages(["intro", "terms v1", "appendix", "signatures"], ["intro", "terms v2", "signatures"])
+    comparator = DocumentComparaorLLM.__new__(DocumentComparaorLLM)
+    comparator.log = CustomLogger().get_logger(__name__)
+
+    assert "--- Page ref 3 ---" in format_changed_segments(diff.changed)
+    llm_rows = [{"Page": "Reference page 3 (removed)", "Changes": "appendix dropped"}, {"Page": "2", "Changes": "terms updated"}]
+    df = comparator._merge_rows(diff, llm_rows)
+
+    assert list(df["Page"]) == ["1", "2", "ref 3 (removed)", "3"]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+import re
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.cache import LRUTTLCache
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+_TRAILING_PUNCT = re.compile(r"[\s?!.]+$")
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation."""
+    return _TRAILING_PUNCT.sub("", " ".join(question.lower().split()))
+
+
+class AnswerCache:
+    """Caches final RAG answers per scope (index version, model, retrieved chunk ids).
+
+    Questions are the standalone (history-rewritten) form, so a follow-up asked in any
+    conversation can reuse an answer. Lookups first try the normalized question exactly. When similarity_threshold is set,
+    a miss falls back to comparing the question embedding with the questions already
+    answered in the same scope; because the scope includes the retrieved chunk ids, only
+    answers built from the very same context are ever reused.
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 1800, similarity_threshold: Optional[float] = None,
+                 max_questions_per_scope: int = 32):
+        self.similarity_threshold = similarity_threshold
+        self.max_questions_per_scope = max(1, int(max_questions_per_scope))
+        self._exact = LRUTTLCache("answer", max_size=max_size, ttl_seconds=ttl_seconds)
+        self._vectors = LRUTTLCache("answer_vectors", max_size=max_size, ttl_seconds=ttl_seconds)
+        self.semantic_hits = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.similarity_threshold is not None
+
+    def get(self, scope: Hashable, question: str, vector: Optional[Sequence[float]] = None) -> Optional[str]:
+        answer = self._exact.get((scope, normalize_question(question)))
+        if answer is not None or not self.semantic_enabled or vector is None:
+            return answer
+
+        entries: List[Tuple[np.ndarray, str]] = self._vectors.get(scope) or []
+        if not entries:
+            return None
+
+        query = self._unit(vector)
+        scores = np.stack([v for v, _ in entries]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        self.semantic_hits += 1
+        log.info("Semantic answer cache hit.", similarity=round(float(scores[best]), 4))
+        return entries[best][1]
+
+    def put(self, scope: Hashable, question: str, answer: str, vector: Optional[Sequence[float]] = None):
+        self._exact.put((scope, normalize_question(question)), answer)
+        if not self.semantic_enabled or vector is None:
+            return
+
+        entries = list(self._vectors.get(scope) or [])
+        entries.append((self._unit(vector), answer))
+        self._vectors.put(scope, entries[-self.max_questions_per_scope:])
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    def stats(self) -> Dict[str, Any]:
+        exact = self._exact.stats()
+        # every semantic hit was first counted as an exact miss
+        hits = exact["hits"] + self.semantic_hits
+        lookups = exact["hits"] + exact["misses"]
+        return {
+            **exact,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "exact_hits": exact["hits"],
+            "semantic_hits": self.semantic_hits,
+            "similarity_threshold": self.similarity_threshold,
+        }
+
+
+_cache_config = (load_config().get("cache") or {})
+
+# Final answers keyed by (index version, model, chunk ids) + standalone question
+ANSWER_CACHE = AnswerCache(
+    max_size=_cache_config.get("answer_max_size", 512),
+    ttl_seconds=_cache_config.get("ttl_seconds", 1800),
+    similarity_threshold=_cache_config.get("answer_similarity_threshold"),
+)
+
+def answer_cache_stats() -> Dict[str, Any]:
+    return {"answer": ANSWER_CACHE.stats()}
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import os
+import re
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_SEGMENT = re.compile(r"^seg-(\d+)-(\d+)\.json$")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1]
+
+
+def bm25_path(index_dir: str | Path, index_name: str = "index") -> Path:
+    return Path(index_dir) / f"{index_name}.bm25"
+
+
+class BM25Index:
+    """Okapi BM25 inverted index addressed by FAISS row number.
+
+    Rows are appended in the same order as vectors are added to the FAISS index, so a
+    lexical hit maps straight to ``index_to_docstore_id[row]``. Stored next to
+    ``index.faiss`` as a directory of append-only JSON segments, ``seg-<start>-<end>.json``,
+    each holding the postings of rows start..end-1 (one ingest batch). An ingest writes
+    only its own segment; ``load`` merges the segments in row order, and once there are
+    more than MAX_SEGMENTS they are compacted into one.
+    """
+
+    VERSION = 1
+    MAX_SEGMENTS = 64
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_len: List[int] = []
+        self.postings: Dict[str, List[List[int]]] = {}  # term -> [[row, tf], ...]
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.doc_len)
+
+    def add(self, start_row: int, texts: Sequence[str]):
+        """Append texts as rows start_row, start_row + 1, ...; rows must stay contiguous."""
+        if start_row != self.n_docs:
+            raise ValueError(f"BM25 rows must be appended in order: expected row {self.n_docs}, got {start_row}")
+
+        doc_len, postings = _postings(start_row, texts)
+        self.doc_len.extend(doc_len)
+        for token, plist in postings.items():
+            self.postings.setdefault(token, []).extend(plist)
+        self._arrays.clear()
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if term not in self._arrays:
+            plist = self.postings.get(term)
+            if not plist:
+                return None
+            data = np.asarray(plist, dtype=np.int64)
+            self._arrays[term] = (data[:, 0], data[:, 1].astype(np.float32))
+        return self._arrays[term]
+
+    def search(self, query: str, k: int, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return up to k (row, score) pairs with a positive score, best first.
+
+        Rows >= limit (e.g. the FAISS index's ntotal) are ignored.
+        """
+        n = self.n_docs if limit is None else min(self.n_docs, limit)
+        if n == 0:
+            return []
+
+        doc_len = np.asarray(self.doc_len[:n], dtype=np.float32)
+        avgdl = float(doc_len.mean()) or 1.0
+        scores = np.zeros(n, dtype=np.float32)
+
+        for term in set(tokenize(query)):
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            rows, tfs = arrays
+            mask = rows < n
+            rows, tfs = rows[mask], tfs[mask]
+            if rows.size == 0:
+                continue
+            idf = math.log(1 + (n - rows.size + 0.5) / (rows.size + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_len[rows] / avgdl)
+            scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top if scores[row] > 0]
+
+    @staticmethod
+    def segments(path: str | Path) -> List[Tuple[int, int, Path]]:
+        """(start_row, end_row, file) of every segment under path, by start row (longest first)."""
+        path = Path(path)
+        if not path.is_dir():
+            return []
+        found = []
+        for file in path.iterdir():
+            match = _SEGMENT.match(file.name)
+            if match:
+                found.append((int(match[1]), int(match[2]), file))
+        return sorted(found, key=lambda s: (s[0], -s[1]))
+
+    @classmethod
+    def _chain(cls, path: str | Path) -> List[Tuple[int, int, Path]]:
+        """Segments covering rows 0..n-1 contiguously; overlapping segments and anything past a gap are skipped."""
+        chain, covered = [], 0
+        for start, end, file in cls.segments(path):
+            if start == covered and end > start:
+                chain.append((start, end, file))
+                covered = end
+        return chain
+
+    @classmethod
+    def covered_rows(cls, path: str | Path) -> int:
+        """Number of leading rows that have postings on disk (from the segment names alone)."""
+        chain = cls._chain(path)
+        return chain[-1][1] if chain else 0
+
+    @classmethod
+    def write_segment(cls, path: str | Path, start_row: int, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        """Write the postings of rows start_row.. as a new segment; existing segments are not touched."""
+        if not texts:
+            return
+        doc_len, postings = _postings(start_row, texts)
+        _write_segment(Path(path), start_row, {"version": cls.VERSION, "k1": k1, "b": b, "doc_len": doc_len, "postings": postings})
+
+    @classmethod
+    def truncate(cls, path: str | Path, rows: int):
+        """Drop segments holding rows >= rows (e.g. left behind by an index that was recreated)."""
+        for start, end, file in cls.segments(path):
+            if end > rows:
+                file.unlink(missing_ok=True)
+
+    @classmethod
+    def compact(cls, path: str | Path):
+        """Merge the segments into a single one."""
+        index = cls.load(path)
+        if index.n_docs:
+            _write_segment(Path(path), 0, {"version": cls.VERSION, "k1": index.k1, "b": index.b,
+                                           "doc_len": index.doc_len, "postings": index.postings})
+        for start, end, file in cls.segments(path):
+            if (start, end) != (0, index.n_docs):
+                file.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "BM25Index":
+        """Merge the segments under path; an index without segments is empty."""
+        index = None
+        for start, _, file in cls._chain(path):
+            with open(file, encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != cls.VERSION:
+                raise ValueError(f"Unsupported BM25 index version: {payload.get('version')}")
+            if index is None:
+                index = cls(k1=payload["k1"], b=payload["b"])
+            index.doc_len.extend(payload["doc_len"])
+            for token, plist in payload["postings"].items():
+                index.postings.setdefault(token, []).extend(plist)
+        return index if index is not None else cls()
+
+    @classmethod
+    def build(cls, texts: Sequence[str]) -> "BM25Index":
+        index = cls()
+        index.add(0, texts)
+        return index
+
+
+def _postings(start_row: int, texts: Sequence[str]) -> Tuple[List[int], Dict[str, List[List[int]]]]:
+    doc_len: List[int] = []
+    postings: Dict[str, List[List[int]]] = {}
+    for offset, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_len.append(len(tokens))
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append([start_row + offset, tf])
+    return doc_len, postings
+
+
+def _write_segment(path: Path, start_row: int, payload: dict):
+    path.mkdir(parents=True, exist_ok=True)
+    target = path / f"seg-{start_row:012d}-{start_row + len(payload['doc_len']):012d}.json"
+    tmp_path = target.with_name(target.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, target)
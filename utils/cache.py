@@ -0,0 +1,307 @@
+from __future__ import annotations
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+
+class LRUTTLCache:
+    """A thread-safe, size-bounded LRU cache with an idle TTL and optional per-entry versions.
+
+    Entries stored with a ``version`` are treated as stale (and dropped) when looked up
+    with a different version, which lets callers tie an entry to e.g. on-disk file state.
+    """
+
+    def __init__(self, name: str, max_size: int = 32, ttl_seconds: float = 1800):
+        self.name = name
+        self.max_size = max(1, int(max_size))
+        self.ttl_seconds = float(ttl_seconds)
+
+        self._data: "OrderedDict[Hashable, Tuple[Any, Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _is_expired(self, last_access: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and (now - last_access) > self.ttl_seconds
+
+    def _sweep(self, now: float):
+        """Drop idle entries. Caller must hold the lock."""
+        for key in [k for k, (_, _, ts) in self._data.items() if self._is_expired(ts, now)]:
+            del self._data[key]
+            self.expirations += 1
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        """Return the cached value for key, or None on miss / expiry / version mismatch."""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._data.get(key)
+
+            if entry is not None:
+                value, entry_version, last_access = entry
+
+                if self._is_expired(last_access, now):
+                    del self._data[key]
+                    self.expirations += 1
+                elif version is not None and entry_version != version:
+                    del self._data[key]
+                    self.invalidations += 1
+                else:
+                    self._data[key] = (value, entry_version, now)
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, version: Any = None):
+        """Insert or replace a value, evicting the least recently used entries if full."""
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+
+            self._data[key] = (value, version, now)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                evicted_key, _ = self._data.popitem(last=False)
+                self.evictions += 1
+                log.info("Cache entry evicted.", cache=self.name, key=str(evicted_key))
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], version: Any = None) -> Any:
+        """Return the cached value or build it with loader. Concurrent loads of one key run once."""
+        value = self.get(key, version=version)
+        if value is not None:
+            return value
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        try:
+            with load_lock:
+                # another thread may have finished loading while we waited
+                with self._lock:
+                    entry = self._data.get(key)
+                    if entry is not None and (version is None or entry[1] == version):
+                        self._data[key] = (entry[0], entry[1], time.monotonic())
+                        self._data.move_to_end(key)
+                        return entry[0]
+
+                value = loader()
+                self.put(key, value, version=version)
+        finally:
+            # also when the loader raised, so failed keys don't leave a lock behind
+            with self._lock:
+                self._load_locks.pop(key, None)
+
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches predicate. Returns the number removed."""
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for key in keys:
+                del self._data[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class TieredCache:
+    """An in-memory LRUTTLCache in front of a JSON-file disk tier.
+
+    Keys are tuples of strings; values must be JSON-serializable. Entries survive restarts
+    and are shared between worker processes through the disk tier, which keeps at most
+    disk_max_entries files and drops the least recently used ones first.
+    """
+
+    def __init__(self, name: str, disk_dir: str | Path, max_size: int = 64, ttl_seconds: float = 1800, disk_max_entries: int = 2000):
+        self.name = name
+        self.memory = LRUTTLCache(name, max_size=max_size, ttl_seconds=ttl_seconds)
+        self.disk_dir = Path(disk_dir) / name
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.disk_max_entries = int(disk_max_entries)
+        self.disk_hits = 0
+
+    def _path(self, key: Sequence[str]) -> Path:
+        digest = hashlib.sha256(json.dumps(list(key)).encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.json"
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # mtime doubles as the disk tier's last-used time
+        except (OSError, ValueError):
+            return None
+
+        self.disk_hits += 1
+        self.memory.put(key, value)
+        return value
+
+    def put(self, key: Tuple[str, ...], value: Any):
+        self.memory.put(key, value)
+
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            tmp_path.unlink(missing_ok=True)
+            log.warning("Disk cache write failed.", cache=self.name, error=str(e))
+            return
+        self._prune()
+
+    def _prune(self):
+        files = list(self.disk_dir.glob("*.json"))
+        if len(files) <= self.disk_max_entries:
+            return
+
+        def _mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        files.sort(key=_mtime)
+        for path in files[:len(files) - self.disk_max_entries]:
+            path.unlink(missing_ok=True)
+        log.info("Disk cache pruned.", cache=self.name, removed=len(files) - self.disk_max_entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.memory.stats(), "disk_hits": self.disk_hits, "disk_dir": str(self.disk_dir)}
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def prompt_version(*prompts) -> str:
+    """Short fingerprint of prompt templates, so cached LLM results expire when a prompt is edited."""
+    return text_hash("\n".join(repr(p) for p in prompts))[:16]
+
+
+def index_key(index_dir: str | Path) -> str:
+    """Normalize an index directory into a stable cache key component."""
+    return str(Path(index_dir).resolve())
+
+
+def faiss_index_version(index_dir: str | Path, index_name: str = "index") -> Tuple:
+    """Fingerprint the on-disk state of a FAISS index directory using file mtimes and sizes.
+
+    Covers index.faiss and the chunk store manifest: both are replaced atomically on every
+    commit, so any ingest, rebuild or legacy conversion changes the version.
+    """
+    index_dir = Path(index_dir)
+    parts = []
+
+    for filename in (f"{index_name}.faiss", f"{index_name}.chunks/manifest.json"):
+        path = index_dir / filename
+        try:
+            stat = path.stat()
+            parts.append((filename, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            parts.append((filename, None, None))
+
+    return tuple(parts)
+
+
+_cache_config = (load_config().get("cache") or {})
+
+# Loaded FAISS vector stores keyed by (index_dir, index_name)
+VECTORSTORE_CACHE = LRUTTLCache(
+    "vectorstore",
+    max_size=_cache_config.get("vectorstore_max_size", 16),
+    ttl_seconds=_cache_config.get("ttl_seconds", 1800),
+)
+
+# Compiled ConversationalRAG chains keyed by (index_dir, index_name, k, ...)
+RAG_CACHE = LRUTTLCache(
+    "rag_chain",
+    max_size=_cache_config.get("rag_max_size", 32),
+    ttl_seconds=_cache_config.get("ttl_seconds", 1800),
+)
+
+
+_disk_dir = os.getenv("RESULT_CACHE_DIR", _cache_config.get("disk_dir", "data/cache"))
+
+# Extracted PDF page text keyed by (file sha256, extractor)
+PARSED_TEXT_CACHE = TieredCache(
+    "parsed_text",
+    _disk_dir,
+    max_size=_cache_config.get("parsed_text_max_size", 64),
+    ttl_seconds=_cache_config.get("ttl_seconds", 1800),
+    disk_max_entries=_cache_config.get("disk_max_entries", 2000),
+)
+
+# Final analysis / comparison results keyed by (kind, file sha256(s), prompt version, model, ...)
+RESULT_CACHE = TieredCache(
+    "llm_result",
+    _disk_dir,
+    max_size=_cache_config.get("result_max_size", 256),
+    ttl_seconds=_cache_config.get("ttl_seconds", 1800),
+    disk_max_entries=_cache_config.get("disk_max_entries", 2000),
+)
+
+
+def invalidate_index(index_dir: str | Path) -> int:
+    """Drop every cached vector store / chain built from index_dir. Called after index writes."""
+    key = index_key(index_dir)
+    removed = 0
+
+    for cache in (VECTORSTORE_CACHE, RAG_CACHE):
+        removed += cache.invalidate(lambda k: isinstance(k, tuple) and k and k[0] == key)
+
+    if removed:
+        log.info("Cache invalidated for index.", index_dir=key, removed=removed)
+
+    return removed
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        "vectorstore": VECTORSTORE_CACHE.stats(),
+        "rag_chain": RAG_CACHE.stats(),
+        "parsed_text": PARSED_TEXT_CACHE.stats(),
+        "llm_result": RESULT_CACHE.stats(),
+    }
@@ -0,0 +1,250 @@
+from __future__ import annotations
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from utils.cache import LRUTTLCache
+from utils.tokens import estimate_tokens
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+
+log = CustomLogger().get_logger(__name__)
+
+_MESSAGE_TYPES: Dict[str, Type[BaseMessage]] = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}
+
+# summarizer(previous_summary, newly_dropped_messages) -> updated summary
+Summarizer = Callable[[str, List[BaseMessage]], str]
+
+
+class ChatHistoryBackend(ABC):
+    """Persists messages and a rolling summary per conversation. Subclass to add storage."""
+
+    @abstractmethod
+    def load(self, conversation_id: str) -> List[BaseMessage]:
+        ...
+
+    @abstractmethod
+    def append(self, conversation_id: str, messages: Sequence[BaseMessage]):
+        ...
+
+    @abstractmethod
+    def clear(self, conversation_id: str):
+        ...
+
+    @abstractmethod
+    def get_summary(self, conversation_id: str) -> Tuple[str, int]:
+        """Return (summary, number of leading messages it covers)."""
+
+    @abstractmethod
+    def set_summary(self, conversation_id: str, summary: str, covered: int):
+        ...
+
+
+class InMemoryChatHistoryBackend(ChatHistoryBackend):
+    """Process-local history; conversations are lost on restart and not shared between workers.
+
+    Held in an LRUTTLCache, so conversations idle for ttl_seconds, and the least recently
+    used beyond max_conversations, are dropped.
+    """
+
+    def __init__(self, max_conversations: Optional[int] = None, ttl_seconds: Optional[float] = None, **_):
+        self._conversations = LRUTTLCache(
+            "chat_history",
+            max_size=max_conversations or 1000,
+            ttl_seconds=86400 if ttl_seconds is None else ttl_seconds,
+        )
+        self._lock = threading.Lock()
+
+    def _conversation(self, conversation_id: str, create: bool = False) -> Optional[Dict[str, Any]]:
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None and create:
+            conversation = {"messages": [], "summary": ("", 0)}
+            self._conversations.put(conversation_id, conversation)
+        return conversation
+
+    def load(self, conversation_id: str) -> List[BaseMessage]:
+        with self._lock:
+            conversation = self._conversation(conversation_id)
+            return list(conversation["messages"]) if conversation else []
+
+    def append(self, conversation_id: str, messages: Sequence[BaseMessage]):
+        with self._lock:
+            self._conversation(conversation_id, create=True)["messages"].extend(messages)
+
+    def clear(self, conversation_id: str):
+        with self._lock:
+            self._conversations.invalidate(lambda key: key == conversation_id)
+
+    def get_summary(self, conversation_id: str) -> Tuple[str, int]:
+        with self._lock:
+            conversation = self._conversation(conversation_id)
+            return conversation["summary"] if conversation else ("", 0)
+
+    def set_summary(self, conversation_id: str, summary: str, covered: int):
+        with self._lock:
+            self._conversation(conversation_id, create=True)["summary"] = (summary, covered)
+
+
+class SQLiteChatHistoryBackend(ChatHistoryBackend):
+    """SQLite (WAL) history shared by every worker process on the host."""
+
+    def __init__(self, path: Optional[str] = None, **_):
+        self.path = Path(path or "data/chat_history.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " conversation_id TEXT NOT NULL,"
+            " role TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (conversation_id, id)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " conversation_id TEXT PRIMARY KEY,"
+            " summary TEXT NOT NULL,"
+            " covered INTEGER NOT NULL)"
+        )
+
+    def load(self, conversation_id: str) -> List[BaseMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE conversation_id = ? ORDER BY id", (conversation_id,)
+            ).fetchall()
+        return [_MESSAGE_TYPES.get(role, HumanMessage)(content=content) for role, content in rows]
+
+    def append(self, conversation_id: str, messages: Sequence[BaseMessage]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO messages (conversation_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                [(conversation_id, m.type, str(m.content), now) for m in messages],
+            )
+
+    def clear(self, conversation_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+            self._conn.execute("DELETE FROM summaries WHERE conversation_id = ?", (conversation_id,))
+
+    def get_summary(self, conversation_id: str) -> Tuple[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, covered FROM summaries WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else ("", 0)
+
+    def set_summary(self, conversation_id: str, summary: str, covered: int):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (conversation_id, summary, covered) VALUES (?, ?, ?)",
+                (conversation_id, summary, covered),
+            )
+
+
+CHAT_HISTORY_BACKENDS: Dict[str, Type[ChatHistoryBackend]] = {
+    "memory": InMemoryChatHistoryBackend,
+    "sqlite": SQLiteChatHistoryBackend,
+}
+
+
+class ChatHistoryStore:
+    """Per-conversation chat history with a token-budgeted window.
+
+    window() returns the most recent messages that fit in max_tokens. When summarize is
+    enabled and a summarizer is given, messages that fell out of the window are folded into
+    a rolling summary (updated incrementally, so each message is summarized once) that is
+    prepended as a system message; its tokens count against max_tokens too.
+    """
+
+    def __init__(self, backend: Optional[ChatHistoryBackend] = None):
+        config = load_config().get("chat_history") or {}
+
+        if backend is None:
+            backend_name = os.getenv("CHAT_HISTORY_BACKEND", config.get("backend", "memory"))
+            if backend_name not in CHAT_HISTORY_BACKENDS:
+                raise DocumentPortalException(f"Unsupported chat history backend: {backend_name}", None)
+            backend = CHAT_HISTORY_BACKENDS[backend_name](
+                path=os.getenv("CHAT_HISTORY_DB", config.get("sqlite_path")),
+                max_conversations=config.get("max_conversations"),
+                ttl_seconds=config.get("ttl_seconds"),
+            )
+
+        self.backend = backend
+        self.max_tokens = int(config.get("max_tokens", 2000))
+        self.summarize = bool(config.get("summarize", False))
+
+    def fit(self, messages: Sequence[BaseMessage], budget: Optional[int] = None) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+        """Split messages into (dropped, kept) where kept is the newest suffix within budget (default max_tokens)."""
+        budget = self.max_tokens if budget is None else budget
+        start = len(messages)
+        while start > 0:
+            cost = estimate_tokens(str(messages[start - 1].content))
+            if cost > budget:
+                break
+            budget -= cost
+            start -= 1
+        return list(messages[:start]), list(messages[start:])
+
+    @staticmethod
+    def _summary_message(summary: str) -> SystemMessage:
+        return SystemMessage(content=f"Summary of the earlier conversation: {summary}")
+
+    def window(self, conversation_id: str, summarizer: Optional[Summarizer] = None) -> List[BaseMessage]:
+        messages = self.backend.load(conversation_id)
+        if not (self.summarize and summarizer):
+            return self.fit(messages)[1]
+
+        summary, covered = self.backend.get_summary(conversation_id)
+        if covered > len(messages):
+            # the conversation was cleared and restarted; its old summary no longer applies
+            summary, covered = "", 0
+
+        summarized = covered
+        while True:
+            # messages already in the summary stay there; the rest share what it leaves of the budget
+            reserve = estimate_tokens(str(self._summary_message(summary).content)) if covered else 0
+            dropped, kept = self.fit(messages[covered:], self.max_tokens - reserve)
+            if not dropped:
+                break
+            summary = summarizer(summary, dropped)
+            covered += len(dropped)
+
+        if covered > summarized:
+            self.backend.set_summary(conversation_id, summary, covered)
+            log.info("Chat history summarized.", conversation_id=conversation_id, summarized_messages=covered)
+
+        return ([self._summary_message(summary)] if covered else []) + kept
+
+    def append_turn(self, conversation_id: str, question: str, answer: str):
+        self.backend.append(conversation_id, [HumanMessage(content=question), AIMessage(content=answer)])
+
+    def messages(self, conversation_id: str) -> List[BaseMessage]:
+        return self.backend.load(conversation_id)
+
+    def clear(self, conversation_id: str):
+        self.backend.clear(conversation_id)
+
+
+_STORE: Optional[ChatHistoryStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_chat_history_store() -> ChatHistoryStore:
+    """Return the process-wide ChatHistoryStore built from config."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ChatHistoryStore()
+        return _STORE
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+_api_config = load_config().get("api") or {}
+
+# Shared pool for blocking work (PDF parsing, embedding, FAISS I/O) so it never runs on the event loop
+BLOCKING_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(_api_config.get("worker_threads", 8)),
+    thread_name_prefix="blocking",
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a synchronous callable on the shared worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(BLOCKING_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+
+class QueueFullError(Exception):
+    """Raised when an endpoint already has max_queue requests waiting for a slot."""
+
+
+class EndpointLimiter:
+    """Bound how many requests of one endpoint run at once and how many may wait."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.in_flight >= self.max_concurrency and self.waiting >= self.max_queue:
+            self.rejected += 1
+            log.warning("Endpoint queue full, rejecting request.", endpoint=self.name, waiting=self.waiting)
+            raise QueueFullError(f"Too many concurrent requests for {self.name}; try again later.")
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+def build_limiters(names: list, config: Optional[dict] = None) -> Dict[str, EndpointLimiter]:
+    """Create one limiter per endpoint name from the ``api.concurrency`` config block."""
+    config = config if config is not None else _api_config
+    limits = config.get("concurrency") or {}
+    default_queue = config.get("max_queue", 32)
+
+    limiters = {}
+    for name in names:
+        block = limits.get(name) or {}
+        limiters[name] = EndpointLimiter(
+            name,
+            max_concurrency=block.get("max_concurrency", 4),
+            max_queue=block.get("max_queue", default_queue),
+        )
+    return limiters
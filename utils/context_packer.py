@@ -0,0 +1,146 @@
+from __future__ import annotations
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from model.models import PackedContext
+from utils.config_loader import load_config
+from utils.tokens import estimate_tokens
+
+
+# end of a sentence: terminal punctuation (optionally closed by a quote/bracket) or a blank line
+SENTENCE_END = re.compile(r"(?:[.!?][\"')\]]?\s+)|(?:\n\s*\n)")
+
+# shortest shared run treated as splitter overlap rather than a coincidence
+MIN_OVERLAP_CHARS = 40
+
+SEPARATOR = "\n\n"
+
+
+def context_token_budget(config: Optional[Dict[str, Any]] = None) -> int:
+    """Tokens available for retrieved context in the QA prompt.
+
+    ``retrieval.context_max_tokens`` capped by what the selected model's ``context_window``
+    leaves after its answer (``max_tokens``), the chat history budget and the prompt itself.
+    """
+    config = config or load_config()
+    retrieval = config.get("retrieval") or {}
+    budget = int(retrieval.get("context_max_tokens", 3000))
+
+    llm_config = (config.get("llm") or {}).get(os.getenv("LLM_PROVIDER", "groq")) or {}
+    window = llm_config.get("context_window")
+    if window:
+        reserved = (
+            int(llm_config.get("max_tokens", 2048))
+            + int((config.get("chat_history") or {}).get("max_tokens", 2000))
+            + int(retrieval.get("prompt_reserve_tokens", 512))
+        )
+        budget = min(budget, int(window) - reserved)
+    return max(budget, int(retrieval.get("context_min_tokens", 256)))
+
+
+def source_id(doc: Document) -> str:
+    """Stable id for a chunk: the docstore id, else source and page."""
+    if getattr(doc, "id", None):
+        return str(doc.id)
+    md = doc.metadata or {}
+    return f"{md.get('source', 'unknown')}:{md.get('page', '')}"
+
+
+def _overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of left that is a prefix of right (0 below MIN_OVERLAP_CHARS)."""
+    probe = right[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = left.find(probe, max(0, len(left) - len(right)))
+    while start != -1:
+        if right.startswith(left[start:]):
+            return len(left) - start
+        start = left.find(probe, start + 1)
+    return 0
+
+
+def _strip_overlap(text: str, kept: Sequence[str]) -> Optional[str]:
+    """Remove what text shares with already kept chunks of the same source.
+
+    Returns None when text adds nothing. Adjacent chunks from the splitter share up to
+    chunk_overlap characters at their boundary, in either order depending on ranking.
+    """
+    for other in kept:
+        if text in other:
+            return None
+        head = _overlap(other, text)
+        if head:
+            text = text[head:]
+        tail = _overlap(text, other)
+        if tail:
+            text = text[:-tail]
+        if not text.strip():
+            return None
+    return text
+
+
+def trim_to_sentences(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens, ending on a sentence boundary when one is in range."""
+    max_chars = max(0, (max_tokens - 1) * 4)
+    if len(text) <= max_chars:
+        return text
+    window = text[:max_chars]
+    ends = [m.end() for m in SENTENCE_END.finditer(window)]
+    if ends:
+        return window[:ends[-1]].rstrip()
+    # no sentence ends in range: fall back to the last word boundary
+    return window.rsplit(None, 1)[0] if " " in window else window
+
+
+def pack_context(docs: Sequence[Document], max_tokens: int, min_fragment_tokens: int = 64) -> PackedContext:
+    """Join ranked chunks into a context of at most max_tokens.
+
+    Chunks are taken in rank order. Exact and splitter-overlap duplicates of an already
+    packed chunk from the same source are removed; the first chunk that does not fit is
+    trimmed at a sentence boundary (if at least min_fragment_tokens remain) and the rest are
+    dropped.
+    """
+    parts: List[str] = []
+    included: List[str] = []
+    kept: Dict[Any, List[str]] = {}
+    used = deduplicated = dropped = 0
+    truncated = False
+
+    for position, doc in enumerate(docs):
+        source = (doc.metadata or {}).get("source")
+        text = _strip_overlap(doc.page_content, kept.get(source, []))
+        if text is None:
+            deduplicated += 1
+            continue
+
+        separator = estimate_tokens(SEPARATOR) if parts else 0
+        cost = estimate_tokens(text) + separator
+        if used + cost > max_tokens:
+            remaining = max_tokens - used - separator
+            if remaining >= min_fragment_tokens:
+                text = trim_to_sentences(text, remaining)
+                if text.strip():
+                    parts.append(text)
+                    included.append(source_id(doc))
+                    used += estimate_tokens(text) + separator
+                    truncated = True
+            dropped = len(docs) - position - (1 if truncated else 0)
+            break
+
+        parts.append(text)
+        included.append(source_id(doc))
+        kept.setdefault(source, []).append(doc.page_content)
+        used += cost
+
+    return PackedContext(
+        text=SEPARATOR.join(parts),
+        tokens=used,
+        source_ids=included,
+        retrieved=len(docs),
+        deduplicated=deduplicated,
+        dropped=dropped,
+        truncated=truncated,
+    )
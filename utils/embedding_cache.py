@@ -0,0 +1,262 @@
+from __future__ import annotations
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.cache import text_hash
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+
+log = CustomLogger().get_logger(__name__)
+
+
+class EmbeddingCache:
+    """On-disk, content-addressed embedding cache shared by every session.
+
+    Vectors for one embedding model live in a flat float32 file (``vectors.f32``) that is
+    read through ``np.memmap``; a small SQLite index maps sha256(text) to a row number and
+    a last-used timestamp. When the vector file grows past ``max_bytes`` the least recently
+    used rows are dropped and compacted into a new file generation (``vectors.<n>.f32``).
+    A file is never rewritten in place: readers resolve rows and the generation in one
+    read transaction, so an eviction in another process cannot renumber rows under them.
+    """
+
+    def __init__(self, model_name: str, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        config = load_config().get("embedding_cache") or {}
+
+        self.model_name = model_name
+        base_dir = Path(cache_dir or os.getenv("EMBEDDING_CACHE_DIR", config.get("dir", "embedding_cache")))
+        self.cache_dir = base_dir / hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = int(max_bytes or config.get("max_bytes", 512 * 1024 * 1024))
+        self.index_path = self.cache_dir / "index.sqlite"
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        with self._connect() as conn:
+            # WAL (persistent for the file): lookups don't wait for a writer's commit or
+            # block it, so get_many has to cope with an eviction removing its file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, row INTEGER NOT NULL, last_used REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('model_name', ?)", (model_name,))
+
+        log.info("EmbeddingCache initialized.", model_name=model_name, cache_dir=str(self.cache_dir))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.index_path), timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _lookup(conn: sqlite3.Connection, keys: Sequence[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 500):
+            part = unique[i:i + 500]
+            query = f"SELECT key, row FROM entries WHERE key IN ({','.join('?' * len(part))})"
+            found.update(dict(conn.execute(query, part).fetchall()))
+        return found
+
+    @staticmethod
+    def _get_dim(conn: sqlite3.Connection) -> Optional[int]:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    @staticmethod
+    def _get_generation(conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.cache_dir / ("vectors.f32" if generation == 0 else f"vectors.{generation}.f32")
+
+    @staticmethod
+    def _read_rows(path: Path, rows: List[int], dim: int) -> np.ndarray:
+        matrix = np.memmap(path, dtype=np.float32, mode="r").reshape(-1, dim)
+        return np.array(matrix[rows], dtype=np.float32)
+
+    def _read_hits(self, conn: sqlite3.Connection, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up keys and read their vectors within one read transaction."""
+        conn.execute("BEGIN")
+        try:
+            dim = self._get_dim(conn)
+            found = self._lookup(conn, keys) if dim is not None else {}
+            if not found:
+                return {}
+            path = self._vectors_path(self._get_generation(conn))
+            vectors = self._read_rows(path, list(found.values()), dim)
+            return dict(zip(found, vectors))
+        finally:
+            conn.execute("COMMIT")
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return cached vectors aligned with texts; None where the text is not cached."""
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        if not texts:
+            return results
+
+        try:
+            keys = [text_hash(t) for t in texts]
+            for attempt in range(3):
+                try:
+                    with self._lock, self._connect() as conn:
+                        hits = self._read_hits(conn, keys)
+                        if hits:
+                            now = time.time()
+                            conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(now, k) for k in hits])
+                    break
+                except FileNotFoundError:
+                    # under WAL an eviction can commit a new generation and remove the file
+                    # our read transaction still resolves to; look up again
+                    if attempt == 2:
+                        raise
+
+            for pos, key in enumerate(keys):
+                results[pos] = hits.get(key)
+
+            hit_count = sum(r is not None for r in results)
+            self.hits += hit_count
+            self.misses += len(texts) - hit_count
+            return results
+
+        except Exception as e:
+            log.error("Failed to read from embedding cache.", error=str(e))
+            raise DocumentPortalException("Failed to read from embedding cache", e) from e
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray):
+        """Append vectors for texts not already cached, then evict if over the size budget."""
+        if not len(texts):
+            return
+
+        try:
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            keys = [text_hash(t) for t in texts]
+
+            with self._lock, self._connect() as conn:
+                # BEGIN IMMEDIATE serializes writers across worker processes
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    dim = self._get_dim(conn)
+                    if dim is None:
+                        dim = int(vectors.shape[1])
+                        conn.execute("INSERT INTO meta (name, value) VALUES ('dim', ?)", (str(dim),))
+                    elif dim != vectors.shape[1]:
+                        raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match cache dimension {dim}")
+
+                    existing = self._lookup(conn, keys)
+                    new_positions: Dict[str, int] = {}
+                    for pos, key in enumerate(keys):
+                        if key not in existing and key not in new_positions:
+                            new_positions[key] = pos
+
+                    vectors_path = self._vectors_path(self._get_generation(conn))
+                    if new_positions:
+                        start_row = (vectors_path.stat().st_size // (dim * 4)) if vectors_path.exists() else 0
+                        with open(vectors_path, "ab") as f:
+                            # drop any partial row left behind by an interrupted write
+                            f.truncate(start_row * dim * 4)
+                            f.write(vectors[list(new_positions.values())].tobytes())
+
+                        now = time.time()
+                        conn.executemany(
+                            "INSERT INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                            [(key, start_row + i, now) for i, key in enumerate(new_positions)],
+                        )
+
+                    replaced = None
+                    if vectors_path.exists() and vectors_path.stat().st_size > self.max_bytes:
+                        replaced = self._evict(conn, dim)
+
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+                if replaced is not None:
+                    # readers now resolve the new generation; ones that already mapped the
+                    # old file keep reading it until they close it
+                    replaced.unlink(missing_ok=True)
+
+        except Exception as e:
+            log.error("Failed to write to embedding cache.", error=str(e))
+            raise DocumentPortalException("Failed to write to embedding cache", e) from e
+
+    def _evict(self, conn: sqlite3.Connection, dim: int) -> Path:
+        """Keep the most recently used rows within 80% of max_bytes in a new file generation.
+
+        Runs inside the writer's transaction; returns the previous file, to be removed once
+        the transaction has committed.
+        """
+        keep_count = int(self.max_bytes * 0.8) // (dim * 4)
+        entries = conn.execute("SELECT key, row FROM entries ORDER BY last_used DESC").fetchall()
+        kept, dropped = entries[:keep_count], entries[keep_count:]
+
+        generation = self._get_generation(conn)
+        old_path, new_path = self._vectors_path(generation), self._vectors_path(generation + 1)
+        tmp_path = new_path.with_suffix(".tmp")
+        if kept:
+            self._read_rows(old_path, [row for _, row in kept], dim).tofile(tmp_path)
+        else:
+            tmp_path.write_bytes(b"")
+        os.replace(tmp_path, new_path)
+
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in dropped])
+        conn.executemany("UPDATE entries SET row = ? WHERE key = ?", [(i, k) for i, (k, _) in enumerate(kept)])
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('generation', ?)", (str(generation + 1),))
+
+        self.evictions += len(dropped)
+        log.info("Embedding cache compacted.", evicted=len(dropped), kept=len(kept), generation=generation + 1, model_name=self.model_name)
+        return old_path
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            vectors_path = self._vectors_path(self._get_generation(conn))
+        lookups = self.hits + self.misses
+        return {
+            "model_name": self.model_name,
+            "entries": entries,
+            "bytes": vectors_path.stat().st_size if vectors_path.exists() else 0,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+_CACHES: Dict[str, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """Return the shared cache for an embedding model, or None when caching is disabled."""
+    config = load_config().get("embedding_cache") or {}
+    if not config.get("enabled", True):
+        return None
+
+    with _CACHES_LOCK:
+        if model_name not in _CACHES:
+            _CACHES[model_name] = EmbeddingCache(model_name)
+        return _CACHES[model_name]
+
+
+def embedding_cache_stats() -> List[Dict[str, Any]]:
+    return [cache.stats() for cache in _CACHES.values()]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+
+log = CustomLogger().get_logger(__name__)
+
+
+class EmbeddingPipeline:
+    """Embed texts in fixed-size batches and return a float32 matrix.
+
+    Local sentence-transformer models are driven through their own batched ``encode`` on
+    the calling thread, with the model's ``encode_kwargs`` and newline handling; remote providers fan batches out over a bounded thread pool.
+    Throughput of the last run is kept in ``last_stats``.
+    """
+
+    def __init__(self, embedding_model, batch_size: Optional[int] = None, max_workers: Optional[int] = None):
+        config = load_config().get("embedding_pipeline") or {}
+
+        self.embedding_model = embedding_model
+        self.batch_size = max(1, int(batch_size or config.get("batch_size", 64)))
+        self.max_workers = max(1, int(max_workers or config.get("max_workers", 4)))
+        self.last_stats: Dict[str, Any] = {}
+
+    def _local_encoder(self):
+        """Return the underlying SentenceTransformer for local HuggingFace embeddings, if any."""
+        client = getattr(self.embedding_model, "_client", None) or getattr(self.embedding_model, "client", None)
+        return client if hasattr(client, "encode") else None
+
+    def _batches(self, texts: Sequence[str]) -> List[Sequence[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, preserving order. Returns an array of shape (len(texts), dim), float32."""
+        try:
+            start = time.perf_counter()
+            texts = list(texts)
+
+            if not texts:
+                self.last_stats = {"chunks": 0, "batches": 0, "seconds": 0.0, "chunks_per_sec": 0.0}
+                return np.zeros((0, 0), dtype=np.float32)
+
+            encoder = self._local_encoder()
+            batches = self._batches(texts)
+
+            if encoder is not None:
+                mode = "local"
+                # same preprocessing and encode_kwargs (e.g. normalize_embeddings) as
+                # HuggingFaceEmbeddings.embed_documents, so vectors match the query side
+                encode_kwargs = {"batch_size": self.batch_size, **(getattr(self.embedding_model, "encode_kwargs", None) or {})}
+                encode_kwargs.update(convert_to_numpy=True, show_progress_bar=False)
+                vectors = encoder.encode([text.replace("\n", " ") for text in texts], **encode_kwargs)
+                vectors = np.asarray(vectors, dtype=np.float32)
+            else:
+                mode = "remote"
+                workers = min(self.max_workers, len(batches))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+                    results = list(pool.map(self.embedding_model.embed_documents, batches))
+                vectors = np.asarray([v for batch in results for v in batch], dtype=np.float32)
+
+            elapsed = time.perf_counter() - start
+            self.last_stats = {
+                "mode": mode,
+                "chunks": len(texts),
+                "batches": len(batches),
+                "batch_size": self.batch_size,
+                "seconds": round(elapsed, 4),
+                "chunks_per_sec": round(len(texts) / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+            log.info("Texts embedded.", **self.last_stats)
+
+            return vectors
+
+        except Exception as e:
+            log.error("Failed to embed texts.", error=str(e))
+            raise DocumentPortalException("Failed to embed texts", e) from e
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import os
+import math
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from langchain_community.vectorstores.faiss import dependable_faiss_import  # type: ignore
+
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+
+log = CustomLogger().get_logger(__name__)
+
+# IVF k-means wants ~39 training points per cell; fewer gives poor centroids
+MIN_POINTS_PER_CELL = 39
+
+
+def _nlist(settings: Dict[str, Any], ntotal: int) -> int:
+    if settings.get("nlist"):
+        return int(settings["nlist"])
+    return max(1, min(int(4 * math.sqrt(ntotal)), ntotal // MIN_POINTS_PER_CELL))
+
+
+def _pq_m(settings: Dict[str, Any], dim: int) -> int:
+    """Largest sub-quantizer count <= pq_m that divides dim (PQ requires it)."""
+    m = min(int(settings.get("pq_m", 48)), dim)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def _flat(dim: int, settings: Dict[str, Any], ntotal: int):
+    return dependable_faiss_import().IndexFlatL2(dim)
+
+
+def _hnsw(dim: int, settings: Dict[str, Any], ntotal: int):
+    index = dependable_faiss_import().IndexHNSWFlat(dim, int(settings.get("hnsw_m", 32)))
+    index.hnsw.efConstruction = int(settings.get("hnsw_ef_construction", 40))
+    return index
+
+
+def _ivf_flat(dim: int, settings: Dict[str, Any], ntotal: int):
+    faiss = dependable_faiss_import()
+    return faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, _nlist(settings, ntotal))
+
+
+def _ivf_pq(dim: int, settings: Dict[str, Any], ntotal: int):
+    faiss = dependable_faiss_import()
+    return faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, _nlist(settings, ntotal), _pq_m(settings, dim), int(settings.get("pq_nbits", 8)))
+
+
+# index_type -> factory(dim, settings, ntotal) returning an empty, untrained index
+INDEX_FACTORIES: Dict[str, Callable[[int, Dict[str, Any], int], Any]] = {
+    "flat": _flat,
+    "hnsw": _hnsw,
+    "ivf_flat": _ivf_flat,
+    "ivf_pq": _ivf_pq,
+}
+
+# types that need k-means training before vectors can be added
+TRAINED_TYPES = {"ivf_flat", "ivf_pq"}
+
+
+def index_settings(**overrides) -> Dict[str, Any]:
+    """config.yaml `faiss_db` with FAISS_INDEX_TYPE and non-None overrides applied."""
+    config = dict(load_config().get("faiss_db") or {})
+    config["index_type"] = os.getenv("FAISS_INDEX_TYPE", config.get("index_type", "flat"))
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    config["index_type"] = str(config["index_type"]).lower()
+    if config["index_type"] not in INDEX_FACTORIES:
+        raise DocumentPortalException(f"Unsupported FAISS index type: {config['index_type']}", None)
+    return config
+
+
+def index_type_of(index) -> str:
+    """Name of a FAISS index's type as used in INDEX_FACTORIES (class name when unknown)."""
+    faiss = dependable_faiss_import()
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVFFlat):
+        return "ivf_flat"
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexFlat):
+        return "flat"
+    return type(index).__name__
+
+
+def ready_to_build(index_type: str, ntotal: int, settings: Dict[str, Any]) -> bool:
+    """True when index_type can be built over ntotal vectors (trained types wait for train_min_vectors)."""
+    if index_type not in TRAINED_TYPES:
+        return True
+    minimum = MIN_POINTS_PER_CELL
+    if index_type == "ivf_pq":
+        # each PQ codebook has 2**pq_nbits centroids to train
+        minimum *= 2 ** int(settings.get("pq_nbits", 8))
+    return ntotal >= max(int(settings.get("train_min_vectors", 10000)), minimum)
+
+
+def apply_search_params(index, settings: Dict[str, Any]):
+    """Set query-time knobs (HNSW efSearch, IVF nprobe) from settings."""
+    faiss = dependable_faiss_import()
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = int(settings.get("hnsw_ef_search", 64))
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(int(settings.get("nprobe", 16)), index.nlist)
+    return index
+
+
+def index_vectors(index) -> Optional[np.ndarray]:
+    """All stored vectors in row order, or None when the index only keeps lossy codes (PQ)."""
+    faiss = dependable_faiss_import()
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIVFPQ):
+        return None
+    if isinstance(index, faiss.IndexIVF):
+        index.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def build_index(vectors: np.ndarray, index_type: str, settings: Dict[str, Any]):
+    """Create an index of index_type, train it on vectors if needed and add them in row order."""
+    faiss = dependable_faiss_import()
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    ntotal, dim = vectors.shape
+
+    index = INDEX_FACTORIES[index_type](dim, settings, ntotal)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        # LangChain's MMR search reconstructs hit vectors by row id
+        ivf.make_direct_map()
+
+    apply_search_params(index, settings)
+    log.info("FAISS index built.", index_type=index_type, ntotal=ntotal, dim=dim)
+    return index
+
+
+def index_memory_bytes(index) -> int:
+    """Serialized size of the index, a close proxy for its resident memory."""
+    return int(dependable_faiss_import().serialize_index(index).nbytes)
@@ -1,55 +1,128 @@
-from __future__ import annotations
-import uuid
-import os
-import sys
-import json
-import hashlib
-import shutil
-from pathlib import Path
-from datetime import datetime, timezone
-from typing import Iterable, List, Optional, Dict, Any
-from utils.model_loader import ModelLoader
-from exception.custom_exception_archive import DocumentPortalException
-from logger.custom_logger import CustomLogger
-
-
-SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
-log = CustomLogger().get_logger(__name__)
-
-def _session_id(prefix: str = "session") -> str:
-    """Generate a unique session ID with the given prefix."""
-    return f"{prefix}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
-
-
-
-def save_uploaded_file(uploaded_files: Iterable, target_dir: Path) -> list[Path]:
-    """Save uploaded files (Streamlit-like) and return local paths."""
-    try:
-        target_dir.mkdir(parents=True, exist_ok=True)
-        saved_paths: list[Path] = []
-
-        for uploaded_file in uploaded_files:
-            name = getattr(uploaded_file, "name", "file")
-            ext = Path(name).suffix.lower()
-
-            if ext not in SUPPORTED_EXTENSIONS:
-                log.warning("Unsupported File skipped.", filename=str(uploaded_file))
-                continue
-
-            unique_filename = f"{uuid.uuid4().hex[:8]}{ext}"
-            output_path = target_dir / unique_filename
-
-            with open(output_path, "wb") as f:
-                if hasattr(uploaded_file, "read"):
-                    f.write(uploaded_file.read())
-                else:
-                    f.write(uploaded_file.getbuffer())
-            
-            saved_paths.append(output_path)
-            log.info("File saved.", original_filename=name, saved_as=str(output_path))
-        return saved_paths
-
-    except Exception as e:
-        log.error("Failed to save uploaded file", error=str(e))
-        raise DocumentPortalException("Failed to save uploaded file.", e) from e
-
+from __future__ import annotations
+import uuid
+import os
+import sys
+import json
+import hashlib
+import shutil
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Dict, Any
+from model.models import SavedUpload
+from utils.model_loader import ModelLoader
+from utils.config_loader import load_config
+from exception.custom_exception_archive import DocumentPortalException
+from logger.custom_logger import CustomLogger
+
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+log = CustomLogger().get_logger(__name__)
+
+def _session_id(prefix: str = "session") -> str:
+    """Generate a unique session ID with the given prefix."""
+    return f"{prefix}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the per-file or per-request size limit."""
+
+
+class UploadBudget:
+    """Byte limits for one request. Share a single budget across all files of a request."""
+
+    def __init__(self, max_file_bytes: Optional[int] = None, max_request_bytes: Optional[int] = None):
+        config = load_config().get("uploads") or {}
+        self.max_file_bytes = int(max_file_bytes or config.get("max_file_bytes", 100 * 1024 * 1024))
+        self.max_request_bytes = int(max_request_bytes or config.get("max_request_bytes", 300 * 1024 * 1024))
+        self.chunk_size = int(config.get("chunk_size_bytes", 1024 * 1024))
+        self.total_bytes = 0
+
+    def check(self, name: str, file_bytes: int, extra_bytes: int = 0):
+        if file_bytes > self.max_file_bytes:
+            raise UploadTooLargeError(f"File '{name}' exceeds the {self.max_file_bytes} byte upload limit.")
+        if self.total_bytes + extra_bytes > self.max_request_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {self.max_request_bytes} byte per-request limit.")
+
+
+def _iter_chunks(uploaded_file, chunk_size: int) -> Iterator[bytes]:
+    """Yield the upload in fixed-size chunks without reading it into memory at once."""
+    if hasattr(uploaded_file, "read"):
+        while True:
+            chunk = uploaded_file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        # Streamlit-style objects only expose the full buffer; slicing a memoryview avoids copies
+        buffer = memoryview(uploaded_file.getbuffer())
+        for start in range(0, len(buffer), chunk_size):
+            yield buffer[start:start + chunk_size]
+
+
+def stream_upload(uploaded_file, output_path: Path, budget: Optional[UploadBudget] = None) -> SavedUpload:
+    """Copy an upload to output_path chunk by chunk, hashing it on the fly.
+
+    Size limits are checked against the declared size first (when the upload reports one)
+    and again as bytes arrive, so oversized files are rejected before they are fully written.
+    A partial file is never left behind.
+    """
+    budget = budget or UploadBudget()
+    name = getattr(uploaded_file, "name", None) or output_path.name
+
+    declared = getattr(uploaded_file, "size", None)
+    if declared:
+        budget.check(name, declared, extra_bytes=declared)
+
+    digest = hashlib.sha256()
+    size = 0
+    tmp_path = output_path.with_name(output_path.name + ".part")
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in _iter_chunks(uploaded_file, budget.chunk_size):
+                size += len(chunk)
+                budget.check(name, size, extra_bytes=size)
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    budget.total_bytes += size
+    return SavedUpload(path=str(output_path), original_name=name, size_bytes=size, sha256=digest.hexdigest())
+
+
+def save_uploads(uploaded_files: Iterable, target_dir: Path, budget: Optional[UploadBudget] = None) -> List[SavedUpload]:
+    """Stream uploaded files to target_dir and return their paths, sizes and sha256 digests."""
+    try:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        budget = budget or UploadBudget()
+        saved: List[SavedUpload] = []
+
+        for uploaded_file in uploaded_files:
+            name = getattr(uploaded_file, "name", "file")
+            ext = Path(name).suffix.lower()
+
+            if ext not in SUPPORTED_EXTENSIONS:
+                log.warning("Unsupported File skipped.", filename=str(uploaded_file))
+                continue
+
+            unique_filename = f"{uuid.uuid4().hex[:8]}{ext}"
+            output_path = target_dir / unique_filename
+
+            upload = stream_upload(uploaded_file, output_path, budget)
+            saved.append(upload)
+            log.info("File saved.", original_filename=name, saved_as=str(output_path), size_bytes=upload.size_bytes, sha256=upload.sha256)
+        return saved
+
+    except UploadTooLargeError:
+        raise
+    except Exception as e:
+        log.error("Failed to save uploaded file", error=str(e))
+        raise DocumentPortalException("Failed to save uploaded file.", e) from e
+
+
+def save_uploaded_file(uploaded_files: Iterable, target_dir: Path) -> list[Path]:
+    """Save uploaded files (Streamlit-like) and return local paths."""
+    return [Path(upload.path) for upload in save_uploads(uploaded_files, target_dir)]
@@ -0,0 +1,623 @@
+from __future__ import annotations
+import os
+import re
+import json
+import pickle
+import hashlib
+import shutil
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.docstore.base import AddableMixin, Docstore  # type: ignore
+from langchain_community.docstore.in_memory import InMemoryDocstore  # type: ignore
+from langchain_community.vectorstores import FAISS  # type: ignore
+from langchain_community.vectorstores.faiss import dependable_faiss_import  # type: ignore
+
+from utils.faiss_index import apply_search_params, index_settings
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+log = CustomLogger().get_logger(__name__)
+
+# (faiss_row, doc_id, fingerprint, page_content, metadata)
+ChunkRow = Tuple[int, str, str, str, Dict[str, Any]]
+
+_OFFSET = np.dtype("<i8")
+_CODE = np.dtype("<i4")
+_FP_ENTRY = np.dtype([("hash", "<u8"), ("row", "<i8")])
+_FP_RUN = re.compile(r"^fingerprint-(\d+)-(\d+)\.idx$")
+
+
+def _fsync_append(path: Path, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fingerprint_hashes(fingerprints: Sequence[str]) -> np.ndarray:
+    return np.array([int.from_bytes(hashlib.blake2b(fp.encode("utf-8"), digest_size=8).digest(), "little")
+                     for fp in fingerprints], dtype=_FP_ENTRY["hash"])
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class _StringColumn:
+    """Append-only strings: ``<name>.bin`` holds the UTF-8 bytes back to back and
+    ``<name>.off`` the int64 start offset of every value plus the end of the last one,
+    so value i is ``bin[off[i]:off[i + 1]]`` - two positioned reads, whatever the row."""
+
+    def __init__(self, directory: Path, name: str):
+        self.data_path = directory / f"{name}.bin"
+        self.offsets_path = directory / f"{name}.off"
+        if not self.offsets_path.exists():
+            self.data_path.touch()
+            _write_atomic(self.offsets_path, np.zeros(1, dtype=_OFFSET).tobytes())
+        self._data_fd = os.open(self.data_path, os.O_RDONLY)
+        self._offsets_fd = os.open(self.offsets_path, os.O_RDONLY)
+
+    def close(self):
+        os.close(self._data_fd)
+        os.close(self._offsets_fd)
+
+    def _reopen(self):
+        self.close()
+        self._data_fd = os.open(self.data_path, os.O_RDONLY)
+        self._offsets_fd = os.open(self.offsets_path, os.O_RDONLY)
+
+    def _offset(self, row: int) -> int:
+        return int(np.frombuffer(os.pread(self._offsets_fd, _OFFSET.itemsize, row * _OFFSET.itemsize), dtype=_OFFSET)[0])
+
+    def get(self, row: int) -> str:
+        start, end = np.frombuffer(os.pread(self._offsets_fd, 2 * _OFFSET.itemsize, row * _OFFSET.itemsize), dtype=_OFFSET)
+        return os.pread(self._data_fd, int(end - start), int(start)).decode("utf-8")
+
+    def iter(self, rows: int) -> Iterator[str]:
+        offsets = np.fromfile(self.offsets_path, dtype=_OFFSET, count=rows + 1)
+        with open(self.data_path, "rb") as f:
+            for size in np.diff(offsets):
+                yield f.read(int(size)).decode("utf-8")
+
+    def append(self, rows: int, values: Sequence[str]):
+        """Append values after the first ``rows`` committed ones (data first, then offsets)."""
+        encoded = [v.encode("utf-8") for v in values]
+        end = self._offset(rows)
+        offsets = end + np.cumsum([len(b) for b in encoded], dtype=_OFFSET)
+        _fsync_append(self.data_path, b"".join(encoded))
+        _fsync_append(self.offsets_path, offsets.astype(_OFFSET).tobytes())
+
+    def truncate(self, rows: int):
+        """Cut the column back to its first rows values (drops any uncommitted tail)."""
+        end = self._offset(rows)
+        os.truncate(self.data_path, end)
+        os.truncate(self.offsets_path, (rows + 1) * _OFFSET.itemsize)
+
+    def rewrite(self, values: Sequence[str]):
+        encoded = [v.encode("utf-8") for v in values]
+        offsets = np.concatenate([[0], np.cumsum([len(b) for b in encoded])]).astype(_OFFSET)
+        _write_atomic(self.data_path, b"".join(encoded))
+        _write_atomic(self.offsets_path, offsets.tobytes())
+        self._reopen()
+
+
+class ChunkStore:
+    """Columnar, append-only store for the chunks behind a FAISS index, addressed by row.
+
+    ``<index_name>.chunks/`` holds one column per field: chunk text, docstore id and
+    fingerprint as blob + offsets pairs, and metadata dictionary-encoded (an int32 code per
+    row into a column of distinct metadata values, since chunks of a page share theirs).
+    Fetching a row is a few positioned reads, so loading never touches the whole corpus.
+
+    ``manifest.json`` records the committed row count. An append writes every column
+    first and the manifest last, so a crash leaves either all or none of a batch; bytes
+    past the committed rows are ignored by readers and cut off when a writer opens.
+
+    Dedup lookups go through ``fingerprint-<start>-<end>.idx`` runs: (hash, row) entries for
+    rows start..end-1 sorted by a 64-bit hash of the fingerprint. Each append writes a run
+    for its own rows, and the last two runs are merged while the earlier is no larger, so
+    there are O(log n) runs and a probe is a binary search per run for the incoming keys.
+    """
+
+    FORMAT = "columnar-v1"
+
+    def __init__(self, path: str | Path, read_only: bool = False):
+        self.path = Path(path)
+        self.manifest_path = self.path / "manifest.json"
+        self.read_only = read_only
+        self._lock = threading.Lock()
+
+        if not read_only:
+            self.path.mkdir(parents=True, exist_ok=True)
+        elif not self.exists(self.path):
+            raise FileNotFoundError(f"Chunk store not found: {self.path}")
+
+        manifest = json.loads(self.manifest_path.read_text(encoding="utf-8")) if self.manifest_path.exists() else {}
+        if manifest.get("format", self.FORMAT) != self.FORMAT:
+            raise DocumentPortalException(f"Unsupported chunk store format: {manifest.get('format')}", None)
+        self.rows = int(manifest.get("rows", 0))
+        self._meta: Dict[str, str] = manifest.get("meta", {})
+
+        self._text = _StringColumn(self.path, "text")
+        self._doc_ids = _StringColumn(self.path, "doc_id")
+        self._fingerprints = _StringColumn(self.path, "fingerprint")
+        self._metadata_values = _StringColumn(self.path, "metadata_values")
+        self._codes_path = self.path / "metadata.codes"
+        if not read_only:
+            self._codes_path.touch(exist_ok=True)
+        self._codes_fd = os.open(self._codes_path, os.O_RDONLY)
+        self._metadata_count = int(manifest.get("metadata_values", 0))
+
+        self._metadata_cache: Dict[int, Dict[str, Any]] = {}
+        self._metadata_codes: Optional[Dict[str, int]] = None
+
+        if not read_only:
+            self._truncate_columns(self.rows, self._metadata_count)
+
+    @staticmethod
+    def exists(path: str | Path) -> bool:
+        """True once a store at path has committed (readers switch over on the manifest)."""
+        return (Path(path) / "manifest.json").exists()
+
+    def _columns(self) -> List[_StringColumn]:
+        return [self._text, self._doc_ids, self._fingerprints]
+
+    def close(self):
+        with self._lock:
+            for column in self._columns() + [self._metadata_values]:
+                column.close()
+            os.close(self._codes_fd)
+
+    def _commit(self):
+        manifest = {"format": self.FORMAT, "rows": self.rows, "metadata_values": self._metadata_count, "meta": self._meta}
+        _write_atomic(self.manifest_path, json.dumps(manifest).encode("utf-8"))
+
+    def _truncate_columns(self, rows: int, metadata_count: int):
+        for column in self._columns():
+            column.truncate(rows)
+        self._metadata_values.truncate(metadata_count)
+        os.truncate(self._codes_path, rows * _CODE.itemsize)
+        for start, end, path in self._fingerprint_runs():
+            if end > rows:
+                path.unlink(missing_ok=True)
+
+    def get_meta(self, name: str) -> Optional[str]:
+        return self._meta.get(name)
+
+    def set_meta(self, name: str, value: str):
+        with self._lock:
+            self._meta[name] = value
+            self._commit()
+
+    def count(self) -> int:
+        return self.rows
+
+    def _fingerprint_runs(self) -> List[Tuple[int, int, Path]]:
+        """(start_row, end_row, file) of the fingerprint runs, by start row (longest first)."""
+        found = []
+        for path in self.path.iterdir():
+            match = _FP_RUN.match(path.name)
+            if match:
+                found.append((int(match[1]), int(match[2]), path))
+        return sorted(found, key=lambda r: (r[0], -r[1]))
+
+    def _fingerprint_chain(self) -> List[Tuple[int, int, Path]]:
+        """Runs covering rows 0..n-1 contiguously; runs superseded by a merge are skipped."""
+        chain, covered = [], 0
+        for start, end, path in self._fingerprint_runs():
+            if start == covered and end > start and end <= self.rows:
+                chain.append((start, end, path))
+                covered = end
+        return chain
+
+    def _write_fingerprint_run(self, start: int, entries: np.ndarray, end: int) -> Path:
+        entries = np.sort(entries, order="hash", kind="stable")
+        path = self.path / f"fingerprint-{start:012d}-{end:012d}.idx"
+        _write_atomic(path, entries.tobytes())
+        return path
+
+    def _append_fingerprint_run(self, start: int, fingerprints: Sequence[str]):
+        rows = np.arange(start, start + len(fingerprints), dtype=_FP_ENTRY["row"])
+        keep = np.array([bool(fp) for fp in fingerprints], dtype=bool)
+        entries = np.empty(int(keep.sum()), dtype=_FP_ENTRY)
+        entries["hash"] = _fingerprint_hashes([fp for fp in fingerprints if fp])
+        entries["row"] = rows[keep]
+        self._write_fingerprint_run(start, entries, start + len(fingerprints))
+
+    def _merge_fingerprint_runs(self):
+        runs = self._fingerprint_chain()
+        for run in set(self._fingerprint_runs()) - set(runs):
+            run[2].unlink(missing_ok=True)  # superseded by a merge that was interrupted before cleanup
+        while len(runs) >= 2 and runs[-2][1] - runs[-2][0] <= runs[-1][1] - runs[-1][0]:
+            (start, _, first), (_, end, second) = runs[-2:]
+            entries = np.concatenate([np.fromfile(first, dtype=_FP_ENTRY), np.fromfile(second, dtype=_FP_ENTRY)])
+            runs[-2:] = [(start, end, self._write_fingerprint_run(start, entries, end))]
+            first.unlink(missing_ok=True)
+            second.unlink(missing_ok=True)
+
+    def _fingerprint_index(self) -> List[Tuple[int, int, Path]]:
+        """The run chain, first indexing rows no run covers (stores written before the runs existed)."""
+        chain = self._fingerprint_chain()
+        covered = chain[-1][1] if chain else 0
+        if covered < self.rows:
+            fingerprints = list(self._fingerprints.iter(self.rows))[covered:]
+            self._append_fingerprint_run(covered, fingerprints)
+            self._merge_fingerprint_runs()
+            chain = self._fingerprint_chain()
+        return chain
+
+    def existing_fingerprints(self, keys: Sequence[str]) -> Set[str]:
+        """Return the subset of keys already stored, probing the fingerprint runs for just these keys."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return set()
+        hashes = _fingerprint_hashes(keys)
+        found: Set[str] = set()
+        with self._lock:
+            for _, _, path in self._fingerprint_index():
+                if path.stat().st_size == 0:
+                    continue
+                entries = np.memmap(path, dtype=_FP_ENTRY, mode="r")
+                lo = np.searchsorted(entries["hash"], hashes, side="left")
+                hi = np.searchsorted(entries["hash"], hashes, side="right")
+                for key, start, end in zip(keys, lo, hi):
+                    # a 64-bit hash match is confirmed against the stored fingerprint
+                    if key not in found and any(self._fingerprints.get(int(row)) == key for row in entries["row"][start:end]):
+                        found.add(key)
+                del entries
+        return found
+
+    def _metadata_code(self, md: Dict[str, Any], pending: List[str]) -> int:
+        if self._metadata_codes is None:
+            self._metadata_codes = {value: code for code, value in enumerate(self._metadata_values.iter(self._metadata_count))}
+        value = json.dumps(md, ensure_ascii=False, sort_keys=True, default=str)
+        code = self._metadata_codes.get(value)
+        if code is None:
+            code = self._metadata_codes[value] = self._metadata_count + len(pending)
+            pending.append(value)
+        return code
+
+    def append(self, rows: Sequence[ChunkRow]):
+        """Append rows, which must continue the store (row == count(), count() + 1, ...)."""
+        if not rows:
+            return
+        with self._lock:
+            if [row for row, *_ in rows] != list(range(self.rows, self.rows + len(rows))):
+                raise ValueError(f"Chunk store is append-only: expected rows from {self.rows}")
+
+            new_values: List[str] = []
+            codes = np.array([self._metadata_code(md, new_values) for *_, md in rows], dtype=_CODE)
+            try:
+                self._text.append(self.rows, [text for _, _, _, text, _ in rows])
+                self._doc_ids.append(self.rows, [doc_id for _, doc_id, _, _, _ in rows])
+                self._fingerprints.append(self.rows, [fp for _, _, fp, _, _ in rows])
+                self._metadata_values.append(self._metadata_count, new_values)
+                _fsync_append(self._codes_path, codes.tobytes())
+                self._append_fingerprint_run(self.rows, [fp for _, _, fp, _, _ in rows])
+            except Exception:
+                self._metadata_codes = None
+                self._truncate_columns(self.rows, self._metadata_count)
+                raise
+
+            self.rows += len(rows)
+            self._metadata_count += len(new_values)
+            self._commit()
+            self._merge_fingerprint_runs()
+
+    def update_fingerprints(self, updates: Sequence[Tuple[str, int]]):
+        """Apply (fingerprint, row) updates by rewriting the fingerprint column (runs are rebuilt on the next probe)."""
+        with self._lock:
+            fingerprints = list(self._fingerprints.iter(self.rows))
+            for fp, row in updates:
+                fingerprints[row] = fp
+            self._fingerprints.rewrite(fingerprints)
+            for _, _, path in self._fingerprint_runs():
+                path.unlink(missing_ok=True)
+
+    def truncate(self, ntotal: int) -> int:
+        """Drop rows with no vector in the index (left behind by an interrupted ingest)."""
+        with self._lock:
+            removed = max(0, self.rows - ntotal)
+            if removed or not self.manifest_path.exists():
+                self.rows -= removed
+                self._truncate_columns(self.rows, self._metadata_count)
+                self._commit()
+            return removed
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        code = int(np.frombuffer(os.pread(self._codes_fd, _CODE.itemsize, row * _CODE.itemsize), dtype=_CODE)[0])
+        md = self._metadata_cache.get(code)
+        if md is None:
+            md = self._metadata_cache[code] = json.loads(self._metadata_values.get(code))
+        return dict(md)
+
+    def doc_id(self, row: int) -> Optional[str]:
+        if not 0 <= row < self.rows:
+            return None
+        with self._lock:
+            return self._doc_ids.get(row)
+
+    def get_row(self, row: int) -> Document:
+        with self._lock:
+            return Document(id=self._doc_ids.get(row), page_content=self._text.get(row), metadata=self._metadata(row))
+
+    def iter_rows(self, limit: Optional[int] = None) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+        """Yield (row, doc_id, page_content, metadata) ordered by row, optionally only rows < limit."""
+        rows = self.rows if limit is None else min(limit, self.rows)
+        codes = np.fromfile(self._codes_path, dtype=_CODE, count=rows)
+        values = [json.loads(v) for v in self._metadata_values.iter(self._metadata_count)]
+        for row, (doc_id, text) in enumerate(zip(self._doc_ids.iter(rows), self._text.iter(rows))):
+            yield row, doc_id, text, dict(values[codes[row]])
+
+
+class RowId(str):
+    """A docstore id that also carries its ChunkStore row.
+
+    ChunkRowIds hands these out, so ChunkStoreDocstore fetches the row directly instead of
+    looking the id up; the value is the stored id and compares equal to it.
+    """
+
+    def __new__(cls, doc_id: str, row: int):
+        value = super().__new__(cls, doc_id)
+        value.row = row
+        return value
+
+
+class ChunkStoreDocstore(Docstore, AddableMixin):
+    """LangChain docstore that reads chunks from the ChunkStore on demand.
+
+    Only the hits of a search are fetched, so a loaded index does not hold every chunk text.
+    Stored chunks are resolved by the row carried in their RowId (there is no id -> row
+    index to build); documents added in this process (an ingest) are kept in memory until
+    the next load.
+    """
+
+    def __init__(self, store: ChunkStore):
+        self.store = store
+        self._added: Dict[str, Document] = {}
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        self._added.update(texts)
+
+    def delete(self, ids: List) -> None:
+        raise NotImplementedError("ChunkStoreDocstore is append-only")
+
+    def search(self, search: str) -> Union[str, Document]:
+        doc = self._added.get(search)
+        row = getattr(search, "row", None)
+        if doc is None and row is not None and 0 <= row < self.store.rows:
+            doc = self.store.get_row(row)
+        return doc if doc is not None else f"ID {search} not found."
+
+
+class ChunkRowIds(MutableMapping):
+    """FAISS row -> docstore id (a RowId), read from the ChunkStore on demand.
+
+    Rows at or past ``ntotal`` (written by an ingest still in flight) are not visible;
+    rows assigned in this process are kept in memory.
+    """
+
+    def __init__(self, store: ChunkStore, ntotal: int):
+        self.store = store
+        self.ntotal = ntotal
+        self._added: Dict[int, str] = {}
+
+    def __getitem__(self, row: int) -> str:
+        row = int(row)
+        if row in self._added:
+            return self._added[row]
+        doc_id = self.store.doc_id(row) if 0 <= row < self.ntotal else None
+        if doc_id is None:
+            raise KeyError(row)
+        return RowId(doc_id, row)
+
+    def __setitem__(self, row: int, doc_id: str):
+        self._added[int(row)] = doc_id
+
+    def __delitem__(self, row: int):
+        raise NotImplementedError("ChunkRowIds is append-only")
+
+    def __iter__(self) -> Iterator[int]:
+        yield from range(self.ntotal)
+        yield from (row for row in self._added if row >= self.ntotal)
+
+    def __len__(self) -> int:
+        return self.ntotal + sum(1 for row in self._added if row >= self.ntotal)
+
+
+class ReadOnlyFAISS(FAISS):
+    """FAISS store over a memory-mapped index.
+
+    faiss aborts the process when a mapped index is written to, so writes are refused here
+    with an exception instead; ingest through FaissManager, which loads a writable copy.
+    """
+
+    def _refuse(self, *args, **kwargs):
+        raise DocumentPortalException("Vector store is memory-mapped and read-only", None)
+
+    async def _arefuse(self, *args, **kwargs):
+        self._refuse()
+
+    add_texts = add_embeddings = add_documents = merge_from = delete = _refuse
+    aadd_texts = aadd_documents = _arefuse
+
+
+def store_path(index_dir: str | Path, index_name: str = "index") -> Path:
+    return Path(index_dir) / f"{index_name}.chunks"
+
+
+def convert_legacy_store(index_dir: str | Path, index_name: str = "index") -> int:
+    """Move a pickled docstore (``index.pkl``) into the columnar store.
+
+    The new store is written next to the old one and renamed into place, then the old files
+    are removed, so readers see one or the other. Chunks from a pickle get no fingerprint;
+    FaissManager computes them on its next load. Returns the rows converted (0 if nothing
+    needed converting).
+    """
+    index_dir = Path(index_dir)
+    pkl_path = index_dir / f"{index_name}.pkl"
+    target = store_path(index_dir, index_name)
+    if not pkl_path.exists():
+        return 0
+
+    with open(pkl_path, "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)  # only if you trust the index
+    rows: List[ChunkRow] = []
+    for position, doc_id in sorted(index_to_docstore_id.items()):
+        doc = docstore.search(doc_id)
+        rows.append((position, doc_id, "", doc.page_content, doc.metadata or {}))
+    legacy_files = [pkl_path, index_dir / "ingested_metadata.json"]
+
+    tmp_path = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    store = ChunkStore(tmp_path)
+    try:
+        store.truncate(0)
+        store.append(rows)
+    finally:
+        store.close()
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp_path, target)
+    for path in legacy_files:
+        path.unlink(missing_ok=True)
+
+    log.info("Chunk store converted to columnar format.", index_dir=str(index_dir), source=legacy_files[0].name, rows=len(rows))
+    return len(rows)
+
+
+@contextmanager
+def index_write_lock(index_dir: str | Path):
+    """Exclusive lock on an index directory, across threads and worker processes.
+
+    Writers hold it from loading the index to persisting it, so two ingests never append
+    from the same ntotal. Readers do not take it; they only see committed files.
+    """
+    path = Path(index_dir) / ".write.lock"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_index_atomic(index, path: str | Path):
+    """Serialize a FAISS index to a temp file, fsync it and rename it over path."""
+    faiss = dependable_faiss_import()
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    data = faiss.serialize_index(index)
+    with open(tmp_path, "wb") as f:
+        f.write(data.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def load_vector_store(index_dir: str | Path, embeddings, index_name: str = "index",
+                      mmap: Optional[bool] = None, lazy: Optional[bool] = None) -> FAISS:
+    """Load a FAISS vector store from index_dir.
+
+    Uses the columnar chunk store when present and falls back to LangChain's pickled
+    ``index.pkl`` for indexes written before it existed (until
+    FaissManager or convert_legacy_store migrates them). Read-only: rows without a vector
+    (an ingest in flight or interrupted) are ignored rather than deleted.
+
+    mmap (default `faiss_db.mmap`) maps index.faiss read-only instead of copying it, so
+    workers share its pages through the OS page cache; such an index cannot be added to.
+    lazy (default `faiss_db.lazy_docstore`) fetches chunk texts from the chunk store per hit
+    instead of loading them all.
+    """
+    try:
+        index_dir = Path(index_dir)
+        db_path = store_path(index_dir, index_name)
+        settings = index_settings()
+        mmap = settings.get("mmap", True) if mmap is None else mmap
+        lazy = settings.get("lazy_docstore", True) if lazy is None else lazy
+
+        if (index_dir / f"{index_name}.pkl").exists() or not ChunkStore.exists(db_path):
+            vector_store = FAISS.load_local(
+                str(index_dir),
+                embeddings,
+                index_name=index_name,
+                allow_dangerous_deserialization=True,  # only if you trust the index
+            )
+            apply_search_params(vector_store.index, settings)
+            return vector_store
+
+        faiss = dependable_faiss_import()
+        flags = 0
+        if mmap:
+            # IO_FLAG_MMAP_IFC maps flat / HNSW storage and IVF lists alike (older faiss: IVF only)
+            flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+        index = faiss.read_index(str(index_dir / f"{index_name}.faiss"), flags)
+        apply_search_params(index, settings)
+        vector_store_cls = ReadOnlyFAISS if mmap else FAISS
+
+        store = ChunkStore(db_path, read_only=True)
+        if lazy:
+            # the store stays open for the life of the vector store
+            return vector_store_cls(
+                embedding_function=embeddings,
+                index=index,
+                docstore=ChunkStoreDocstore(store),
+                index_to_docstore_id=ChunkRowIds(store, index.ntotal),
+            )
+
+        try:
+            docs: Dict[str, Document] = {}
+            index_to_docstore_id: Dict[int, str] = {}
+            for row, doc_id, text, md in store.iter_rows(limit=index.ntotal):
+                docs[doc_id] = Document(id=doc_id, page_content=text, metadata=md)
+                index_to_docstore_id[row] = doc_id
+        finally:
+            store.close()
+
+        if len(index_to_docstore_id) != index.ntotal:
+            log.warning("Chunk store and FAISS index row counts differ.", index_dir=str(index_dir), rows=len(index_to_docstore_id), ntotal=index.ntotal)
+
+        return vector_store_cls(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore(docs),
+            index_to_docstore_id=index_to_docstore_id,
+        )
+
+    except Exception as e:
+        log.error("Failed to load vector store.", index_dir=str(index_dir), error=str(e))
+        raise DocumentPortalException("Failed to load vector store", e) from e
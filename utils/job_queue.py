@@ -0,0 +1,239 @@
+from __future__ import annotations
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Type
+
+from model.models import JobRecord, JobStatus
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+
+log = CustomLogger().get_logger(__name__)
+
+
+def _process_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """Best-effort check that the worker process named by a record's owner still runs.
+
+    Owners on other hosts, and any owner on Windows (where os.kill terminates), are
+    assumed alive. A record naming this very process is not, since live ones are in memory.
+    """
+    if not owner:
+        return False
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or os.name == "nt":
+        return True
+    if int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """Keeps job records in memory and mirrors them to ``<dir>/<job_id>.json`` so any worker
+    process can answer a status poll. Finished jobs are purged after ttl_seconds."""
+
+    def __init__(self, jobs_dir: str, ttl_seconds: float = 3600):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = float(ttl_seconds)
+        self._records: Dict[str, JobRecord] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def save(self, record: JobRecord):
+        with self._lock:
+            self._records[record.job_id] = record
+            path = self._path(record.job_id)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(record.model_dump_json(), encoding="utf-8")
+            os.replace(tmp_path, path)
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            record = self._records.get(job_id)
+        if record is None:
+            path = self._path(job_id)
+            if not path.exists():
+                return None
+            record = JobRecord.model_validate_json(path.read_text(encoding="utf-8"))
+        return None if self._expired(record) else record
+
+    def _expired(self, record: JobRecord) -> bool:
+        return record.finished_at is not None and time.time() - record.finished_at > self.ttl_seconds
+
+    def purge_expired(self) -> int:
+        """Delete the finished jobs of this process older than ttl_seconds.
+
+        Expiry is tracked on the in-memory records, so no job file is read; records left by
+        exited workers are cleaned up by reap_orphaned when the next JobManager starts.
+        """
+        with self._lock:
+            expired = [job_id for job_id, record in self._records.items() if self._expired(record)]
+            for job_id in expired:
+                del self._records[job_id]
+        for job_id in expired:
+            self._path(job_id).unlink(missing_ok=True)
+        if expired:
+            log.info("Expired jobs purged.", removed=len(expired))
+        return len(expired)
+
+    def reap_orphaned(self) -> int:
+        """Clean up after worker processes that have exited.
+
+        A crashed or restarted worker leaves its jobs "running" forever, and nothing purges
+        its finished ones; this runs when a JobManager starts, marking the former as failed
+        so their pollers get an answer and deleting expired records.
+        """
+        reaped = purged = 0
+        for path in self.jobs_dir.glob("*.json"):
+            try:
+                record = JobRecord.model_validate_json(path.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            with self._lock:
+                if record.job_id in self._records:
+                    continue
+            if self._expired(record):
+                path.unlink(missing_ok=True)
+                purged += 1
+                continue
+            if record.status not in (JobStatus.PENDING, JobStatus.RUNNING) or _owner_alive(record.owner):
+                continue
+            record.status = JobStatus.FAILED
+            record.error = "Job interrupted: the worker process running it exited."
+            record.finished_at = time.time()
+            self.save(record)
+            reaped += 1
+        if reaped:
+            log.warning("Orphaned jobs marked failed.", reaped=reaped)
+        if purged:
+            log.info("Expired jobs purged.", removed=purged)
+        return reaped
+
+
+class JobContext:
+    """Handed to a job function so it can report progress while it runs."""
+
+    def __init__(self, record: JobRecord, store: JobStore):
+        self._record = record
+        self._store = store
+
+    def update(self, stage: Optional[str] = None, pages_parsed: int = 0, llm_calls_done: int = 0):
+        """Set the current stage and add to the page / LLM call counters."""
+        progress = self._record.progress
+        if stage is not None:
+            progress.stage = stage
+        progress.pages_parsed += pages_parsed
+        progress.llm_calls_done += llm_calls_done
+        self._store.save(self._record)
+
+
+class JobBackend(ABC):
+    """Executes submitted callables. Subclass to plug in another executor."""
+
+    @abstractmethod
+    def submit(self, func: Callable[[], None]):
+        ...
+
+    def shutdown(self):
+        pass
+
+
+class ThreadPoolJobBackend(JobBackend):
+    """Runs jobs on a bounded in-process thread pool."""
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="job")
+
+    def submit(self, func: Callable[[], None]):
+        self._pool.submit(func)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+class InlineJobBackend(JobBackend):
+    """Runs each job synchronously on submit; a local stand-in for development and tests."""
+
+    def __init__(self, max_workers: int = 1):
+        pass
+
+    def submit(self, func: Callable[[], None]):
+        func()
+
+
+JOB_BACKENDS: Dict[str, Type[JobBackend]] = {
+    "thread": ThreadPoolJobBackend,
+    "inline": InlineJobBackend,
+}
+
+
+class JobManager:
+    """Submit long-running work and track it by job id."""
+
+    def __init__(self, backend: Optional[JobBackend] = None, store: Optional[JobStore] = None):
+        config = load_config().get("jobs") or {}
+
+        if backend is None:
+            backend_name = os.getenv("JOB_BACKEND", config.get("backend", "thread"))
+            if backend_name not in JOB_BACKENDS:
+                raise DocumentPortalException(f"Unsupported job backend: {backend_name}", None)
+            backend = JOB_BACKENDS[backend_name](max_workers=config.get("max_workers", 2))
+
+        self.backend = backend
+        self.store = store or JobStore(
+            os.getenv("JOBS_DIR", config.get("dir", "data/jobs")),
+            ttl_seconds=config.get("ttl_seconds", 3600),
+        )
+        self.store.reap_orphaned()
+
+    def submit(self, kind: str, func: Callable[[JobContext], Any]) -> JobRecord:
+        """Queue func(ctx) and return its pending record immediately."""
+        self.store.purge_expired()
+
+        record = JobRecord(job_id=uuid.uuid4().hex, kind=kind, created_at=time.time(), owner=_process_owner())
+        self.store.save(record)
+
+        def _run():
+            record.status = JobStatus.RUNNING
+            record.started_at = time.time()
+            self.store.save(record)
+            try:
+                record.result = func(JobContext(record, self.store))
+                record.status = JobStatus.SUCCEEDED
+                record.progress.stage = "done"
+            except Exception as e:
+                log.error("Job failed.", job_id=record.job_id, kind=kind, error=str(e))
+                record.status = JobStatus.FAILED
+                record.error = str(e)
+            finally:
+                record.finished_at = time.time()
+                self.store.save(record)
+                log.info("Job finished.", job_id=record.job_id, kind=kind, status=record.status.value,
+                         seconds=round(record.finished_at - record.started_at, 3))
+
+        self.backend.submit(_run)
+        log.info("Job submitted.", job_id=record.job_id, kind=kind)
+        return record
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        return self.store.get(job_id)
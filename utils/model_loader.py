@@ -1,159 +1,259 @@
-import os
-import sys
-from dotenv import load_dotenv
-from utils.config_loader import load_config
-from .config_loader import load_config
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_openai import AzureOpenAIEmbeddings
-from langchain_openai import AzureChatOpenAI
-
-from logger.custom_logger import CustomLogger
-from exception.custom_exception import DocumentPortalException
-log=CustomLogger().get_logger(__name__)
-
-
-class ModelLoader:
-    """A class to load and manage different language models and embeddings based on configuration."""
-
-    def __init__(self):
-        load_dotenv()
-        self._validate_env()
-        self.config = load_config()
-        log.info("Configuration loaded successfully.", confing_keys=list(self.config.keys()))
-
-    def _validate_env(self):
-        """Validate required environment variables.
-        Ensures that all necessary environment variables are set.
-        """
-        required_vars = ["GOOGLE_API_KEY", "GROQ_API_KEY", "AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_DEPLOYMENT_NAME"]
-
-        self.api_keys = {key:os.getenv(key) for key in required_vars}
-
-        missing_vars = [key for key, value in self.api_keys.items() if not value]
-
-        if missing_vars:
-            log.error(f"Missing required environment variables: {', '.join(missing_vars)}")
-            raise DocumentPortalException("Missing required environment variables", sys)
-        
-        log.info("All Environment variables are set properly.", available_keys=[key for key in self.api_keys])
-
- 
-
-    def load_embeddings(self):
-        """Load embeddings model based on configuration."""
-        try:
-            log.info("Loading embeddings model...")
-            self.embedding_block = self.config["embedding_model"]
-
-            print("self.embedding_block", self.embedding_block)
-            embedding_provider_key = os.getenv("EMBEDDING_PROVIDER", "transformer")
-
-            if embedding_provider_key not in self.embedding_block:
-                log.error(f"Embedding Provider not found in embedding_model configuration", provider_key=embedding_provider_key)
-                raise DocumentPortalException(f"Embedding Provider 'not found in embedding_model configuration", sys)
-            
-            embedding_config = self.embedding_block[embedding_provider_key]
-            provider = embedding_config.get("provider")
-            model_name = embedding_config.get("model_name")
-
-            log.info(f"Selected Embedding : ", provider=provider, model_name=model_name)
-
-            if provider == "google":
-                embeddings = GoogleGenerativeAIEmbeddings(
-                    model_name=model_name,
-                    )
-                return embeddings
-            
-            elif provider == "huggingface":
-                embeddings = HuggingFaceEmbeddings(
-                    model_name=model_name,
-                    )
-                return embeddings
-            
-            elif provider == "azure_openai":
-                embeddings = AzureOpenAIEmbeddings(
-                    model=model_name,
-                    api_key=self.api_keys["AZURE_OPENAI_API_KEY"],
-                    endpoint=self.api_keys["AZURE_OPENAI_ENDPOINT"],
-                    deployment_name=self.api_keys["AZURE_OPENAI_DEPLOYMENT_NAME"]
-                )
-                return embeddings
-            else:
-                log.error(f"Unsupported embedding provider: ", provider=provider)
-                raise DocumentPortalException(f"Unsupported embedding provider: {provider}", sys)
-                
-
-        except Exception as e:
-            log.error(f"Error loading embeddings:", error=str(e))
-            raise DocumentPortalException("failed to load embeddings model", sys)
-
-    def load_llm(self):
-        """ Load language model based on configuration."""
-
-        try:
-            llm_block = self.config["llm"]
-
-            log.info("Loading LLM model...")
-
-            provider_key = os.getenv("LLM_PROVIDER", "groq")
-
-            if provider_key not in llm_block:
-                log.error(f"LLM Provider not found in llm configuration", provider_key=provider_key)
-                raise DocumentPortalException(f"LLM Provider 'not found in llm configuration", sys)
-            
-            llm_config = llm_block[provider_key]
-            provider = llm_config.get("provider")
-            model_name = llm_config.get("model_name")
-            temperature = llm_config.get("temperature", 0.2)
-            max_tokens = llm_config.get("max_tokens", 2048)
-
-            log.info(f"Selected LLM : ", provider=provider, model_name=model_name, temperature=temperature, max_tokens=max_tokens)
-
-            if provider == "groq":
-                llm = ChatGroq(
-                    model=model_name,
-                    api_key=self.api_keys["GROQ_API_KEY"],
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                return llm
-            elif provider == "google":
-                llm = ChatGoogleGenerativeAI(
-                    model=model_name,
-                    temperature=temperature,
-                    max_output_tokens=max_tokens
-                )
-                return llm
-            elif provider == "azure_openai":
-                llm = AzureChatOpenAI(
-                    model=model_name,
-                    api_key=self.api_keys["AZURE_OPENAI_API_KEY"],
-                    endpoint=self.api_keys["AZURE_OPENAI_ENDPOINT"],
-                    deployment_name=self.api_keys["AZURE_OPENAI_DEPLOYMENT_NAME"],
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                return llm
-            
-            else:
-                log.error(f"Unsupported LLM provider: ", provider=provider)
-                raise DocumentPortalException(f"Unsupported LLM provider: {provider}", sys)
-            
-        except Exception as e:
-            log.error(f"Error loading LLM:", error=str(e))
-            raise DocumentPortalException("failed to load LLM model", sys)
-        
-
-if __name__ == "__main__":
-    model_loader = ModelLoader()
-    embeddings = model_loader.load_embeddings()
-    print("Embeddings loaded successfully.", embeddings)
-    print("---------------------------------------------------")
-    print(len(embeddings.embed_query("hello world")))
-    llm = model_loader.load_llm()
-    print("LLM loaded successfully.", llm)
-    print("---------------------------------------------------")
-    print(llm.invoke("Hello, how are you?"))
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+from dotenv import load_dotenv
+from utils.config_loader import load_config
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_groq import ChatGroq
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_openai import AzureOpenAIEmbeddings
+from langchain_openai import AzureChatOpenAI
+
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+log=CustomLogger().get_logger(__name__)
+
+
+class ModelRegistry:
+    """Process-wide, thread-safe registry of loaded model clients.
+
+    Each client is keyed by (kind, provider, model_name, params) and built exactly once,
+    lazily on first request. Loads of different keys can run concurrently.
+    """
+
+    def __init__(self):
+        self._models: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                log.info("Model not in registry, loading.", key=str(key))
+                model = factory()
+                self._models[key] = model
+        return model
+
+    def keys(self) -> list:
+        return [str(k) for k in self._models]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._key_locks.clear()
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+class ModelLoader:
+    """A class to load and manage different language models and embeddings based on configuration.
+
+    Environment validation and config parsing happen once per process; embedding and LLM
+    clients are shared through MODEL_REGISTRY so constructing a ModelLoader is cheap.
+    """
+
+    _bootstrap_lock = threading.Lock()
+    _shared_config: Optional[dict] = None
+    _shared_api_keys: Optional[Dict[str, Optional[str]]] = None
+
+    def __init__(self):
+        cls = type(self)
+        if cls._shared_config is None:
+            with cls._bootstrap_lock:
+                if cls._shared_config is None:
+                    load_dotenv()
+                    self._validate_env()
+                    cls._shared_api_keys = self.api_keys
+                    cls._shared_config = load_config()
+                    log.info("Configuration loaded successfully.", confing_keys=list(cls._shared_config.keys()))
+
+        self.api_keys = cls._shared_api_keys
+        self.config = cls._shared_config
+
+    def _validate_env(self):
+        """Validate required environment variables.
+        Ensures that all necessary environment variables are set.
+        """
+        required_vars = ["GOOGLE_API_KEY", "GROQ_API_KEY", "AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_DEPLOYMENT_NAME"]
+
+        self.api_keys = {key:os.getenv(key) for key in required_vars}
+
+        missing_vars = [key for key, value in self.api_keys.items() if not value]
+
+        if missing_vars:
+            log.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+            raise DocumentPortalException("Missing required environment variables", sys)
+        
+        log.info("All Environment variables are set properly.", available_keys=[key for key in self.api_keys])
+
+ 
+
+    def load_embeddings(self):
+        """Load embeddings model based on configuration."""
+        try:
+            log.info("Loading embeddings model...")
+            self.embedding_block = self.config["embedding_model"]
+
+            log.debug("Embedding model configuration.", embedding_block=self.embedding_block)
+            embedding_provider_key = os.getenv("EMBEDDING_PROVIDER", "transformer")
+
+            if embedding_provider_key not in self.embedding_block:
+                log.error(f"Embedding Provider not found in embedding_model configuration", provider_key=embedding_provider_key)
+                raise DocumentPortalException(f"Embedding Provider 'not found in embedding_model configuration", sys)
+            
+            embedding_config = self.embedding_block[embedding_provider_key]
+            provider = embedding_config.get("provider")
+            model_name = embedding_config.get("model_name")
+
+            log.info(f"Selected Embedding : ", provider=provider, model_name=model_name)
+            self.embedding_model_id = f"{provider}:{model_name}"
+
+            return MODEL_REGISTRY.get_or_create(
+                ("embedding", provider, model_name),
+                lambda: self._build_embeddings(provider, model_name),
+            )
+
+        except Exception as e:
+            log.error(f"Error loading embeddings:", error=str(e))
+            raise DocumentPortalException("failed to load embeddings model", sys)
+
+    def _build_embeddings(self, provider: str, model_name: str):
+        """Instantiate a new embeddings client for the given provider."""
+        try:
+            if provider == "google":
+                embeddings = GoogleGenerativeAIEmbeddings(
+                    model_name=model_name,
+                    )
+                return embeddings
+            
+            elif provider == "huggingface":
+                embeddings = HuggingFaceEmbeddings(
+                    model_name=model_name,
+                    )
+                return embeddings
+            
+            elif provider == "azure_openai":
+                embeddings = AzureOpenAIEmbeddings(
+                    model=model_name,
+                    api_key=self.api_keys["AZURE_OPENAI_API_KEY"],
+                    endpoint=self.api_keys["AZURE_OPENAI_ENDPOINT"],
+                    deployment_name=self.api_keys["AZURE_OPENAI_DEPLOYMENT_NAME"]
+                )
+                return embeddings
+            else:
+                log.error(f"Unsupported embedding provider: ", provider=provider)
+                raise DocumentPortalException(f"Unsupported embedding provider: {provider}", sys)
+                
+
+        except Exception as e:
+            log.error(f"Error building embeddings:", error=str(e))
+            raise DocumentPortalException("failed to build embeddings model", sys)
+
+    def load_llm(self, model_name: Optional[str] = None):
+        """ Load language model based on configuration (model_name overrides the configured one)."""
+
+        try:
+            llm_block = self.config["llm"]
+
+            log.info("Loading LLM model...")
+
+            provider_key = os.getenv("LLM_PROVIDER", "groq")
+
+            if provider_key not in llm_block:
+                log.error(f"LLM Provider not found in llm configuration", provider_key=provider_key)
+                raise DocumentPortalException(f"LLM Provider 'not found in llm configuration", sys)
+            
+            llm_config = llm_block[provider_key]
+            provider = llm_config.get("provider")
+            model_name = model_name or llm_config.get("model_name")
+            temperature = llm_config.get("temperature", 0.2)
+            max_tokens = llm_config.get("max_tokens", 2048)
+
+            log.info(f"Selected LLM : ", provider=provider, model_name=model_name, temperature=temperature, max_tokens=max_tokens)
+            self.llm_model_id = f"{provider}:{model_name}"
+
+            return MODEL_REGISTRY.get_or_create(
+                ("llm", provider, model_name, temperature, max_tokens),
+                lambda: self._build_llm(provider, model_name, temperature, max_tokens),
+            )
+
+        except Exception as e:
+            log.error(f"Error loading LLM:", error=str(e))
+            raise DocumentPortalException("failed to load LLM model", sys)
+
+    def load_rewrite_llm(self):
+        """Load the model used to rewrite follow-up questions.
+
+        Uses `rewrite_model_name` of the selected provider (or REWRITE_MODEL_NAME) so a smaller,
+        faster model can handle rewriting; falls back to the main LLM when neither is set.
+        """
+        provider_key = os.getenv("LLM_PROVIDER", "groq")
+        llm_config = self.config["llm"].get(provider_key) or {}
+        return self.load_llm(model_name=os.getenv("REWRITE_MODEL_NAME") or llm_config.get("rewrite_model_name"))
+
+    def _build_llm(self, provider: str, model_name: str, temperature: float, max_tokens: int):
+        """Instantiate a new chat model client for the given provider."""
+        try:
+            if provider == "groq":
+                llm = ChatGroq(
+                    model=model_name,
+                    api_key=self.api_keys["GROQ_API_KEY"],
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                return llm
+            elif provider == "google":
+                llm = ChatGoogleGenerativeAI(
+                    model=model_name,
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                )
+                return llm
+            elif provider == "azure_openai":
+                llm = AzureChatOpenAI(
+                    model=model_name,
+                    api_key=self.api_keys["AZURE_OPENAI_API_KEY"],
+                    endpoint=self.api_keys["AZURE_OPENAI_ENDPOINT"],
+                    deployment_name=self.api_keys["AZURE_OPENAI_DEPLOYMENT_NAME"],
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                return llm
+            
+            else:
+                log.error(f"Unsupported LLM provider: ", provider=provider)
+                raise DocumentPortalException(f"Unsupported LLM provider: {provider}", sys)
+            
+        except Exception as e:
+            log.error(f"Error building LLM:", error=str(e))
+            raise DocumentPortalException("failed to build LLM model", sys)
+
+    def warm_up(self) -> list:
+        """Load the configured embedding model and LLM into the registry ahead of the first request."""
+        self.load_embeddings()
+        self.load_llm()
+        log.info("Model registry warmed up.", models=MODEL_REGISTRY.keys())
+        return MODEL_REGISTRY.keys()
+        
+
+if __name__ == "__main__":
+    model_loader = ModelLoader()
+    embeddings = model_loader.load_embeddings()
+    print("Embeddings loaded successfully.", embeddings)
+    print("---------------------------------------------------")
+    print(len(embeddings.embed_query("hello world")))
+    llm = model_loader.load_llm()
+    print("LLM loaded successfully.", llm)
+    print("---------------------------------------------------")
+    print(llm.invoke("Hello, how are you?"))
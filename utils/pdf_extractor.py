@@ -0,0 +1,97 @@
+from __future__ import annotations
+import os
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from utils.config_loader import load_config
+from utils.cache import PARSED_TEXT_CACHE
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _extract_range(args: Tuple[str, int, int]) -> List[str]:
+    """Worker entry point: open the PDF independently and extract pages [start, end)."""
+    pdf_path, start, end = args
+    with fitz.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text() for i in range(start, end)]
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """The process-wide extraction pool, sized by its first caller and kept for the process lifetime.
+
+    Workers are spawned rather than forked: the API process runs threads (executor, job
+    queue, model clients) whose locks a forked child could inherit in a held state.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def is_encrypted(pdf_path: str) -> bool:
+    with fitz.open(pdf_path) as doc:
+        return bool(doc.is_encrypted)
+
+
+def extract_pages(pdf_path: str, max_workers: Optional[int] = None) -> List[str]:
+    """Return the text of every page of pdf_path, in page order.
+
+    Large documents are split into contiguous page ranges that are extracted in parallel by
+    a shared process pool, each worker opening the file itself. Small documents (or
+    max_workers=1) use the plain serial loop to avoid process overhead. max_workers sets
+    the number of shards; the pool itself is sized once, by the first parallel call.
+    """
+    config = load_config().get("pdf_extraction") or {}
+    if not max_workers:
+        # configured size is capped by available cores; an explicit argument is taken as-is
+        max_workers = min(int(config.get("max_workers", 4)), os.cpu_count() or 1)
+    min_pages_per_worker = int(config.get("min_pages_per_worker", 25))
+
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+
+        workers = min(max_workers, page_count // max(1, min_pages_per_worker))
+        if workers <= 1:
+            return [doc.load_page(i).get_text() for i in range(page_count)]
+
+    shard = -(-page_count // workers)  # ceil division
+    ranges = [(str(pdf_path), start, min(start + shard, page_count)) for start in range(0, page_count, shard)]
+
+    pages: List[str] = []
+    for chunk in _get_pool(max_workers).map(_extract_range, ranges):
+        pages.extend(chunk)
+
+    log.info("PDF pages extracted in parallel.", pdf_path=str(pdf_path), total_pages=page_count, shards=len(ranges))
+    return pages
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pages_cached(pdf_path: str, sha256: Optional[str] = None) -> List[str]:
+    """extract_pages, memoized by file content (pass sha256 when already known from the upload)."""
+    key = (sha256 or file_sha256(pdf_path), "pymupdf-pages-v1")
+    pages = PARSED_TEXT_CACHE.get(key)
+    if pages is not None:
+        log.info("PDF pages served from cache.", pdf_path=str(pdf_path), total_pages=len(pages))
+        return pages
+
+    pages = extract_pages(pdf_path)
+    PARSED_TEXT_CACHE.put(key, pages)
+    return pages
@@ -0,0 +1,110 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from utils.bm25 import BM25Index
+from utils.concurrency import run_blocking
+from utils.config_loader import load_config
+from utils.model_loader import MODEL_REGISTRY
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import DocumentPortalException
+
+
+log = CustomLogger().get_logger(__name__)
+
+
+class Reranker(ABC):
+    """Scores (query, chunk) pairs; higher is more relevant. Subclass to add a model."""
+
+    @abstractmethod
+    def score(self, query: str, texts: Sequence[str]) -> List[float]:
+        ...
+
+    def rerank(self, query: str, docs: Sequence[Document], top_n: int) -> List[Document]:
+        if len(docs) <= 1:
+            return list(docs)[:top_n]
+        scores = np.asarray(self.score(query, [d.page_content for d in docs]), dtype=np.float32)
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        return [docs[i] for i in order]
+
+
+class CrossEncoderReranker(Reranker):
+    """Local CPU cross-encoder (sentence-transformers), loaded once per process via MODEL_REGISTRY."""
+
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", batch_size: int = 32, **_):
+        self.model_name = model_name
+        self.batch_size = int(batch_size)
+        self.model = MODEL_REGISTRY.get_or_create(("reranker", "cross_encoder", model_name), self._load)
+
+    def _load(self):
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError as e:
+            raise DocumentPortalException("cross_encoder reranking requires the sentence-transformers package", e) from e
+        return CrossEncoder(self.model_name, device="cpu")
+
+    def score(self, query: str, texts: Sequence[str]) -> List[float]:
+        pairs = [(query, text) for text in texts]
+        return list(self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False))
+
+
+class LexicalReranker(Reranker):
+    """Dependency-free fallback: BM25 over just the candidate set."""
+
+    def __init__(self, **_):
+        pass
+
+    def score(self, query: str, texts: Sequence[str]) -> List[float]:
+        scores = [0.0] * len(texts)
+        for row, value in BM25Index.build(texts).search(query, k=len(texts)):
+            scores[row] = value
+        return scores
+
+
+RERANKERS: Dict[str, Type[Reranker]] = {
+    "cross_encoder": CrossEncoderReranker,
+    "lexical": LexicalReranker,
+}
+
+
+def rerank_settings(**overrides: Any) -> Dict[str, Any]:
+    """config.yaml `rerank` values with non-None overrides applied."""
+    config = load_config().get("rerank") or {}
+    settings = {
+        "enabled": bool(config.get("enabled", False)),
+        "provider": config.get("provider", "cross_encoder"),
+        "model_name": config.get("model_name", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+        "candidates": int(config.get("candidates", 20)),
+        "batch_size": int(config.get("batch_size", 32)),
+    }
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return settings
+
+
+def get_reranker(provider: Optional[str] = None, **overrides: Any) -> Reranker:
+    settings = rerank_settings(provider=provider, **overrides)
+    if settings["provider"] not in RERANKERS:
+        raise ValueError(f"Unsupported reranker: {settings['provider']}")
+    return RERANKERS[settings["provider"]](model_name=settings["model_name"], batch_size=settings["batch_size"])
+
+
+class RerankingRetriever(BaseRetriever):
+    """Over-fetch candidates from base_retriever, rescore them with reranker and keep top_n."""
+
+    base_retriever: BaseRetriever
+    reranker: Any
+    top_n: int = 5
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        candidates = self.base_retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        return self.reranker.rerank(query, candidates, self.top_n)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        candidates = await self.base_retriever.ainvoke(query, config={"callbacks": run_manager.get_child()})
+        # model inference is CPU-bound; keep it off the event loop
+        return await run_blocking(self.reranker.rerank, query, candidates, self.top_n)
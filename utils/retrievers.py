@@ -0,0 +1,134 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_community.vectorstores import FAISS  # type: ignore
+
+from utils.bm25 import BM25Index, bm25_path
+from utils.config_loader import load_config
+from utils.reranker import RerankingRetriever, get_reranker, rerank_settings
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+SEARCH_TYPES = ("similarity", "mmr", "similarity_score_threshold", "hybrid")
+
+
+class HybridRetriever(BaseRetriever):
+    """Fuse FAISS vector hits with BM25 keyword hits using weighted reciprocal rank fusion."""
+
+    vectorstore: Any
+    bm25: Any
+    k: int = 5
+    fetch_k: int = 20
+    vector_weight: float = 0.5
+    rrf_k: int = 60
+
+    def _vector_rows(self, query: str) -> List[int]:
+        """FAISS rows of the fetch_k nearest chunks, best first (same search as similarity_search)."""
+        vector = np.asarray([self.vectorstore._embed_query(query)], dtype=np.float32)
+        if self.vectorstore._normalize_L2:
+            faiss.normalize_L2(vector)
+        _, rows = self.vectorstore.index.search(vector, self.fetch_k)
+        return [int(row) for row in rows[0] if row != -1]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        # Both rankings are fused on the docstore id of the FAISS row they hit.
+        scores: Dict[str, float] = {}
+        docs: Dict[str, Document] = {}
+        mapping = self.vectorstore.index_to_docstore_id
+        ntotal = self.vectorstore.index.ntotal
+        rankings = [
+            (self._vector_rows(query), self.vector_weight),
+            ([row for row, _ in self.bm25.search(query, self.fetch_k, limit=ntotal)], 1 - self.vector_weight),
+        ]
+        for rows, weight in rankings:
+            for rank, row in enumerate(rows):
+                doc_id = mapping.get(row)
+                if doc_id is None:
+                    continue
+                if doc_id not in docs:
+                    doc = self.vectorstore.docstore.search(doc_id)
+                    if not isinstance(doc, Document):
+                        continue
+                    docs[doc_id] = doc
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight / (self.rrf_k + rank + 1)
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:self.k]
+        return [docs[key] for key in ranked]
+
+
+def load_bm25(index_dir: str | Path, vectorstore: FAISS, index_name: str = "index") -> BM25Index:
+    """Load the BM25 segments stored next to index.faiss, indexing any rows they don't cover yet."""
+    path = bm25_path(index_dir, index_name)
+    ntotal = vectorstore.index.ntotal
+    try:
+        bm25 = BM25Index.load(path)
+    except ValueError as e:
+        log.warning("Ignoring unreadable BM25 index.", path=str(path), error=str(e))
+        BM25Index.truncate(path, 0)
+        bm25 = BM25Index()
+
+    if bm25.n_docs < ntotal:
+        start_row = bm25.n_docs
+        mapping = vectorstore.index_to_docstore_id
+        texts = [vectorstore.docstore.search(mapping[row]).page_content for row in range(start_row, ntotal)]
+        BM25Index.write_segment(path, start_row, texts)
+        bm25.add(start_row, texts)
+        log.info("BM25 index caught up from docstore.", index_dir=str(index_dir), start_row=start_row, rows=ntotal)
+    return bm25
+
+
+def retrieval_settings(**overrides: Any) -> Dict[str, Any]:
+    """config.yaml `retrieval` values with non-None overrides (e.g. request params) applied."""
+    config = load_config().get("retrieval") or {}
+    settings = {
+        "search_type": config.get("search_type", "similarity"),
+        "fetch_k": int(config.get("fetch_k", 20)),
+        "lambda_mult": float(config.get("lambda_mult", 0.5)),
+        "score_threshold": float(config.get("score_threshold", 0.3)),
+        "vector_weight": float(config.get("hybrid_vector_weight", 0.5)),
+    }
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    if settings["search_type"] not in SEARCH_TYPES:
+        raise ValueError(f"Unsupported search_type: {settings['search_type']}; expected one of {SEARCH_TYPES}")
+    return settings
+
+
+def build_retriever(vectorstore: FAISS, k: int, search_type: Optional[str] = None, bm25: Optional[BM25Index] = None,
+                    rerank: Optional[bool] = None, **overrides: Any) -> BaseRetriever:
+    """Create the retriever for a retrieval mode.
+
+    similarity: plain top-k. mmr: top-k re-selected for diversity from fetch_k candidates.
+    similarity_score_threshold: top-k dropping chunks below score_threshold relevance.
+    hybrid: BM25 + vector fusion over fetch_k candidates from each side (needs bm25).
+
+    With reranking enabled (config.yaml `rerank` or rerank=True) the mode fetches
+    `rerank.candidates` chunks and the reranker keeps the best k.
+    """
+    rerank_config = rerank_settings(enabled=rerank)
+    if rerank_config["enabled"]:
+        base = build_retriever(vectorstore, max(k, rerank_config["candidates"]), search_type, bm25, rerank=False, **overrides)
+        return RerankingRetriever(base_retriever=base, reranker=get_reranker(), top_n=k)
+
+    settings = retrieval_settings(search_type=search_type, **overrides)
+    search_type = settings["search_type"]
+
+    if search_type == "hybrid":
+        if bm25 is None:
+            raise ValueError("hybrid retrieval needs a BM25 index")
+        return HybridRetriever(vectorstore=vectorstore, bm25=bm25, k=k,
+                               fetch_k=max(k, settings["fetch_k"]), vector_weight=settings["vector_weight"])
+
+    search_kwargs: Dict[str, Any] = {"k": k}
+    if search_type == "mmr":
+        search_kwargs.update(fetch_k=max(k, settings["fetch_k"]), lambda_mult=settings["lambda_mult"])
+    elif search_type == "similarity_score_threshold":
+        search_kwargs.update(score_threshold=settings["score_threshold"])
+    return vectorstore.as_retriever(search_type=search_type, search_kwargs=search_kwargs)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from model.models import SavedUpload
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+
+
+log = CustomLogger().get_logger(__name__)
+
+
+class UploadStore:
+    """Content-addressed store for ingested files and their parsed chunks.
+
+    Files live at ``blobs/<sha[:2]>/<sha><ext>`` so the same upload is kept once no matter
+    how often it is sent. Split chunks are cached per file under ``chunks/<sha>/<key>.json``,
+    where key covers everything that changes the split (loader, chunk size, overlap).
+    """
+
+    CHUNK_CACHE_VERSION = "v1"
+
+    def __init__(self, root: Optional[str] = None):
+        config = load_config().get("uploads") or {}
+        self.root = Path(root or os.getenv("UPLOAD_STORE_DIR", config.get("store_dir", "data/uploads")))
+        self.blobs_dir = self.root / "blobs"
+        self.chunks_dir = self.root / "chunks"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, sha256: str, ext: str) -> Path:
+        return self.blobs_dir / sha256[:2] / f"{sha256}{ext.lower()}"
+
+    def adopt(self, upload: SavedUpload) -> SavedUpload:
+        """Move a freshly saved upload into the store, or drop it if the content is already there."""
+        src = Path(upload.path)
+        dest = self.blob_path(upload.sha256, src.suffix)
+        if dest.exists():
+            src.unlink(missing_ok=True)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(src, dest)
+        return upload.model_copy(update={"path": str(dest)})
+
+    def _chunks_path(self, sha256: str, key: str) -> Path:
+        return self.chunks_dir / sha256 / f"{self.CHUNK_CACHE_VERSION}-{key}.json"
+
+    def load_chunks(self, sha256: str, key: str) -> Optional[List[Document]]:
+        path = self._chunks_path(sha256, key)
+        if not path.exists():
+            return None
+        try:
+            rows = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log.warning("Unreadable chunk cache entry ignored.", path=str(path), error=str(e))
+            return None
+        return [Document(page_content=row["text"], metadata=row["metadata"]) for row in rows]
+
+    def save_chunks(self, sha256: str, key: str, chunks: List[Document]):
+        path = self._chunks_path(sha256, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        rows = [{"text": c.page_content, "metadata": c.metadata or {}} for c in chunks]
+        tmp_path.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+_STORES: Dict[str, UploadStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_upload_store(root: Optional[str] = None) -> UploadStore:
+    """Return the shared UploadStore for root (the configured store_dir by default)."""
+    key = str(root or "")
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = UploadStore(root)
+        return _STORES[key]